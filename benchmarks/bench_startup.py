@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+STARTUP BENCHMARK
+Misst die Zeit vom Prozessstart bis zur Handelsbereitschaft des Bots:
+Import von enhanced_live_bot (in frischen Prozessen), Konstruktion des Bots
+und paralleles Warmup. Ohne --live läuft alles offline (synthetische
+Marktdaten, simulierter Broker), mit --live gegen die echte Bybit-API.
+
+Überschreitet der Median das Budget, endet das Skript mit Exit-Code 1.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import enhanced_live_bot; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def measure_import(repeats):
+    """Importzeit von enhanced_live_bot in frischen Interpretern (ms)"""
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def measure_init_and_warmup(live, repeats):
+    """Konstruktion und Warmup des Bots (ms je Phase)"""
+    from core.bot_status_monitor import BotStatusMonitor
+    from core.clock import VirtualClock
+    from core.sim_harness import SyntheticMarketData, SimulatedBroker
+    from enhanced_live_bot import EnhancedLiveTradingBot
+
+    runs = []
+    for _ in range(repeats):
+        workdir = tempfile.mkdtemp(prefix='bench_startup_')
+        kwargs = {
+            'status_file': os.path.join(workdir, 'bot_status.json'),
+            'command_file': os.path.join(workdir, 'bot_commands.json'),
+        }
+        started = time.perf_counter()
+        if live:
+            kwargs['monitor'] = BotStatusMonitor(os.getpid(), log_path=os.path.join(workdir, 'bot_monitor.log'))
+        else:
+            clock = VirtualClock(1704067200)
+            market_data = SyntheticMarketData(clock)
+            kwargs.update({
+                'clock': clock,
+                'market_data': market_data,
+                'broker': SimulatedBroker(clock, market_data),
+                'monitor': BotStatusMonitor(os.getpid(), clock=clock,
+                                            log_path=os.path.join(workdir, 'bot_monitor.log'))
+            })
+        bot = EnhancedLiveTradingBot(**kwargs)
+        init_ms = (time.perf_counter() - started) * 1000
+
+        report = bot.warm_up()
+        report.wait_all(timeout=60)
+        runs.append({'init_ms': init_ms, 'ready_ms': report.elapsed_ms, 'report': report.as_dict()})
+    return runs
+
+
+def main():
+    """Führt den Startup-Benchmark aus"""
+    parser = argparse.ArgumentParser(description="Startup-Benchmark für enhanced_live_bot")
+    parser.add_argument('--repeats', type=int, default=5, help="Wiederholungen je Messung")
+    parser.add_argument('--budget-ms', type=float, default=1000.0,
+                        help="Budget für Import + Konstruktion + Warmup bis bereit (Median)")
+    parser.add_argument('--live', action='store_true', help="Warmup gegen die echte Bybit-API")
+    parser.add_argument('--json', action='store_true', help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    import_ms = measure_import(args.repeats)
+    runs = measure_init_and_warmup(args.live, args.repeats)
+
+    import_median = statistics.median(import_ms)
+    init_median = statistics.median(run['init_ms'] for run in runs)
+    ready_median = statistics.median(run['ready_ms'] for run in runs)
+    total = import_median + init_median + ready_median
+    within_budget = total <= args.budget_ms
+
+    result = {
+        'mode': 'live' if args.live else 'offline',
+        'import_ms': round(import_median, 1),
+        'init_ms': round(init_median, 1),
+        'warmup_ready_ms': round(ready_median, 1),
+        'total_ms': round(total, 1),
+        'budget_ms': args.budget_ms,
+        'within_budget': within_budget,
+        'last_warmup': runs[-1]['report']
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print("=" * 60)
+        print(f"STARTUP BENCHMARK ({result['mode']}, Median aus {args.repeats})")
+        print("=" * 60)
+        print(f"Import:        {result['import_ms']:8.1f} ms")
+        print(f"Konstruktion:  {result['init_ms']:8.1f} ms")
+        print(f"Warmup bereit: {result['warmup_ready_ms']:8.1f} ms")
+        print(f"Gesamt:        {result['total_ms']:8.1f} ms (Budget {args.budget_ms:.0f} ms)")
+        for name, task in result['last_warmup']['tasks'].items():
+            state = 'OK' if task['ok'] else f"FEHLER ({task['error']})"
+            print(f"  {name:<12} {task['duration_ms']} ms  {state}")
+        print("Budget eingehalten" if within_budget else "BUDGET ÜBERSCHRITTEN")
+
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == "__main__":
+    main()
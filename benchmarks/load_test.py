@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+"""
+LASTTEST
+Treibt synthetische Tick-Ströme für viele Symbole mit fester Rate (z.B.
+100 Symbole x 50 Ticks/s) durch Regime-, Signal- und Ausführungscode von
+EnhancedLiveTradingBot - gegen eine lokale Stub-Börse (SimulatedBroker),
+ohne Netzwerk.
+
+Der Generator ist offen (open loop): jeder Tick hat einen festen geplanten
+Zeitpunkt. Kommt der Bot nicht hinterher, wächst der Rückstand und damit
+die Latenz (geplanter Zeitpunkt bis Ende der Verarbeitung) - so wird die
+Sättigung sichtbar, statt dass der Generator einfach langsamer wird.
+
+Engines:
+- bot:   je Tick _strategy_step() + _execution_step() wie in der Pipeline
+- batch: fällige Ticks aller Symbole gebündelt durch BatchStrategy.evaluate(),
+         nur Nicht-HOLD-Signale einzeln über execute_trade()
+
+Der Bot handelt genau ein Symbol; Position und Kontostand werden je Symbol
+vor jedem Tick eingesetzt (Multiplexing über eine Bot-Instanz).
+
+Mit --ramp wird die Symbolzahl schrittweise erhöht, bis die Rate nicht mehr
+gehalten wird oder p99 das Latenzbudget überschreitet. Ergebnis ist die
+Kapazität in Ticks/s bzw. Symbolen bei der gewählten Tick-Rate.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class LoadMarketData:
+    def __init__(self, symbols, seed=7, volatility=0.0004):
+        """
+        Multi-Symbol-Random-Walk als Stub-Börse
+
+        get_price()/get_order_book() liefern immer das aktuell eingesetzte
+        Symbol (current), weil der Bot intern nur BTCUSDT anfragt.
+
+        Args:
+            symbols: Anzahl Symbole
+            seed: Seed - gleicher Seed, gleiche Tick-Folge
+            volatility: Standardabweichung der Log-Rendite je Tick
+        """
+        self._rng = random.Random(seed)
+        self.volatility = volatility
+        self.names = [f"SYM{i:04d}USDT" for i in range(symbols)]
+        self.symbol = 'BTCUSDT'
+        self.prices = [self._rng.uniform(0.5, 50000.0) for _ in range(symbols)]
+        self.changes = [self._rng.uniform(-4.0, 4.0) for _ in range(symbols)]
+        self.current = 0
+
+    def next_tick(self, index):
+        """Bewegt Symbol index um einen Tick und liefert price_data wie get_bybit_price()"""
+        rng = self._rng
+        step = rng.gauss(0.0, self.volatility)
+        self.prices[index] *= math.exp(step)
+        # 24h-Änderung pendelt um 0, damit alle Regime vorkommen
+        change = self.changes[index] * 0.999 + step * 100 + rng.gauss(0.0, 0.05)
+        self.changes[index] = change
+        return {'success': True, 'price': self.prices[index], 'volume': 1000.0, 'change': change}
+
+    def get_price(self, symbol):
+        return {'success': True, 'price': self.prices[self.current], 'volume': 1000.0,
+                'change': self.changes[self.current]}
+
+    def get_order_book(self, symbol, limit=50):
+        price = self.prices[self.current]
+        tick = price * 0.0001
+        bids = [[f"{price - (i + 1) * tick:.8f}", f"{0.5 + i * 0.1:.4f}"] for i in range(limit)]
+        asks = [[f"{price + (i + 1) * tick:.8f}", f"{0.5 + i * 0.1:.4f}"] for i in range(limit)]
+        return {'s': self.names[self.current], 'b': bids, 'a': asks, 'ts': int(time.time() * 1000)}
+
+    def get_historical_data(self, symbol, interval, start_time=None, end_time=None, limit=200):
+        return []
+
+
+class SymbolBook:
+    def __init__(self, bot, market, balance):
+        """Position und Kontostand je Symbol für eine gemeinsam genutzte Bot-Instanz"""
+        self.bot = bot
+        self.market = market
+        self.positions = [None] * len(market.names)
+        self.balances = [balance] * len(market.names)
+
+    def enter(self, index):
+        self.market.current = index
+        self.bot.current_position = self.positions[index]
+        self.bot.current_balance = self.balances[index]
+
+    def leave(self, index):
+        self.positions[index] = self.bot.current_position
+        self.balances[index] = self.bot.current_balance
+
+
+def build_bot(workdir, symbols):
+    """Bot im Offline-Modus gegen die Stub-Börse"""
+    from core.bot_status_monitor import BotStatusMonitor
+    from core.sim_harness import SimulatedBroker
+    from core.clock import SystemClock
+    from enhanced_live_bot import EnhancedLiveTradingBot
+
+    clock = SystemClock()
+    market = LoadMarketData(symbols)
+    bot = EnhancedLiveTradingBot(
+        clock=clock, market_data=market,
+        broker=SimulatedBroker(clock, market, tick_size='0.00000001', qty_step='0.00000001',
+                               min_qty='0.00000001', min_notional='0'),
+        status_file=os.path.join(workdir, 'bot_status.json'),
+        command_file=os.path.join(workdir, 'bot_commands.json'),
+        monitor=BotStatusMonitor(os.getpid(), clock=clock, log_path=os.path.join(workdir, 'bot_monitor.log'))
+    )
+    # Bars und Trade-Stream gehören zum einen Live-Symbol - im Multiplexing nicht sinnvoll
+    bot.use_bar_engine = False
+    bot.use_trade_stream = False
+    # Risikogrenzen würden nach einigen Sekunden alle Einstiege sperren
+    bot.performance.max_drawdown_limit = 0
+    bot.performance.daily_loss_limit = 0
+    return bot, market, SymbolBook(bot, market, bot.start_balance)
+
+
+def _rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1048576
+    except ImportError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(math.ceil(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def _process_bot(bot, book, index, price_data, telemetry):
+    book.enter(index)
+    decision = bot._strategy_step(price_data)
+    event = bot._execution_step(decision)
+    if telemetry:
+        bot._telemetry_step(event)
+    book.leave(index)
+
+
+def _process_batch(bot, book, batch):
+    from core.batch_strategy import POSITION_CODES, SIGNAL_HOLD
+
+    indices = [index for index, _ in batch]
+    prices = np.array([data['price'] for _, data in batch], dtype=np.float64)
+    changes = np.array([data['change'] for _, data in batch], dtype=np.float64)
+    positions = [book.positions[index] for index in indices]
+    codes = np.array([POSITION_CODES[p['type'] if p else None] for p in positions])
+    stops = np.array([p['stop_loss'] if p else np.nan for p in positions], dtype=np.float64)
+    targets = np.array([p['take_profit'] if p else np.nan for p in positions], dtype=np.float64)
+
+    result = bot.strategy.evaluate(prices, changes, codes, stops, targets)
+    # Ein Symbol kann mehrfach im Batch stehen - nur sein letzter Tick wird ausgeführt
+    last = {index: k for k, index in enumerate(indices)}
+    for index, k in last.items():
+        if result['signal'][k] == SIGNAL_HOLD:
+            continue
+        book.enter(index)
+        signal_data = bot.strategy.signal_dict(result, k, float(prices[k]), float(result['confidence'][k]))
+        bot._mark_to_market(float(prices[k]))
+        bot.execute_trade(signal_data, float(prices[k]))
+        book.leave(index)
+
+
+def run_step(symbols, tick_rate, duration, engine='bot', telemetry=False, max_batch=1000, workdir=None):
+    """
+    Ein Lastschritt mit fester Rate
+
+    Args:
+        symbols: Anzahl Symbole
+        tick_rate: Ticks pro Sekunde und Symbol
+        duration: Dauer in Sekunden
+        engine: 'bot' oder 'batch'
+        telemetry: Im Bot-Engine zusätzlich _telemetry_step() (Status-Datei) je Tick
+        max_batch: Maximale Ticks je Batch im Batch-Engine
+
+    Returns:
+        Dictionary mit Rate, Durchsatz, Latenzen, CPU und Speicher
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix='load_test_')
+    bot, market, book = build_bot(workdir, symbols)
+    trades_before = bot.trade_count
+    offered = symbols * tick_rate
+    interval = 1.0 / offered
+    latencies = []
+    service = 0.0
+    processed = 0
+    rss_start = _rss_mb()
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    end = start + duration
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        due = min(int((now - start) / interval) + 1, int(duration * offered)) - processed
+        if due <= 0:
+            # Nächster Tick liegt in der Zukunft
+            time.sleep(max(start + processed * interval - now, 0))
+            continue
+
+        count = due if engine == 'batch' else 1
+        count = min(count, max_batch)
+        batch = []
+        for i in range(processed, processed + count):
+            index = i % symbols
+            price_data = market.next_tick(index)
+            price_data['ts'] = bot.clock.time()
+            batch.append((index, price_data))
+
+        started = time.perf_counter()
+        if engine == 'batch':
+            _process_batch(bot, book, batch)
+        else:
+            _process_bot(bot, book, batch[0][0], batch[0][1], telemetry)
+        done = time.perf_counter()
+        service += done - started
+        for i in range(processed, processed + count):
+            latencies.append(done - (start + i * interval))
+        processed += count
+
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    backlog = min(int(elapsed / interval), int(duration * offered)) - processed
+    latencies.sort()
+    return {
+        'engine': engine,
+        'symbols': symbols,
+        'tick_rate': tick_rate,
+        'offered_per_s': offered,
+        'throughput_per_s': round(processed / elapsed, 1),
+        'processed': processed,
+        'backlog': max(backlog, 0),
+        'service_us': round(service / processed * 1e6, 1) if processed else None,
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3) if latencies else None,
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3) if latencies else None,
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3) if latencies else None,
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else None,
+        'cpu_pct': round(cpu / elapsed * 100, 1),
+        'busy_pct': round(service / elapsed * 100, 1),
+        'rss_mb': round(_rss_mb(), 1),
+        'rss_growth_mb': round(_rss_mb() - rss_start, 1),
+        'trades': bot.trade_count - trades_before
+    }
+
+
+def sustained(result, budget_ms, min_ratio=0.95):
+    """Rate gehalten: Durchsatz >= min_ratio x angebotene Rate und p99 im Latenzbudget"""
+    return (result['throughput_per_s'] >= min_ratio * result['offered_per_s']
+            and result['p99_ms'] is not None and result['p99_ms'] <= budget_ms)
+
+
+def ramp(args):
+    """
+    Erhöht die Symbolzahl um --ramp-factor, bis die Rate nicht mehr gehalten wird
+
+    Returns:
+        (Liste der Schritte, letzter gehaltener Schritt oder None)
+    """
+    steps = []
+    capacity = None
+    symbols = args.symbols
+    for _ in range(args.max_steps):
+        result = run_step(symbols, args.tick_rate, args.duration, args.engine, args.telemetry)
+        result['sustained'] = sustained(result, args.budget_ms)
+        steps.append(result)
+        _print_step(result, args)
+        if not result['sustained']:
+            break
+        capacity = result
+        symbols = max(symbols + 1, int(symbols * args.ramp_factor))
+    return steps, capacity
+
+
+def _print_step(result, args):
+    if args.json:
+        return
+    print(f"{result['symbols']:>5} Symbole x {result['tick_rate']:g}/s = {result['offered_per_s']:>9.0f}/s  "
+          f"-> {result['throughput_per_s']:>9.1f}/s  p50 {result['p50_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms  "
+          f"Busy {result['busy_pct']:.0f}%  CPU {result['cpu_pct']:.0f}%  RSS {result['rss_mb']:.0f} MB  "
+          f"{'OK' if result['sustained'] else 'GESÄTTIGT'}")
+
+
+def main():
+    """Führt den Lasttest aus"""
+    parser = argparse.ArgumentParser(description="Durchsatz-Lasttest der Strategie-Schleife")
+    parser.add_argument('--symbols', type=int, default=100, help="Anzahl Symbole (Startwert bei --ramp)")
+    parser.add_argument('--tick-rate', type=float, default=50.0, help="Ticks pro Sekunde und Symbol")
+    parser.add_argument('--duration', type=float, default=10.0, help="Dauer je Schritt in Sekunden")
+    parser.add_argument('--engine', choices=('bot', 'batch'), default='bot',
+                        help="bot: Tick für Tick durch die Pipeline-Stufen, batch: BatchStrategy")
+    parser.add_argument('--telemetry', action='store_true', help="Status-Datei je Tick schreiben (Engine bot)")
+    parser.add_argument('--budget-ms', type=float, default=100.0, help="Latenzbudget für p99 in Millisekunden")
+    parser.add_argument('--ramp', action='store_true', help="Symbolzahl bis zur Sättigung erhöhen")
+    parser.add_argument('--ramp-factor', type=float, default=2.0, help="Faktor je Ramp-Schritt")
+    parser.add_argument('--max-steps', type=int, default=10, help="Maximale Anzahl Ramp-Schritte")
+    parser.add_argument('--json', action='store_true', help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    # Trade-Logging würde die Messung dominieren
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if not args.json:
+        print("=" * 72)
+        print(f"LASTTEST (Engine {args.engine}, {args.duration:g}s je Schritt, p99-Budget {args.budget_ms:g} ms)")
+        print("=" * 72)
+
+    if args.ramp:
+        steps, capacity = ramp(args)
+    else:
+        result = run_step(args.symbols, args.tick_rate, args.duration, args.engine, args.telemetry)
+        result['sustained'] = sustained(result, args.budget_ms)
+        _print_step(result, args)
+        steps, capacity = [result], (result if result['sustained'] else None)
+
+    if args.json:
+        print(json.dumps({'steps': steps, 'capacity_per_s': capacity['offered_per_s'] if capacity else None,
+                          'capacity_symbols': capacity['symbols'] if capacity else None,
+                          'budget_ms': args.budget_ms}, indent=2))
+    elif capacity:
+        print(f"Kapazität: {capacity['offered_per_s']:.0f} Ticks/s "
+              f"({capacity['symbols']} Symbole bei {args.tick_rate:g} Ticks/s, "
+              f"Servicezeit {capacity['service_us']:.0f} µs/Tick)")
+        if args.ramp and len(steps) > 1 and not steps[-1]['sustained']:
+            print(f"Sättigung zwischen {capacity['symbols']} und {steps[-1]['symbols']} Symbolen")
+    else:
+        print(f"Rate schon beim ersten Schritt nicht gehalten - mit weniger Symbolen (--symbols) starten")
+
+
+if __name__ == "__main__":
+    main()
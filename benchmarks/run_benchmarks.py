@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+"""
+MICROBENCHMARKS
+Misst die Hot Paths des Bots offline (ohne Netzwerk): Signatur, Kline- und
+Orderbuch-Parsing, Regime-/Signal-Berechnung, Event-Log, Status-Datei u.a.
+
+Jeder Benchmark wird kalibriert (mindestens --min-time Sekunden je Runde)
+und --repeats Mal wiederholt; verglichen wird der Median pro Aufruf.
+Mit --save-baseline wird das Ergebnis als Baseline gespeichert; ist eine
+Baseline vorhanden, endet das Skript mit Exit-Code 1, sobald ein Benchmark
+mehr als --threshold langsamer ist.
+
+Baselines sind maschinenabhängig - jede Maschine (bzw. jeder CI-Runner)
+speichert ihre eigene.
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+
+def _canned_api(response):
+    # BybitAPI ohne Netzwerk: _send_request liefert eine feste Antwort
+    from exchange.bybit_api import BybitAPI
+    api = BybitAPI('benchmark_key', 'benchmark_secret', testnet=False, market_cache=False)
+    api._send_request = lambda method, endpoint, params, auth=False: response
+    return api
+
+
+def _kline_response(rows=200):
+    start = 1704067200000
+    klines = [[str(start + i * 60000), '42000.5', '42010.0', '41990.0', '42005.5', '12.345', '518000.1']
+              for i in range(rows)]
+    return {'retCode': 0, 'retMsg': 'OK', 'result': {'category': 'spot', 'symbol': 'BTCUSDT', 'list': klines}}
+
+
+def _orderbook_response(levels=200):
+    bids = [[f"{42000 - i * 0.5:.1f}", f"{0.1 + i * 0.01:.3f}"] for i in range(levels)]
+    asks = [[f"{42000.5 + i * 0.5:.1f}", f"{0.1 + i * 0.01:.3f}"] for i in range(levels)]
+    return {'retCode': 0, 'retMsg': 'OK',
+            'result': {'s': 'BTCUSDT', 'b': bids, 'a': asks, 'ts': 1704067200000, 'u': 1}}
+
+
+def _tickers_response(symbols=600):
+    rows = []
+    for i in range(symbols):
+        price = 1.0 + i * 7.3
+        rows.append({'symbol': f"COIN{i}USDT", 'lastPrice': f"{price:.4f}",
+                     'prevPrice24h': f"{price * (1 + (i % 41 - 20) / 400):.4f}",
+                     'highPrice24h': f"{price * 1.05:.4f}", 'lowPrice24h': f"{price * 0.95:.4f}",
+                     'volume24h': f"{1000 + i * 13.7:.2f}", 'turnover24h': f"{(1000 + i * 13.7) * price:.2f}",
+                     'bid1Price': f"{price * 0.9995:.4f}", 'bid1Size': '1.5', 'ask1Price': f"{price * 1.0005:.4f}",
+                     'ask1Size': '2.0', 'price24hPcnt': '0.0125'})
+    return {'retCode': 0, 'retMsg': 'OK', 'result': {'category': 'spot', 'list': rows}}
+
+
+def _offline_bot(workdir):
+    from core.bot_status_monitor import BotStatusMonitor
+    from core.clock import VirtualClock
+    from core.sim_harness import SyntheticMarketData, SimulatedBroker
+    from enhanced_live_bot import EnhancedLiveTradingBot
+
+    clock = VirtualClock(1704067200)
+    market_data = SyntheticMarketData(clock)
+    return EnhancedLiveTradingBot(
+        clock=clock, market_data=market_data, broker=SimulatedBroker(clock, market_data),
+        status_file=os.path.join(workdir, 'bot_status.json'),
+        command_file=os.path.join(workdir, 'bot_commands.json'),
+        monitor=BotStatusMonitor(os.getpid(), clock=clock, log_path=os.path.join(workdir, 'bot_monitor.log'))
+    )
+
+
+def build_benchmarks(workdir):
+    """
+    Erstellt alle Benchmarks
+
+    Returns:
+        Dictionary Name -> Funktion ohne Argumente (ein Aufruf = ein Durchlauf des Hot Paths)
+    """
+    from core.orderbook_analytics import OrderBookSnapshot
+    from core.performance_tracker import PerformanceTracker
+    from exchange.market_cache import MarketDataCache
+    from exchange.ticker_scanner import TickerSnapshot
+
+    benchmarks = {}
+
+    signer = _canned_api({})
+    order_params = {'category': 'spot', 'symbol': 'BTCUSDT', 'side': 'Buy', 'orderType': 'Market',
+                    'qty': '0.001', 'api_key': 'benchmark_key', 'timestamp': '1704067200000',
+                    'recv_window': '5000'}
+    benchmarks['signature'] = lambda: signer._generate_signature(order_params)
+
+    kline_api = _canned_api(_kline_response())
+    benchmarks['kline_parse_200'] = lambda: kline_api.get_historical_data('BTCUSDT', '1m', limit=200)
+
+    book_api = _canned_api(_orderbook_response())
+    benchmarks['orderbook_parse_200'] = lambda: OrderBookSnapshot.from_bybit(book_api.get_order_book('BTCUSDT', 200))
+    book = OrderBookSnapshot.from_bybit(_orderbook_response()['result'])
+    benchmarks['fill_estimate'] = lambda: book.fill_estimate('Buy', 2.5)
+
+    bot = _offline_bot(workdir)
+    price_data = {'success': True, 'price': 42000.0, 'volume': 1234.5, 'change': 2.4}
+
+    def signal():
+        regime = bot.detect_market_regime(price_data)
+        return bot.generate_trading_signal(price_data, regime)
+    benchmarks['regime_and_signal'] = signal
+    benchmarks['status_write'] = lambda: bot._update_status("RUNNING")
+    benchmarks['log_events'] = lambda: bot.monitor.log_events("TRADE", "Signal ausgeführt: BUY")
+
+    tracker = PerformanceTracker(50.0)
+    ticks = {'ts': 1704067200.0}
+
+    def mark():
+        ticks['ts'] += 30
+        tracker.mark(ticks['ts'], 50.0 + (ticks['ts'] % 97) / 100, 25.0)
+    benchmarks['performance_mark'] = mark
+
+    cache = MarketDataCache()
+    ticker = {'retCode': 0, 'result': {'list': [{'symbol': 'BTCUSDT', 'lastPrice': '42000'}]}}
+    params = {'category': 'spot', 'symbol': 'BTCUSDT'}
+    cache.fetch('/v5/market/tickers', params, lambda: ticker)
+    cache.ttls['/v5/market/tickers'] = 3600.0
+    benchmarks['market_cache_hit'] = lambda: cache.fetch('/v5/market/tickers', params, lambda: ticker)
+    
+    tickers = _tickers_response()['result']['list']
+    benchmarks['ticker_snapshot_600'] = lambda: TickerSnapshot.from_bybit(tickers)
+    snapshot = TickerSnapshot.from_bybit(tickers)
+    benchmarks['ticker_top_movers'] = lambda: snapshot.movers(10, mask=snapshot.mask(quote='USDT', min_turnover=1e6))
+
+    return benchmarks
+
+
+def measure(func, repeats, min_time):
+    """
+    Misst eine Funktion
+
+    Args:
+        func: Funktion ohne Argumente
+        repeats: Anzahl der Runden
+        min_time: Mindestdauer je Runde in Sekunden (bestimmt die Aufrufe je Runde)
+
+    Returns:
+        Dictionary mit median_us, min_us, stdev_us, iqr_us, number, repeats
+    """
+    func()  # Aufwärmen (Imports, Caches)
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= min_time:
+            break
+        number *= 2
+
+    per_call = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number * 1e6)
+
+    quartiles = statistics.quantiles(per_call, n=4) if len(per_call) >= 2 else [per_call[0]] * 3
+    return {
+        'median_us': round(statistics.median(per_call), 3),
+        'min_us': round(min(per_call), 3),
+        'stdev_us': round(statistics.stdev(per_call), 3) if len(per_call) >= 2 else 0.0,
+        'iqr_us': round(quartiles[2] - quartiles[0], 3),
+        'number': number,
+        'repeats': repeats
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Vergleicht Ergebnisse mit der Baseline
+
+    Returns:
+        Dictionary Name -> {baseline_us, ratio, regressed}
+    """
+    comparison = {}
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference:
+            continue
+        ratio = result['median_us'] / reference['median_us'] if reference['median_us'] else None
+        comparison[name] = {
+            'baseline_us': reference['median_us'],
+            'ratio': round(ratio, 3) if ratio is not None else None,
+            'regressed': ratio is not None and ratio > 1 + threshold
+        }
+    return comparison
+
+
+def main():
+    """Führt die Microbenchmarks aus"""
+    parser = argparse.ArgumentParser(description="Microbenchmarks der Bot-Hot-Paths")
+    parser.add_argument('--repeats', type=int, default=7, help="Runden je Benchmark")
+    parser.add_argument('--min-time', type=float, default=0.05, help="Mindestdauer je Runde in Sekunden")
+    parser.add_argument('--filter', default='*', help="Nur Benchmarks, deren Name zum Muster passt")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Pfad der Baseline-Datei")
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnis als neue Baseline speichern")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Erlaubte Verlangsamung gegenüber der Baseline (0.25 = 25%%)")
+    parser.add_argument('--json', action='store_true', help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    # Bot- und Monitor-Logging würde die Messung dominieren
+    logging.basicConfig(level=logging.CRITICAL)
+
+    workdir = tempfile.mkdtemp(prefix='bench_hotpaths_')
+    benchmarks = build_benchmarks(workdir)
+    selected = [name for name in benchmarks if fnmatch.fnmatch(name, args.filter)]
+
+    results = {name: measure(benchmarks[name], args.repeats, args.min_time) for name in selected}
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    comparison = compare(results, baseline, args.threshold) if baseline else {}
+    regressions = [name for name, entry in comparison.items() if entry['regressed']]
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2)
+
+    if args.json:
+        print(json.dumps({'results': results, 'comparison': comparison, 'regressions': regressions,
+                          'threshold': args.threshold}, indent=2))
+    else:
+        print("=" * 72)
+        print(f"MICROBENCHMARKS (Median aus {args.repeats} Runden, Python {platform.python_version()})")
+        print("=" * 72)
+        for name, result in results.items():
+            line = f"{name:<22} {result['median_us']:>11.2f} µs  ±{result['iqr_us']:.2f} (IQR)"
+            if name in comparison:
+                entry = comparison[name]
+                line += f"  Baseline {entry['baseline_us']:.2f} µs  x{entry['ratio']:.2f}"
+                if entry['regressed']:
+                    line += "  REGRESSION"
+            print(line)
+        if args.save_baseline:
+            print(f"Baseline gespeichert: {args.baseline}")
+        elif not baseline:
+            print("Keine Baseline vorhanden - mit --save-baseline anlegen")
+        elif regressions:
+            print(f"{len(regressions)} Benchmark(s) mehr als {args.threshold * 100:.0f}% langsamer: {', '.join(regressions)}")
+        else:
+            print(f"Keine Regression (Schwelle {args.threshold * 100:.0f}%)")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+BOT SIMULATOR
+Führt den echten EnhancedLiveTradingBot offline unter einer virtuellen Uhr
+aus - mit synthetischen oder aufgezeichneten Marktdaten, simuliertem Broker
+und geskripteten Dashboard-Befehlen. Gleiche Eingaben ergeben exakt dasselbe
+Ergebnis (siehe Digest); eine Woche Bot-Verhalten läuft in Sekunden.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from core.bot_status_monitor import BotStatusMonitor
+from core.clock import VirtualClock
+from core.market_recorder import MarketReplay
+from core.sim_harness import SyntheticMarketData, RecordedMarketData, SimulatedBroker, schedule_commands
+from enhanced_live_bot import EnhancedLiveTradingBot
+
+# Windows Console Encoding Fix
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+    sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
+
+logger = logging.getLogger(__name__)
+
+# Standard-Startzeitpunkt: 2024-01-01 00:00:00 UTC
+DEFAULT_START = 1704067200
+
+
+def run_simulation(duration, start=DEFAULT_START, seed=42, recorded_dir=None, symbol='BTCUSDT',
+                   commands=(), workdir=None, fee_rate=0.001, slippage_bps=0.0, exchange_tpsl=False):
+    """
+    Führt eine Simulation aus
+
+    Args:
+        duration: Simulierte Laufzeit in Sekunden (danach STOP-Befehl)
+        start: Startzeitpunkt in Sekunden seit der Epoche (bei Aufzeichnungen: deren Beginn)
+        seed: Seed für synthetische Marktdaten
+        recorded_dir: Verzeichnis des MarketRecorder statt synthetischer Daten
+        symbol: Handelssymbol
+        commands: Liste (Sekunden ab Start, Befehl)
+        workdir: Verzeichnis für Status-, Befehls- und Monitor-Dateien (Standard: temporär)
+        fee_rate: Gebühr des simulierten Brokers
+        slippage_bps: Slippage des simulierten Brokers
+        exchange_tpsl: Stop-Loss als bedingte Order beim (simulierten) Broker hinterlegen
+
+    Returns:
+        Dictionary mit Trades, Orders, Endstatus, Laufzeiten und Digest
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix='bot_sim_')
+    os.makedirs(workdir, exist_ok=True)
+    status_file = os.path.join(workdir, 'bot_status.json')
+    command_file = os.path.join(workdir, 'bot_commands.json')
+    for path in (status_file, command_file):
+        if os.path.exists(path):
+            os.remove(path)
+
+    if recorded_dir:
+        replay = MarketReplay(recorded_dir)
+        time_range = replay.time_range(symbol)
+        if not time_range:
+            raise ValueError(f"Keine Aufzeichnung für {symbol} in {recorded_dir}")
+        start = time_range[0] / 1000
+        clock = VirtualClock(start)
+        market_data = RecordedMarketData(clock, replay, symbol)
+    else:
+        clock = VirtualClock(start)
+        market_data = SyntheticMarketData(clock, seed=seed, symbol=symbol)
+
+    broker = SimulatedBroker(clock, market_data, fee_rate=fee_rate, slippage_bps=slippage_bps)
+    monitor = BotStatusMonitor(os.getpid(), clock=clock, log_path=os.path.join(workdir, 'bot_monitor.log'))
+    bot = EnhancedLiveTradingBot(clock=clock, market_data=market_data, broker=broker,
+                                 status_file=status_file, command_file=command_file, monitor=monitor)
+    bot.exchange_tpsl = exchange_tpsl
+
+    schedule_commands(clock, command_file, list(commands) + [(duration, 'STOP')])
+
+    started = time.perf_counter()
+    bot.start_live_trading()
+    wall_time = time.perf_counter() - started
+
+    with open(status_file) as f:
+        final_status = json.load(f)
+
+    trades = [dict(trade, timestamp=trade['timestamp'].isoformat()) for trade in bot.trades_history]
+    outcome = {
+        'trades': trades,
+        'orders': broker.orders,
+        'final_balance': bot.current_balance,
+        'final_status': final_status,
+        'status_writes': bot.status_digest.hexdigest()
+    }
+    digest = hashlib.sha256(json.dumps(outcome, sort_keys=True).encode('utf-8')).hexdigest()
+
+    outcome.update({
+        'simulated_seconds': clock.time() - start,
+        'wall_seconds': wall_time,
+        'fees_paid': broker.fees_paid,
+        'workdir': workdir,
+        'digest': digest
+    })
+    return outcome
+
+
+def parse_commands(text):
+    """Parst "3600:PAUSE,7200:RESUME" in [(3600, 'PAUSE'), (7200, 'RESUME')]"""
+    commands = []
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        offset, _, command = item.partition(':')
+        commands.append((float(offset), command.strip().upper()))
+    return commands
+
+
+def main():
+    """Startet eine Simulation über die Kommandozeile"""
+    parser = argparse.ArgumentParser(description="Enhanced Live Trading Bot - Offline-Simulation")
+    parser.add_argument('--days', type=float, default=7.0, help="Simulierte Laufzeit in Tagen")
+    parser.add_argument('--seed', type=int, default=42, help="Seed für synthetische Marktdaten")
+    parser.add_argument('--start', type=float, default=DEFAULT_START, help="Startzeit (Unix-Sekunden)")
+    parser.add_argument('--recorded', default=None, help="Verzeichnis mit MarketRecorder-Aufzeichnungen")
+    parser.add_argument('--commands', default='', help='Befehle, z.B. "3600:PAUSE,7200:RESUME"')
+    parser.add_argument('--workdir', default=None, help="Verzeichnis für Status- und Logdateien")
+    parser.add_argument('--slippage-bps', type=float, default=0.0, help="Slippage des simulierten Brokers")
+    parser.add_argument('--verbose', action='store_true', help="Bot-Logging anzeigen")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    result = run_simulation(
+        args.days * 86400, start=args.start, seed=args.seed, recorded_dir=args.recorded,
+        commands=parse_commands(args.commands), workdir=args.workdir, slippage_bps=args.slippage_bps
+    )
+
+    print("=" * 60)
+    print("BOT SIMULATION")
+    print("=" * 60)
+    print(f"Simuliert: {result['simulated_seconds'] / 86400:.2f} Tage in {result['wall_seconds']:.2f}s")
+    print(f"Trades: {len(result['trades'])} | Orders: {len(result['orders'])} | Gebühren: ${result['fees_paid']:.2f}")
+    print(f"Endkontostand: ${result['final_balance']:.2f} | Status: {result['final_status']['status']}")
+    print(f"Dateien: {result['workdir']}")
+    print(f"Digest: {result['digest']}")
+
+
+if __name__ == "__main__":
+    main()
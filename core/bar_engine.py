@@ -0,0 +1,240 @@
+"""
+Bar Engine - Multi-Timeframe-Kerzen aus 1m-Basisbars
+
+Hält pro Symbol 1m-Bars und rollt sie bei jedem abgeschlossenen Basisbar
+inkrementell in 5m-, 15m-, 1h-, 4h- und 1d-Bars hoch. Jeder Timeframe hat
+einen eigenen begrenzten Puffer und Close-Event-Callbacks. Ein Update kostet
+O(1) pro Timeframe - ohne zusätzliche get_historical_data-Aufrufe.
+
+Bucket-Grenzen sind an der Epoche (UTC) ausgerichtet, wie bei Bybit-Klines.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+TIMEFRAME_SECONDS = {
+    '1m': 60,
+    '3m': 180,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '1h': 3600,
+    '2h': 7200,
+    '4h': 14400,
+    '6h': 21600,
+    '12h': 43200,
+    '1d': 86400,
+}
+
+BASE_TIMEFRAME = '1m'
+
+
+class Bar:
+    __slots__ = ('start_ms', 'end_ms', 'open', 'high', 'low', 'close', 'volume', 'closed')
+
+    def __init__(self, start_ms, interval_ms, open_, high, low, close, volume):
+        """
+        OHLCV-Kerze eines Timeframes
+
+        Args:
+            start_ms: Startzeit des Buckets in Millisekunden
+            interval_ms: Länge des Buckets in Millisekunden
+        """
+        self.start_ms = start_ms
+        self.end_ms = start_ms + interval_ms
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.closed = False
+
+    def update(self, high, low, close, volume):
+        """Nimmt einen weiteren Basisbar in die Kerze auf"""
+        if high > self.high:
+            self.high = high
+        if low < self.low:
+            self.low = low
+        self.close = close
+        self.volume += volume
+
+    def as_dict(self):
+        """Gibt die Kerze im Format von BybitAPI.get_historical_data() zurück"""
+        return {
+            'timestamp': self.start_ms,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'closed': self.closed
+        }
+
+
+class BarEngine:
+    def __init__(self, timeframes=('5m', '15m', '1h', '4h', '1d'), maxlen=500):
+        """
+        Initialisiert die Bar Engine
+
+        Args:
+            timeframes: Höhere Timeframes, die aus 1m-Bars gebildet werden
+            maxlen: Maximale Anzahl abgeschlossener Bars pro Symbol und Timeframe
+        """
+        self.logger = logging.getLogger(__name__)
+        unknown = [tf for tf in timeframes if tf not in TIMEFRAME_SECONDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Timeframes: {unknown}")
+
+        self.base_ms = TIMEFRAME_SECONDS[BASE_TIMEFRAME] * 1000
+        self.timeframes = [(tf, TIMEFRAME_SECONDS[tf] * 1000) for tf in timeframes if tf != BASE_TIMEFRAME]
+        self.maxlen = maxlen
+        self._bars = {}
+        self._partial = {}
+        self._last_base = {}
+        self._callbacks = {}
+        self._lock = threading.Lock()
+
+    def on_close(self, timeframe, callback):
+        """
+        Registriert einen Callback für abgeschlossene Bars
+
+        Args:
+            timeframe: z.B. '1m', '5m', '1h'
+            callback: Funktion(symbol, timeframe, bar)
+        """
+        self._callbacks.setdefault(timeframe, []).append(callback)
+
+    def on_base_bar(self, symbol, bar):
+        """
+        Verarbeitet einen abgeschlossenen 1m-Bar
+
+        Args:
+            symbol: Handelssymbol
+            bar: Dictionary mit timestamp, open, high, low, close, volume
+
+        Returns:
+            Liste (timeframe, Bar) der dadurch abgeschlossenen Bars
+        """
+        start = int(bar['timestamp'])
+        o, h, l, c, v = (float(bar['open']), float(bar['high']), float(bar['low']),
+                         float(bar['close']), float(bar['volume']))
+        closed = []
+
+        with self._lock:
+            # Doppelte oder verspätete Basisbars ignorieren
+            if start <= self._last_base.get(symbol, -1):
+                return closed
+            self._last_base[symbol] = start
+
+            base = Bar(start, self.base_ms, o, h, l, c, v)
+            base.closed = True
+            self._store(symbol, BASE_TIMEFRAME, base)
+            closed.append((BASE_TIMEFRAME, base))
+
+            partials = self._partial.setdefault(symbol, {})
+            for tf, tf_ms in self.timeframes:
+                bucket = start - start % tf_ms
+                partial = partials.get(tf)
+
+                # Lücke in den Daten: alten Bucket abschließen
+                if partial is not None and partial.start_ms != bucket:
+                    partial.closed = True
+                    self._store(symbol, tf, partial)
+                    closed.append((tf, partial))
+                    partial = None
+
+                if partial is None:
+                    partial = Bar(bucket, tf_ms, o, h, l, c, v)
+                    partials[tf] = partial
+                else:
+                    partial.update(h, l, c, v)
+
+                # Letzter Basisbar des Buckets: sofort abschließen
+                if start + self.base_ms >= partial.end_ms:
+                    partial.closed = True
+                    self._store(symbol, tf, partial)
+                    closed.append((tf, partial))
+                    partials[tf] = None
+
+        for tf, closed_bar in closed:
+            for callback in self._callbacks.get(tf, []):
+                try:
+                    callback(symbol, tf, closed_bar)
+                except Exception as e:
+                    self.logger.error(f"Fehler in Bar-Callback ({symbol} {tf}): {e}")
+        return closed
+
+    def _store(self, symbol, timeframe, bar):
+        key = (symbol, timeframe)
+        bars = self._bars.get(key)
+        if bars is None:
+            bars = self._bars[key] = deque(maxlen=self.maxlen)
+        bars.append(bar)
+
+    def get_bars(self, symbol, timeframe, count=None):
+        """
+        Gibt abgeschlossene Bars zurück (älteste zuerst)
+
+        Args:
+            symbol: Handelssymbol
+            timeframe: z.B. '5m'
+            count: Nur die letzten N Bars
+        """
+        with self._lock:
+            bars = list(self._bars.get((symbol, timeframe), ()))
+        return bars[-count:] if count else bars
+
+    def get_partial(self, symbol, timeframe):
+        """Gibt den noch laufenden Bar eines Timeframes zurück (oder None)"""
+        with self._lock:
+            return self._partial.get(symbol, {}).get(timeframe)
+
+    def get_view(self, symbol):
+        """
+        Konsistenter Snapshot über alle Timeframes eines Symbols
+
+        Returns:
+            Dictionary timeframe -> {'last': letzter abgeschlossener Bar, 'partial': laufender Bar}
+        """
+        view = {}
+        with self._lock:
+            partials = self._partial.get(symbol, {})
+            for tf in [BASE_TIMEFRAME] + [tf for tf, _ in self.timeframes]:
+                bars = self._bars.get((symbol, tf))
+                partial = partials.get(tf)
+                view[tf] = {
+                    'last': bars[-1].as_dict() if bars else None,
+                    'partial': partial.as_dict() if partial else None
+                }
+        return view
+
+    def last_base_timestamp(self, symbol):
+        """Startzeit des zuletzt verarbeiteten 1m-Bars (oder None)"""
+        return self._last_base.get(symbol)
+
+    def backfill(self, api, symbol, limit=1000, start_time=None, now_ms=None):
+        """
+        Lädt 1m-Historie über die API und spielt sie in die Engine ein
+
+        Args:
+            api: BybitAPI-Instanz
+            symbol: Handelssymbol
+            limit: Anzahl 1m-Bars (Bybit-Maximum: 1000)
+            start_time: Optional ab diesem Zeitpunkt (ms) laden
+            now_ms: Aktuelle Zeit in Millisekunden (Standard: Systemuhr)
+
+        Returns:
+            Anzahl neu verarbeiteter Bars
+        """
+        bars = api.get_historical_data(symbol, BASE_TIMEFRAME, start_time=start_time, limit=limit)
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        # Bybit liefert neueste Kerze zuerst; laufende Kerze auslassen
+        closed = sorted((b for b in bars if b['timestamp'] + self.base_ms <= now_ms),
+                        key=lambda b: b['timestamp'])
+        count = 0
+        for bar in closed:
+            if self.on_base_bar(symbol, bar):
+                count += 1
+        return count
@@ -0,0 +1,183 @@
+"""
+Batch Strategy - Vektorisierte Enhanced-Smart-Money-Auswertung
+
+Wertet Regime-Erkennung und Signalgenerierung für N Symbole in einem
+NumPy-Durchlauf aus, statt pro Symbol einen interpretierten Aufruf mit
+Python-Verzweigungen zu machen. Die Einzel-Methoden des Bots
+(detect_market_regime, generate_trading_signal) sind dünne Wrapper darum.
+
+Alle Zustände werden als Integer-Codes übergeben:
+- Regime: REGIME_SIDEWAYS, REGIME_BULL, REGIME_BEAR
+- Position: POSITION_NONE, POSITION_LONG, POSITION_SHORT
+- Signal: SIGNAL_HOLD, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_CLOSE_LONG, SIGNAL_CLOSE_SHORT
+"""
+
+import numpy as np
+
+REGIME_SIDEWAYS = 0
+REGIME_BULL = 1
+REGIME_BEAR = 2
+REGIME_NAMES = ('SIDEWAYS', 'BULL', 'BEAR')
+REGIME_CODES = {name: code for code, name in enumerate(REGIME_NAMES)}
+
+POSITION_NONE = 0
+POSITION_LONG = 1
+POSITION_SHORT = 2
+POSITION_CODES = {None: POSITION_NONE, 'LONG': POSITION_LONG, 'SHORT': POSITION_SHORT}
+
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
+SIGNAL_CLOSE_LONG = 3
+SIGNAL_CLOSE_SHORT = 4
+SIGNAL_NAMES = ('HOLD', 'BUY', 'SELL', 'CLOSE_LONG', 'CLOSE_SHORT')
+
+REASON_NONE = 0
+REASON_ENTRY = 1
+REASON_STOP = 2
+REASON_TARGET = 3
+
+
+class BatchStrategy:
+    def __init__(self, bull_threshold=2.0, bear_threshold=-2.0,
+                 trend_confidence=0.8, sideways_confidence=0.6,
+                 min_confidence=0.7, stop_pct=0.02, target_pct=0.04):
+        """
+        Initialisiert die Strategie-Parameter
+
+        Args:
+            bull_threshold: 24h-Änderung in %, ab der ein BULL-Regime vorliegt
+            bear_threshold: 24h-Änderung in %, unter der ein BEAR-Regime vorliegt
+            trend_confidence: Konfidenz für BULL/BEAR
+            sideways_confidence: Konfidenz für SIDEWAYS
+            min_confidence: Mindestkonfidenz für Einstiege
+            stop_pct: Stop-Loss-Abstand (0.02 = 2%)
+            target_pct: Take-Profit-Abstand (0.04 = 4%)
+        """
+        self.bull_threshold = bull_threshold
+        self.bear_threshold = bear_threshold
+        self.trend_confidence = trend_confidence
+        self.sideways_confidence = sideways_confidence
+        self.min_confidence = min_confidence
+        self.stop_pct = stop_pct
+        self.target_pct = target_pct
+
+    def detect_regimes(self, changes):
+        """
+        Erkennt das Market Regime für alle Symbole
+
+        Args:
+            changes: 24h-Änderungen in Prozent (Array der Länge N)
+
+        Returns:
+            (Regime-Codes als int8-Array, Konfidenzen als float64-Array)
+        """
+        changes = np.asarray(changes, dtype=np.float64)
+        regimes = np.full(changes.shape, REGIME_SIDEWAYS, dtype=np.int8)
+        regimes[changes > self.bull_threshold] = REGIME_BULL
+        regimes[changes < self.bear_threshold] = REGIME_BEAR
+        confidences = np.where(regimes == REGIME_SIDEWAYS,
+                               self.sideways_confidence, self.trend_confidence)
+        return regimes, confidences
+
+    def evaluate_signals(self, prices, regimes, confidences, positions, stops, targets):
+        """
+        Erzeugt Signale, Stops und Targets für alle Symbole in einem Durchlauf
+
+        Args:
+            prices: Aktuelle Preise (N)
+            regimes: Regime-Codes (N)
+            confidences: Regime-Konfidenzen (N)
+            positions: Positions-Codes (N)
+            stops: Stop-Loss der offenen Positionen, NaN ohne Position (N)
+            targets: Take-Profit der offenen Positionen, NaN ohne Position (N)
+
+        Returns:
+            Dictionary mit Arrays 'signal', 'reason', 'stop_loss', 'take_profit'
+            (Stop/Target nur bei Einstiegen gesetzt, sonst NaN)
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        regimes = np.asarray(regimes)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        positions = np.asarray(positions)
+        stops = np.asarray(stops, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+
+        flat = positions == POSITION_NONE
+        confident = confidences > self.min_confidence
+        buy = flat & confident & (regimes == REGIME_BULL)
+        sell = flat & confident & (regimes == REGIME_BEAR)
+
+        # Vergleiche mit NaN sind False - ohne Position wird nie geschlossen
+        long_pos = positions == POSITION_LONG
+        short_pos = positions == POSITION_SHORT
+        long_stop = long_pos & (prices <= stops)
+        long_target = long_pos & ~long_stop & (prices >= targets)
+        short_stop = short_pos & (prices >= stops)
+        short_target = short_pos & ~short_stop & (prices <= targets)
+
+        signal = np.select(
+            [buy, sell, long_stop | long_target, short_stop | short_target],
+            [SIGNAL_BUY, SIGNAL_SELL, SIGNAL_CLOSE_LONG, SIGNAL_CLOSE_SHORT],
+            default=SIGNAL_HOLD
+        ).astype(np.int8)
+        reason = np.select(
+            [buy | sell, long_stop | short_stop, long_target | short_target],
+            [REASON_ENTRY, REASON_STOP, REASON_TARGET],
+            default=REASON_NONE
+        ).astype(np.int8)
+
+        stop_loss = np.full(prices.shape, np.nan)
+        take_profit = np.full(prices.shape, np.nan)
+        stop_loss[buy] = prices[buy] * (1 - self.stop_pct)
+        take_profit[buy] = prices[buy] * (1 + self.target_pct)
+        stop_loss[sell] = prices[sell] * (1 + self.stop_pct)
+        take_profit[sell] = prices[sell] * (1 - self.target_pct)
+
+        return {
+            'signal': signal,
+            'reason': reason,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit
+        }
+
+    def evaluate(self, prices, changes, positions, stops, targets):
+        """
+        Regime-Erkennung und Signalgenerierung für ein ganzes Symbol-Universum
+
+        Returns:
+            Ergebnis von evaluate_signals() ergänzt um 'regime' und 'confidence'
+        """
+        regimes, confidences = self.detect_regimes(changes)
+        result = self.evaluate_signals(prices, regimes, confidences, positions, stops, targets)
+        result['regime'] = regimes
+        result['confidence'] = confidences
+        return result
+
+    def signal_dict(self, result, index, price, confidence):
+        """
+        Übersetzt ein Ergebnis-Element in das Signal-Dictionary des Bots
+
+        Args:
+            result: Ergebnis von evaluate_signals()/evaluate()
+            index: Index des Symbols
+            price: Aktueller Preis des Symbols
+            confidence: Regime-Konfidenz
+        """
+        signal = int(result['signal'][index])
+        reason = int(result['reason'][index])
+
+        if signal == SIGNAL_BUY or signal == SIGNAL_SELL:
+            market = 'Bull' if signal == SIGNAL_BUY else 'Bear'
+            return {
+                'signal': SIGNAL_NAMES[signal],
+                'entry_price': price,
+                'stop_loss': float(result['stop_loss'][index]),
+                'take_profit': float(result['take_profit'][index]),
+                'reason': f'{market} Market Entry (Confidence: {confidence:.2f})'
+            }
+        if reason == REASON_STOP:
+            return {'signal': SIGNAL_NAMES[signal], 'reason': 'Stop Loss Hit'}
+        if reason == REASON_TARGET:
+            return {'signal': SIGNAL_NAMES[signal], 'reason': 'Take Profit Hit'}
+        return {'signal': 'HOLD', 'reason': 'No valid setup'}
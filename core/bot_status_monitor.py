@@ -5,44 +5,71 @@ Funktionen:
 - status_check(): Überprüft den aktuellen Status des Bot-Prozesses
 - log_events(): Protokolliert wichtige Bot-Ereignisse
 - emergency_stop(): Stoppt den Bot-Prozess sicher
+- record_memory(): Verfolgt RSS und Speicherzuwachs, warnt bei Grenzwerten
 """
 
-import psutil
 import logging
-import yaml
 import os
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
+
+from core.clock import SystemClock
 
 # Konfiguration laden
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), '../config/monitoring_config.yaml')
 
 class BotStatusMonitor:
-    def __init__(self, bot_pid=None):
+    def __init__(self, bot_pid=None, clock=None, log_path=None, memory_warn_mb=None,
+                 memory_growth_warn_mb_h=None, memory_sample_interval=None):
         """
         Initialisiert den Status-Monitor mit optionaler PID
         
         Args:
             bot_pid: Prozess-ID des Hauptbots (wenn nicht angegeben, wird automatisch gesucht)
+            clock: Zeitquelle für Log-Zeitstempel (Standard: Systemuhr)
+            log_path: Pfad des Event-Logs (Standard: aus der Konfiguration)
+            memory_warn_mb: Warnung ab diesem RSS in MB (0 = aus; Standard: Konfiguration)
+            memory_growth_warn_mb_h: Warnung ab diesem RSS-Zuwachs in MB pro Stunde (0 = aus)
+            memory_sample_interval: Sekunden zwischen RSS-Messungen
         """
         self.logger = logging.getLogger(__name__)
+        self.clock = clock or SystemClock()
         self.config = self.load_config()
+        self.log_path = log_path or os.path.abspath(
+            os.path.join(os.path.dirname(__file__), self.config['general']['log_path']))
         self.bot_pid = bot_pid or self.find_bot_process()
         self.status = "STOPPED"
         self.start_time = None
-        self.last_check = datetime.now()
+        self.last_check = self.clock.now()
+        
+        # RSS-Verlauf (Fenster memory.window_hours, eine Messung je sample_interval)
+        memory = self.config.get('memory', {})
+        self.memory_warn_mb = memory_warn_mb if memory_warn_mb is not None else memory.get('rss_warn_mb', 0)
+        self.memory_growth_warn = (memory_growth_warn_mb_h if memory_growth_warn_mb_h is not None
+                                   else memory.get('growth_warn_mb_per_hour', 0))
+        self.memory_sample_interval = (memory_sample_interval if memory_sample_interval is not None
+                                       else memory.get('sample_interval', 60))
+        window_hours = memory.get('window_hours', 6)
+        self.memory_samples = deque(maxlen=max(int(window_hours * 3600 / max(self.memory_sample_interval, 1)), 2))
+        self.memory_peak_mb = 0.0
+        self._memory_warned = {}
+        self._process = None
         
     def load_config(self):
         """Lädt die Monitoring-Konfiguration aus der YAML-Datei"""
         try:
             with open(CONFIG_PATH, 'r') as f:
+                import yaml
                 return yaml.safe_load(f)
         except FileNotFoundError:
             self.logger.warning("Monitoring-Konfiguration nicht gefunden. Verwende Standardwerte.")
             return {
-                'check_interval': 5,
-                'max_restarts': 3,
-                'log_path': '../logs/bot_monitor.log'
+                'general': {
+                    'check_interval': 5,
+                    'max_restarts': 3,
+                    'log_path': '../logs/bot_monitor.log'
+                }
             }
     
     def find_bot_process(self):
@@ -52,6 +79,8 @@ class BotStatusMonitor:
         Returns:
             int: Prozess-ID oder None wenn nicht gefunden
         """
+        import psutil
+        
         for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
             try:
                 cmdline = proc.info['cmdline']
@@ -63,8 +92,16 @@ class BotStatusMonitor:
     
     def status_check(self):
         """Überprüft den aktuellen Status des Bot-Prozesses"""
-        self.last_check = datetime.now()
+        self.last_check = self.clock.now()
         
+        # Eigener Prozess läuft per Definition - ohne psutil-Abfrage
+        if self.bot_pid == os.getpid():
+            self.status = "RUNNING"
+            if not self.start_time:
+                self.start_time = self.clock.now()
+            return self.status
+        
+        import psutil
         if not self.bot_pid:
             self.bot_pid = self.find_bot_process()
             if not self.bot_pid:
@@ -86,12 +123,11 @@ class BotStatusMonitor:
     
     def log_events(self, event_type, message):
         """Protokolliert ein Ereignis im Bot-Monitor-Log"""
-        log_entry = f"[{datetime.now()}] [{event_type}] {message}"
+        log_entry = f"[{self.clock.now()}] [{event_type}] {message}"
         
         # In Datei protokollieren
-        log_path = os.path.abspath(os.path.join(os.path.dirname(__file__), self.config['general']['log_path']))
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, 'a') as f:
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, 'a') as f:
             f.write(log_entry + '\n')
         
         # In Konsole protokollieren
@@ -100,6 +136,7 @@ class BotStatusMonitor:
     def emergency_stop(self):
         """Stoppt den Bot-Prozess sicher"""
         if self.status == "RUNNING":
+            import psutil
             try:
                 process = psutil.Process(self.bot_pid)
                 process.terminate()
@@ -111,6 +148,73 @@ class BotStatusMonitor:
                 return False
         return False
     
+    def record_memory(self):
+        """
+        Misst den RSS des Bot-Prozesses (höchstens einmal je sample_interval)
+        
+        Returns:
+            RSS in MB oder None, wenn keine Messung fällig bzw. möglich war
+        """
+        now = self.clock.time()
+        if self.memory_samples and now - self.memory_samples[-1][0] < self.memory_sample_interval:
+            return None
+        try:
+            if self._process is None:
+                import psutil
+                self._process = psutil.Process(self.bot_pid or os.getpid())
+            rss_mb = self._process.memory_info().rss / 1048576
+        except Exception as e:
+            self.logger.debug("RSS-Messung fehlgeschlagen: %s", e)
+            return None
+        
+        self.memory_samples.append((now, rss_mb))
+        self.memory_peak_mb = max(self.memory_peak_mb, rss_mb)
+        
+        if self.memory_warn_mb and rss_mb >= self.memory_warn_mb:
+            self._memory_warning('rss', now, f"RSS {rss_mb:.0f} MB über Grenzwert {self.memory_warn_mb:.0f} MB")
+        growth = self.memory_growth_mb_per_hour()
+        if self.memory_growth_warn and growth is not None and growth >= self.memory_growth_warn:
+            self._memory_warning('growth', now, f"Speicherzuwachs {growth:.1f} MB/h über Grenzwert "
+                                                f"{self.memory_growth_warn:.1f} MB/h (RSS {rss_mb:.0f} MB)")
+        return rss_mb
+    
+    def memory_growth_mb_per_hour(self, min_span=3600):
+        """
+        RSS-Trend als Steigung der Regressionsgeraden über das Fenster
+        
+        Args:
+            min_span: Mindestens abgedeckte Sekunden, bevor ein Trend berechnet wird
+        
+        Returns:
+            MB pro Stunde oder None bei zu kurzem Verlauf
+        """
+        if len(self.memory_samples) < 3 or self.memory_samples[-1][0] - self.memory_samples[0][0] < min_span:
+            return None
+        n = len(self.memory_samples)
+        t0 = self.memory_samples[0][0]
+        mean_t = sum(t - t0 for t, _ in self.memory_samples) / n
+        mean_m = sum(m for _, m in self.memory_samples) / n
+        cov = sum((t - t0 - mean_t) * (m - mean_m) for t, m in self.memory_samples)
+        var = sum((t - t0 - mean_t) ** 2 for t, _ in self.memory_samples)
+        return cov / var * 3600 if var else None
+    
+    def get_memory_metrics(self):
+        """RSS, Spitzenwert und Trend für die Status-Datei"""
+        growth = self.memory_growth_mb_per_hour()
+        return {
+            'rss_mb': round(self.memory_samples[-1][1], 1) if self.memory_samples else None,
+            'peak_mb': round(self.memory_peak_mb, 1),
+            'growth_mb_per_hour': round(growth, 2) if growth is not None else None,
+            'samples': len(self.memory_samples)
+        }
+    
+    def _memory_warning(self, kind, now, message):
+        # Gleiche Speicherwarnung höchstens einmal pro Stunde
+        if now - self._memory_warned.get(kind, float('-inf')) < 3600:
+            return
+        self._memory_warned[kind] = now
+        self.log_events("WARNING", message)
+    
     def get_uptime(self):
         """Berechnet die Laufzeit des Bot-Prozesses"""
         if self.status == "RUNNING" and self.start_time:
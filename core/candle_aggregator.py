@@ -0,0 +1,323 @@
+"""
+Candle Aggregator - Echtzeit-OHLCV aus öffentlichen Trades
+
+Baut aus einzelnen Trade-Prints laufende Bars pro Symbol, statt Klines zu
+pollen. Unterstützt werden Zeit-Bars sowie Volumen-, Tick- und Dollar-Bars:
+
+- "time:60"        -> 60-Sekunden-Bars (an der Epoche ausgerichtet)
+- "volume:5"       -> neuer Bar nach 5 Einheiten Basis-Volumen
+- "tick:500"       -> neuer Bar nach 500 Trades
+- "dollar:1000000" -> neuer Bar nach 1.000.000 Quote-Umsatz
+
+Doppelte Trade-IDs werden verworfen. Zeit-Bars akzeptieren verspätete Trades
+innerhalb einer Toleranz (allowed_lateness_ms) und werden erst geschlossen,
+wenn die Watermark (neuester Trade-Zeitstempel minus Toleranz) das Bar-Ende
+überschreitet. Noch spätere Trades werden gezählt und verworfen.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+BAR_TYPES = ('time', 'volume', 'tick', 'dollar')
+
+
+class TradeBar:
+    __slots__ = ('start_ms', 'end_ms', 'open', 'high', 'low', 'close', 'volume',
+                 'notional', 'buy_volume', 'trades', 'first_ts', 'last_ts', 'closed')
+
+    def __init__(self, start_ms, end_ms, ts, price, size, is_buy):
+        """
+        Aus Trades gebildeter OHLCV-Bar
+
+        Args:
+            start_ms: Startzeit (Zeit-Bars: Bucket-Start, sonst erster Trade)
+            end_ms: Endzeit (Zeit-Bars: Bucket-Ende, sonst None bis zum Schließen)
+        """
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+        self.notional = price * size
+        self.buy_volume = size if is_buy else 0.0
+        self.trades = 1
+        self.first_ts = self.last_ts = ts
+        self.closed = False
+
+    def add(self, ts, price, size, is_buy):
+        """Nimmt einen Trade auf (auch außerhalb der zeitlichen Reihenfolge)"""
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        if ts < self.first_ts:
+            self.first_ts = ts
+            self.open = price
+            if self.end_ms is None:
+                # Volumen-/Tick-/Dollar-Bars beginnen beim frühesten Trade
+                self.start_ms = ts
+        if ts >= self.last_ts:
+            self.last_ts = ts
+            self.close = price
+        self.volume += size
+        self.notional += price * size
+        if is_buy:
+            self.buy_volume += size
+        self.trades += 1
+
+    @property
+    def vwap(self):
+        return self.notional / self.volume if self.volume else self.close
+
+    def as_dict(self):
+        """Gibt den Bar im Format von BybitAPI.get_historical_data() (plus Extras) zurück"""
+        return {
+            'timestamp': self.start_ms,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'turnover': self.notional,
+            'vwap': self.vwap,
+            'buy_volume': self.buy_volume,
+            'trades': self.trades,
+            'closed': self.closed
+        }
+
+
+class _TimeBarBuilder:
+    def __init__(self, interval_ms, allowed_lateness_ms):
+        self.interval_ms = interval_ms
+        self.allowed_lateness_ms = allowed_lateness_ms
+        self.open_bars = {}
+        self.closed_until = -1
+        self.watermark = -1
+        self.late_dropped = 0
+
+    def add(self, ts, price, size, is_buy):
+        bucket = ts - ts % self.interval_ms
+        if bucket < self.closed_until:
+            self.late_dropped += 1
+            return None, []
+
+        bar = self.open_bars.get(bucket)
+        if bar is None:
+            bar = self.open_bars[bucket] = TradeBar(bucket, bucket + self.interval_ms, ts, price, size, is_buy)
+        else:
+            bar.add(ts, price, size, is_buy)
+
+        if ts - self.allowed_lateness_ms > self.watermark:
+            self.watermark = ts - self.allowed_lateness_ms
+        return bar, self.advance(self.watermark)
+
+    def advance(self, watermark):
+        # Alle Bars schließen, deren Ende vor der Watermark liegt
+        closed = []
+        for bucket in sorted(self.open_bars):
+            bar = self.open_bars[bucket]
+            if bar.end_ms > watermark:
+                break
+            bar.closed = True
+            closed.append(self.open_bars.pop(bucket))
+            self.closed_until = bar.end_ms
+        return closed
+
+    def current(self):
+        return self.open_bars[max(self.open_bars)] if self.open_bars else None
+
+
+class _ThresholdBarBuilder:
+    def __init__(self, bar_type, threshold):
+        self.bar_type = bar_type
+        self.threshold = threshold
+        self.bar = None
+        self.late_dropped = 0
+
+    def add(self, ts, price, size, is_buy):
+        # Volumen-/Tick-/Dollar-Bars folgen der Ankunftsreihenfolge; ein Trade wird nicht aufgeteilt
+        if self.bar is None:
+            self.bar = TradeBar(ts, None, ts, price, size, is_buy)
+        else:
+            self.bar.add(ts, price, size, is_buy)
+
+        if self._progress(self.bar) >= self.threshold:
+            bar, self.bar = self.bar, None
+            bar.end_ms = bar.last_ts
+            bar.closed = True
+            return bar, [bar]
+        return self.bar, []
+
+    def _progress(self, bar):
+        if self.bar_type == 'volume':
+            return bar.volume
+        if self.bar_type == 'tick':
+            return bar.trades
+        return bar.notional
+
+    def advance(self, watermark):
+        return []
+
+    def current(self):
+        return self.bar
+
+
+class CandleAggregator:
+    def __init__(self, specs=('time:60',), allowed_lateness_ms=2000, dedup_window=20000):
+        """
+        Initialisiert den Aggregator
+
+        Args:
+            specs: Bar-Definitionen wie "time:60", "volume:5", "tick:500", "dollar:1000000"
+            allowed_lateness_ms: Toleranz für verspätete Trades bei Zeit-Bars
+            dedup_window: Anzahl gemerkter Trade-IDs pro Symbol
+        """
+        self.logger = logging.getLogger(__name__)
+        self.specs = [self._parse_spec(spec) for spec in specs]
+        self.allowed_lateness_ms = allowed_lateness_ms
+        self.dedup_window = dedup_window
+        self._builders = {}
+        self._seen_ids = {}
+        self._update_callbacks = []
+        self._close_callbacks = []
+        self._lock = threading.Lock()
+        self.stats = {'trades': 0, 'duplicates': 0, 'bars_closed': 0}
+
+    @staticmethod
+    def _parse_spec(spec):
+        bar_type, _, size = spec.partition(':')
+        if bar_type not in BAR_TYPES or not size:
+            raise ValueError(f"Ungültige Bar-Definition: {spec}")
+        return spec, bar_type, float(size)
+
+    def on_update(self, callback):
+        """Registriert einen Callback(symbol, spec, bar) für jede Aktualisierung eines laufenden Bars"""
+        self._update_callbacks.append(callback)
+
+    def on_close(self, callback):
+        """Registriert einen Callback(symbol, spec, bar) für abgeschlossene Bars"""
+        self._close_callbacks.append(callback)
+
+    def _builders_for(self, symbol):
+        builders = self._builders.get(symbol)
+        if builders is None:
+            builders = {}
+            for spec, bar_type, size in self.specs:
+                if bar_type == 'time':
+                    builders[spec] = _TimeBarBuilder(int(size * 1000), self.allowed_lateness_ms)
+                else:
+                    builders[spec] = _ThresholdBarBuilder(bar_type, size)
+            self._builders[symbol] = builders
+            self._seen_ids[symbol] = (set(), deque())
+        return builders
+
+    def _is_duplicate(self, symbol, trade_id):
+        seen, order = self._seen_ids[symbol]
+        if trade_id in seen:
+            return True
+        seen.add(trade_id)
+        order.append(trade_id)
+        if len(order) > self.dedup_window:
+            seen.discard(order.popleft())
+        return False
+
+    def add_trade(self, symbol, trade_id, ts, price, size, is_buy=True):
+        """
+        Verarbeitet einen einzelnen Trade
+
+        Args:
+            symbol: Handelssymbol
+            trade_id: Eindeutige Trade-ID (None = keine Duplikatprüfung)
+            ts: Trade-Zeitstempel in Millisekunden
+            price: Preis
+            size: Menge (Basis-Coin)
+            is_buy: Ob der Taker gekauft hat
+
+        Returns:
+            Liste (spec, TradeBar) der dadurch abgeschlossenen Bars
+        """
+        updated = []
+        closed = []
+        with self._lock:
+            builders = self._builders_for(symbol)
+            if trade_id is not None and self._is_duplicate(symbol, trade_id):
+                self.stats['duplicates'] += 1
+                return closed
+            self.stats['trades'] += 1
+
+            for spec, builder in builders.items():
+                bar, finished = builder.add(ts, price, size, is_buy)
+                if bar is not None and not bar.closed:
+                    updated.append((spec, bar))
+                closed.extend((spec, b) for b in finished)
+            self.stats['bars_closed'] += len(closed)
+
+        self._emit(symbol, updated, closed)
+        return closed
+
+    def add_bybit_trades(self, trades):
+        """
+        Verarbeitet Trades im Format des Bybit publicTrade-Topics
+
+        Args:
+            trades: Liste mit Feldern T (ms), s, S, v, p, i
+        """
+        closed = []
+        for trade in trades:
+            closed.extend(self.add_trade(
+                trade['s'], trade.get('i'), int(trade['T']),
+                float(trade['p']), float(trade['v']), trade.get('S') == 'Buy'
+            ))
+        return closed
+
+    def flush(self, now_ms=None):
+        """
+        Schließt Zeit-Bars anhand der Uhrzeit, auch wenn keine Trades mehr kommen
+
+        Args:
+            now_ms: Aktuelle Zeit in Millisekunden (Standard: jetzt)
+        """
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        watermark = now_ms - self.allowed_lateness_ms
+        closed_by_symbol = []
+        with self._lock:
+            for symbol, builders in self._builders.items():
+                closed = []
+                for spec, builder in builders.items():
+                    closed.extend((spec, bar) for bar in builder.advance(watermark))
+                if closed:
+                    self.stats['bars_closed'] += len(closed)
+                    closed_by_symbol.append((symbol, closed))
+
+        for symbol, closed in closed_by_symbol:
+            self._emit(symbol, [], closed)
+        return closed_by_symbol
+
+    def get_live_bar(self, symbol, spec='time:60'):
+        """Gibt den aktuell laufenden Bar zurück (oder None)"""
+        with self._lock:
+            builder = self._builders.get(symbol, {}).get(spec)
+            return builder.current() if builder else None
+
+    def get_metrics(self):
+        """Gibt Zähler für Trades, Duplikate, verspätete Trades und Bars zurück"""
+        with self._lock:
+            late = sum(b.late_dropped for builders in self._builders.values() for b in builders.values())
+        metrics = dict(self.stats)
+        metrics['late_dropped'] = late
+        return metrics
+
+    def _emit(self, symbol, updated, closed):
+        for spec, bar in closed:
+            for callback in self._close_callbacks:
+                try:
+                    callback(symbol, spec, bar)
+                except Exception as e:
+                    self.logger.error(f"Fehler in Bar-Close-Callback ({symbol} {spec}): {e}")
+        for spec, bar in updated:
+            for callback in self._update_callbacks:
+                try:
+                    callback(symbol, spec, bar)
+                except Exception as e:
+                    self.logger.error(f"Fehler in Bar-Update-Callback ({symbol} {spec}): {e}")
@@ -0,0 +1,83 @@
+"""
+Clock - Austauschbare Zeitquelle für Bot und Simulation
+
+SystemClock liefert die echte Uhrzeit. VirtualClock hält eine simulierte
+Zeit, die bei sleep() sofort bis zum nächsten geplanten Ereignis bzw. zum
+Ende der Wartezeit springt. Damit laufen Stunden oder Wochen Bot-Verhalten
+in Sekunden ab und jede Ausführung ist exakt reproduzierbar.
+"""
+
+import heapq
+import time
+from datetime import datetime, timezone
+
+
+class SystemClock:
+    """Echte Uhrzeit (Standard im Live-Betrieb)"""
+
+    def time(self):
+        """Sekunden seit der Epoche"""
+        return time.time()
+
+    def time_ms(self):
+        """Millisekunden seit der Epoche"""
+        return int(time.time() * 1000)
+
+    def now(self):
+        """Aktuelle lokale Zeit als datetime"""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        """Wartet die angegebene Zeit"""
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    def __init__(self, start=0.0):
+        """
+        Initialisiert die virtuelle Uhr
+
+        Args:
+            start: Startzeit in Sekunden seit der Epoche
+        """
+        self._now = float(start)
+        self._timers = []
+        self._counter = 0
+
+    def time(self):
+        """Simulierte Sekunden seit der Epoche"""
+        return self._now
+
+    def time_ms(self):
+        """Simulierte Millisekunden seit der Epoche"""
+        return int(self._now * 1000)
+
+    def now(self):
+        """Simulierte Zeit als datetime (UTC, ohne Zeitzone - unabhängig vom Rechner)"""
+        return datetime.fromtimestamp(self._now, tz=timezone.utc).replace(tzinfo=None)
+
+    def call_at(self, when, callback):
+        """
+        Plant einen Callback zu einem simulierten Zeitpunkt
+
+        Callbacks mit gleichem Zeitpunkt laufen in Reihenfolge der Registrierung.
+        """
+        self._counter += 1
+        heapq.heappush(self._timers, (float(when), self._counter, callback))
+
+    def call_later(self, delay, callback):
+        """Plant einen Callback nach delay simulierten Sekunden"""
+        self.call_at(self._now + delay, callback)
+
+    def sleep(self, seconds):
+        """Springt ohne echte Wartezeit vor und führt fällige Callbacks aus"""
+        target = self._now + max(0.0, seconds)
+        while self._timers and self._timers[0][0] <= target:
+            when, _, callback = heapq.heappop(self._timers)
+            self._now = max(self._now, when)
+            callback()
+        self._now = target
+
+    def advance_to(self, when):
+        """Springt bis zu einem absoluten Zeitpunkt vor"""
+        self.sleep(when - self._now)
@@ -0,0 +1,175 @@
+"""
+Log Utils - Logging ohne Kosten im Hot Path
+
+- LogThrottle: Rate-Limit und Sampling für wiederkehrende Meldungen
+  (mit Zähler der unterdrückten Meldungen)
+- start_queue_logging(): Handler (Datei, Konsole, JSON-Lines) laufen in einem
+  eigenen Thread hinter einem QueueHandler; der aufrufende Thread legt nur
+  den LogRecord in die Queue
+- JsonLinesFormatter: strukturierte Ausgabe, eine JSON-Zeile je Meldung
+
+Meldungen immer mit %-Platzhaltern statt f-Strings übergeben, damit nur
+tatsächlich ausgegebene Meldungen formatiert werden.
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class LogThrottle:
+    def __init__(self, logger, interval=60.0, clock=time.monotonic):
+        """
+        Begrenzt wiederkehrende Meldungen eines Loggers
+
+        Args:
+            logger: Ziel-Logger
+            interval: Mindestabstand gleicher Meldungen in Sekunden
+            clock: Zeitquelle in Sekunden (z.B. Clock.time des Bots für die Simulation)
+        """
+        self.logger = logger
+        self.interval = interval
+        self.clock = clock
+        self._last = {}
+        self._suppressed = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.stats = {'emitted': 0, 'suppressed': 0}
+
+    def log(self, level, msg, *args, key=None, interval=None):
+        """
+        Gibt eine Meldung höchstens einmal je Intervall aus
+
+        Args:
+            level: Log-Level
+            msg: Meldung mit %-Platzhaltern
+            key: Schlüssel für gleiche Meldungen (Standard: msg)
+            interval: Abweichender Mindestabstand in Sekunden
+
+        Returns:
+            True, wenn die Meldung ausgegeben wurde
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+        key = key or msg
+        now = self.clock()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < (self.interval if interval is None else interval):
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                self.stats['suppressed'] += 1
+                return False
+            self._last[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+            self.stats['emitted'] += 1
+        if suppressed:
+            self.logger.log(level, msg + " (%d gleiche Meldungen unterdrückt)", *args, suppressed)
+        else:
+            self.logger.log(level, msg, *args)
+        return True
+
+    def sample(self, level, every, msg, *args, key=None):
+        """
+        Gibt nur jede every-te Meldung aus (die erste immer)
+
+        Returns:
+            True, wenn die Meldung ausgegeben wurde
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+        key = key or msg
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count % max(every, 1):
+                self.stats['suppressed'] += 1
+                return False
+            self.stats['emitted'] += 1
+        self.logger.log(level, msg, *args)
+        return True
+
+    def get_metrics(self):
+        """Anzahl ausgegebener und unterdrückter Meldungen"""
+        with self._lock:
+            return dict(self.stats)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Eine JSON-Zeile je Meldung (ts, level, logger, msg, optional exc und data)"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        data = getattr(record, 'data', None)
+        if data is not None:
+            entry['data'] = data
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, der im aufrufenden Thread nur die Meldung zusammensetzt
+
+    Der Standard-QueueHandler formatiert den kompletten Record (Zeitstempel,
+    Formatter) bereits vor dem Einreihen - das übernehmen hier die Handler
+    im Listener-Thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback-Objekte nicht an den Listener-Thread weiterreichen
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def start_queue_logging(handlers, level=logging.INFO, json_file=None, fmt=DEFAULT_FORMAT, logger=None):
+    """
+    Leitet alle Meldungen über eine Queue an die Handler
+
+    Args:
+        handlers: Handler (Datei, Konsole); ohne Formatter erhalten sie fmt
+        level: Level des Loggers
+        json_file: Optionale Datei für strukturierte JSON-Lines-Ausgabe
+        fmt: Format für Handler ohne Formatter
+        logger: Ziel-Logger (Standard: Root-Logger)
+
+    Returns:
+        Gestarteter QueueListener (beim Beenden stop() aufrufen, um die Queue zu leeren)
+    """
+    handlers = list(handlers)
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(logging.Formatter(fmt))
+    if json_file:
+        json_handler = logging.FileHandler(json_file, encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    target = logger or logging.getLogger()
+    for handler in list(target.handlers):
+        target.removeHandler(handler)
+    target.addHandler(DeferredQueueHandler(log_queue))
+    target.setLevel(level)
+
+    listener.start()
+    return listener
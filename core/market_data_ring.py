@@ -0,0 +1,313 @@
+"""
+Market-Data Ring Buffer - Verteilung von Marktdaten über Shared Memory
+
+Ein Ingest-Prozess (Single Producer) schreibt Ticks, Bars und Top-of-Book
+in einen Ringpuffer im Shared Memory. Beliebig viele Strategie-Prozesse
+(Consumer) lesen denselben Feed ohne Locks und ohne eigene Exchange-Verbindung.
+
+Speicherlayout:
+- Header (64 Bytes): Magic, Version, Kapazität, Recordgröße, Schreib-Sequenz,
+  PID und Heartbeat des Ingest-Prozesses (Owner)
+- Slots (je 128 Bytes): Slot-Sequenz, Timestamp (ns), Typ, Symbol, 10 Werte
+
+Jeder Slot ist per Seqlock geschützt: Der Writer setzt die Slot-Sequenz
+vor dem Schreiben auf 2*seq-1 (ungerade = in Arbeit) und danach auf 2*seq.
+Leser prüfen die Slot-Sequenz vor und nach dem Lesen und verwerfen
+unvollständige oder bereits überschriebene Records.
+"""
+
+import logging
+import os
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+MAGIC = b'MDRB'
+VERSION = 1
+
+HEADER = struct.Struct('<4sIQII')
+HEADER_SIZE = 64
+WRITE_SEQ_OFFSET = 32
+OWNER_OFFSET = 40
+OWNER = struct.Struct('<Qd')
+
+# Ohne Heartbeat seit so vielen Sekunden gilt der Owner als abgestürzt
+OWNER_STALE_AFTER = 30.0
+
+SLOT_SEQ = struct.Struct('<Q')
+PAYLOAD = struct.Struct('<QB7x16s10d')
+RECORD_SIZE = 128
+
+# Record-Typen
+TICK = 1
+BAR = 2
+BOOK = 3
+
+# Bedeutung der Werte je Record-Typ
+FIELDS = {
+    TICK: ('price', 'volume', 'change', 'bid', 'ask'),
+    BAR: ('open', 'high', 'low', 'close', 'volume', 'start_ms', 'interval_s'),
+    BOOK: ('bid', 'bid_size', 'ask', 'ask_size'),
+}
+
+Record = namedtuple('Record', ['seq', 'ts_ns', 'kind', 'symbol', 'values'])
+
+_SEQ = struct.Struct('<Q')
+_EMPTY_VALUES = (0.0,) * 10
+
+
+def _pid_alive(pid):
+    import psutil
+    return psutil.pid_exists(pid)
+
+
+class MarketDataRing:
+    def __init__(self, shm, owner=False):
+        """
+        Kapselt ein Shared-Memory-Segment mit Ringpuffer-Layout
+
+        Args:
+            shm: multiprocessing.shared_memory.SharedMemory
+            owner: Ob dieser Prozess das Segment erzeugt hat (und entfernen darf)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.shm = shm
+        self.buf = shm.buf
+        self.owner = owner
+
+        magic, version, capacity, record_size, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"Ungültiges Ringpuffer-Segment: {shm.name}")
+        self.capacity = capacity
+
+    @classmethod
+    def create(cls, name, capacity=65536, stale_after=OWNER_STALE_AFTER):
+        """
+        Erzeugt einen neuen Ringpuffer (verwaltet vom Ingest-Prozess)
+        
+        Ein vorhandenes Segment wird nur ersetzt, wenn sein Owner nicht mehr
+        läuft oder seit stale_after Sekunden keinen Heartbeat geschrieben hat.
+
+        Args:
+            name: Name des Shared-Memory-Segments
+            capacity: Anzahl der Slots
+            stale_after: Heartbeat-Alter in Sekunden, ab dem der Owner als abgestürzt gilt
+        
+        Raises:
+            RuntimeError: wenn ein laufender Ingest-Prozess das Segment besitzt
+        """
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            try:
+                existing = cls.attach(name)
+            except ValueError:
+                # Fremdes oder beschädigtes Segment ohne Owner-Angaben
+                pid, alive = 0, False
+            else:
+                pid = existing.owner_info()[0]
+                alive = existing.owner_alive(stale_after)
+                existing.close()
+            if alive:
+                raise RuntimeError(f"Ringpuffer '{name}' gehört dem laufenden Ingest-Prozess PID {pid}")
+            # Überbleibsel eines abgestürzten Ingest-Prozesses entfernen
+            logging.getLogger(__name__).warning("Verwaister Ringpuffer '%s' (PID %s) wird ersetzt", name, pid)
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, capacity, RECORD_SIZE, 0)
+        _SEQ.pack_into(shm.buf, WRITE_SEQ_OFFSET, 0)
+        OWNER.pack_into(shm.buf, OWNER_OFFSET, os.getpid(), time.time())
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Verbindet sich mit einem bestehenden Ringpuffer (Consumer-Seite)
+
+        Args:
+            name: Name des Shared-Memory-Segments
+        """
+        # Consumer dürfen das Segment beim Beenden nicht entfernen
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13: Registrierung beim Resource-Tracker rückgängig machen
+            shm = shared_memory.SharedMemory(name=name)
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            except Exception:
+                pass
+        return cls(shm, owner=False)
+
+    def owner_info(self):
+        """PID des Owners und Zeitpunkt seines letzten Heartbeats (Sekunden seit der Epoche)"""
+        return OWNER.unpack_from(self.buf, OWNER_OFFSET)
+    
+    def owner_alive(self, stale_after=OWNER_STALE_AFTER):
+        """Ob der Owner noch läuft und in den letzten stale_after Sekunden einen Heartbeat geschrieben hat"""
+        pid, heartbeat = self.owner_info()
+        return bool(pid) and _pid_alive(pid) and time.time() - heartbeat < stale_after
+    
+    def heartbeat(self):
+        """Markiert den Owner als lebendig (regelmäßig vom Ingest-Prozess aufzurufen)"""
+        OWNER.pack_into(self.buf, OWNER_OFFSET, os.getpid(), time.time())
+    
+    @property
+    def write_seq(self):
+        """Sequenznummer des zuletzt vollständig geschriebenen Records"""
+        return _SEQ.unpack_from(self.buf, WRITE_SEQ_OFFSET)[0]
+
+    def close(self):
+        """Löst die Verbindung; der Owner entfernt das Segment"""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def stats(self):
+        """Gibt Füllstand und letzten Schreibzeitpunkt zurück"""
+        seq = self.write_seq
+        last_ts = None
+        if seq:
+            offset = HEADER_SIZE + ((seq - 1) % self.capacity) * RECORD_SIZE
+            last_ts = PAYLOAD.unpack_from(self.buf, offset + SLOT_SEQ.size)[0]
+        pid, heartbeat = self.owner_info()
+        return {
+            'name': self.shm.name,
+            'capacity': self.capacity,
+            'write_seq': seq,
+            'last_ts_ns': last_ts,
+            'owner_pid': pid,
+            'owner_heartbeat': heartbeat
+        }
+
+
+class RingWriter:
+    def __init__(self, ring):
+        """
+        Schreibt Records in den Ringpuffer (nur ein Writer pro Segment!)
+
+        Args:
+            ring: MarketDataRing
+        """
+        self.ring = ring
+        self.seq = ring.write_seq
+
+    def publish(self, kind, symbol, values, ts_ns=None):
+        """
+        Schreibt einen Record und gibt seine Sequenznummer zurück
+
+        Args:
+            kind: TICK, BAR oder BOOK
+            symbol: Handelssymbol (max. 16 Bytes)
+            values: Werte in der Reihenfolge von FIELDS[kind]
+            ts_ns: Zeitstempel in Nanosekunden (Standard: jetzt)
+        """
+        buf = self.ring.buf
+        seq = self.seq + 1
+        offset = HEADER_SIZE + ((seq - 1) % self.ring.capacity) * RECORD_SIZE
+        padded = tuple(values) + _EMPTY_VALUES[len(values):]
+
+        SLOT_SEQ.pack_into(buf, offset, 2 * seq - 1)
+        PAYLOAD.pack_into(buf, offset + SLOT_SEQ.size,
+                          ts_ns or time.time_ns(), kind, symbol.encode('ascii'), *padded)
+        SLOT_SEQ.pack_into(buf, offset, 2 * seq)
+        _SEQ.pack_into(buf, WRITE_SEQ_OFFSET, seq)
+
+        self.seq = seq
+        return seq
+
+    def publish_tick(self, symbol, price, volume=0.0, change=0.0, bid=0.0, ask=0.0, ts_ns=None):
+        """Schreibt einen Ticker-Record"""
+        return self.publish(TICK, symbol, (price, volume, change, bid, ask), ts_ns)
+
+    def publish_bar(self, symbol, open_, high, low, close, volume, start_ms, interval_s, ts_ns=None):
+        """Schreibt einen abgeschlossenen Bar"""
+        return self.publish(BAR, symbol, (open_, high, low, close, volume, start_ms, interval_s), ts_ns)
+
+    def publish_book(self, symbol, bid, bid_size, ask, ask_size, ts_ns=None):
+        """Schreibt einen Top-of-Book-Record"""
+        return self.publish(BOOK, symbol, (bid, bid_size, ask, ask_size), ts_ns)
+
+
+class RingReader:
+    def __init__(self, ring, from_start=False):
+        """
+        Liest Records aus dem Ringpuffer (beliebig viele Reader parallel)
+
+        Args:
+            ring: MarketDataRing
+            from_start: Auch noch vorhandene ältere Records lesen
+        """
+        self.ring = ring
+        head = ring.write_seq
+        self.next_seq = max(1, head - ring.capacity + 1) if from_start else head + 1
+        self.dropped = 0
+        self.latest = {}
+
+    def _read_slot(self, seq):
+        buf = self.ring.buf
+        offset = HEADER_SIZE + ((seq - 1) % self.ring.capacity) * RECORD_SIZE
+        expected = 2 * seq
+
+        if SLOT_SEQ.unpack_from(buf, offset)[0] != expected:
+            return None
+        ts_ns, kind, raw_symbol, *values = PAYLOAD.unpack_from(buf, offset + SLOT_SEQ.size)
+        if SLOT_SEQ.unpack_from(buf, offset)[0] != expected:
+            return None
+        return Record(seq, ts_ns, kind, raw_symbol.rstrip(b'\x00').decode('ascii'), values)
+
+    def poll(self, max_records=None):
+        """
+        Liest alle neuen Records seit dem letzten Aufruf
+
+        Args:
+            max_records: Maximale Anzahl Records pro Aufruf
+
+        Returns:
+            Liste von Records; überschriebene Records werden in self.dropped gezählt
+        """
+        head = self.ring.write_seq
+        oldest = head - self.ring.capacity + 1
+        if self.next_seq < oldest:
+            # Reader zu langsam - übersprungene Records zählen
+            self.dropped += oldest - self.next_seq
+            self.next_seq = oldest
+
+        end = head if max_records is None else min(head, self.next_seq + max_records - 1)
+        records = []
+        seq = self.next_seq
+        while seq <= end:
+            record = self._read_slot(seq)
+            if record is None:
+                # Während des Lesens überschrieben
+                self.dropped += 1
+            else:
+                records.append(record)
+                self.latest[(record.kind, record.symbol)] = record
+            seq += 1
+        self.next_seq = seq
+        return records
+
+    def get_latest(self, kind, symbol):
+        """
+        Gibt den neuesten Record eines Typs für ein Symbol zurück
+
+        Returns:
+            Record oder None, wenn noch keiner empfangen wurde
+        """
+        self.poll()
+        return self.latest.get((kind, symbol))
+
+    def as_dict(self, record):
+        """Wandelt einen Record in ein Dictionary mit Feldnamen um"""
+        names = FIELDS.get(record.kind, ())
+        data = dict(zip(names, record.values))
+        data.update({'seq': record.seq, 'ts_ns': record.ts_ns, 'symbol': record.symbol})
+        return data
@@ -0,0 +1,372 @@
+"""
+Market Recorder - Komprimierte Aufzeichnung und Replay von Marktdaten
+
+Schreibt rohe Marktdaten-Nachrichten (Ticker, Trades, Orderbuch-Deltas) in
+komprimierte, zeitindizierte Dateien - eine Datei pro Symbol und UTC-Tag:
+
+    {base_dir}/{SYMBOL}/{YYYY-MM-DD}.mdr   Datenchunks
+    {base_dir}/{SYMBOL}/{YYYY-MM-DD}.idx   Chunk-Index (Offset, Zeitbereich)
+
+Records werden gepuffert und als zlib-komprimierte Chunks angehängt. Jeder
+Chunk hat einen Header mit Anzahl, Länge und Zeitbereich; der Index enthält
+dieselben Angaben. Fehlt der Index (z.B. nach einem Absturz), wird er beim
+Lesen aus den Chunk-Headern neu aufgebaut. Ein Reader liest per Zeitbereich
+nur die passenden Chunks und spielt sie mit voller Geschwindigkeit oder mit
+N-facher Echtzeit ab.
+"""
+
+import heapq
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+CHUNK_MAGIC = b'MDRC'
+# Magic, Anzahl Records, komprimierte Länge, Rohlänge, erster/letzter Zeitstempel (ms)
+CHUNK_HEADER = struct.Struct('<4sIIIqq')
+# Offset, Anzahl Records, erster/letzter Zeitstempel (ms)
+INDEX_ENTRY = struct.Struct('<QIqq')
+
+DATA_SUFFIX = '.mdr'
+INDEX_SUFFIX = '.idx'
+
+
+def _day_of(ts_ms):
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+class _DayFile:
+    def __init__(self, data_path, index_path):
+        self.data = open(data_path, 'ab')
+        self.index = open(index_path, 'ab')
+        self.records = []
+        self.raw_size = 0
+        self.first_ts = None
+        self.last_ts = None
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+class MarketRecorder:
+    def __init__(self, base_dir, chunk_records=2000, chunk_bytes=1 << 20,
+                 flush_interval=5.0, compression_level=6):
+        """
+        Initialisiert den Recorder
+
+        Args:
+            base_dir: Zielverzeichnis
+            chunk_records: Maximale Records pro Chunk
+            chunk_bytes: Maximale unkomprimierte Chunk-Größe in Bytes
+            flush_interval: Spätestens nach so vielen Sekunden wird ein Chunk geschrieben
+            compression_level: zlib-Level (1 = schnell, 9 = klein)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = base_dir
+        self.chunk_records = chunk_records
+        self.chunk_bytes = chunk_bytes
+        self.flush_interval = flush_interval
+        self.compression_level = compression_level
+        self._files = {}
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        self.stats = {'records': 0, 'chunks': 0, 'bytes_raw': 0, 'bytes_written': 0}
+
+    def record(self, symbol, kind, data, ts_ms=None):
+        """
+        Hängt eine Nachricht an
+
+        Args:
+            symbol: Handelssymbol
+            kind: Nachrichtentyp, z.B. 'ticker', 'trade', 'orderbook'
+            data: JSON-serialisierbare Rohdaten
+            ts_ms: Empfangszeitpunkt in Millisekunden (Standard: jetzt)
+        """
+        ts_ms = int(ts_ms if ts_ms is not None else time.time() * 1000)
+        line = json.dumps([ts_ms, kind, data], separators=(',', ':')).encode('utf-8') + b'\n'
+        day = _day_of(ts_ms)
+
+        with self._lock:
+            key = (symbol, day)
+            day_file = self._files.get(key)
+            if day_file is None:
+                # Tageswechsel: offene Datei des Symbols abschließen
+                for old_key in [k for k in self._files if k[0] == symbol]:
+                    self._close_file(old_key)
+                day_file = self._open_file(symbol, day)
+
+            day_file.records.append(line)
+            day_file.raw_size += len(line)
+            if day_file.first_ts is None or ts_ms < day_file.first_ts:
+                day_file.first_ts = ts_ms
+            if day_file.last_ts is None or ts_ms > day_file.last_ts:
+                day_file.last_ts = ts_ms
+            self.stats['records'] += 1
+
+            if len(day_file.records) >= self.chunk_records or day_file.raw_size >= self.chunk_bytes:
+                self._write_chunk(day_file)
+
+            if time.time() - self._last_flush >= self.flush_interval:
+                self._flush_all()
+
+    def record_bybit_message(self, message):
+        """
+        Zeichnet eine Nachricht eines öffentlichen Bybit-Streams auf
+
+        Args:
+            message: Dictionary mit topic (z.B. 'publicTrade.BTCUSDT'), ts und data
+        """
+        topic = message.get('topic', '')
+        kind, _, symbol = topic.rpartition('.')
+        if not kind:
+            return
+        if kind.startswith('orderbook'):
+            # Typ (snapshot/delta) für korrektes Replay mitschreiben
+            data = {'type': message.get('type'), 'data': message.get('data')}
+            kind = 'orderbook'
+        elif kind == 'publicTrade':
+            data = message.get('data')
+            kind = 'trade'
+        else:
+            data = message.get('data')
+        self.record(symbol, kind, data)
+
+    def flush(self):
+        """Schreibt alle gepufferten Records auf die Platte"""
+        with self._lock:
+            self._flush_all()
+
+    def close(self):
+        """Schreibt offene Chunks und schließt alle Dateien"""
+        with self._lock:
+            for key in list(self._files):
+                self._close_file(key)
+
+    def get_metrics(self):
+        """Gibt Zähler und Kompressionsrate zurück"""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics['open_files'] = len(self._files)
+        metrics['compression_ratio'] = (metrics['bytes_raw'] / metrics['bytes_written']
+                                        if metrics['bytes_written'] else None)
+        return metrics
+
+    def _open_file(self, symbol, day):
+        directory = os.path.join(self.base_dir, symbol)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, day)
+        day_file = _DayFile(base + DATA_SUFFIX, base + INDEX_SUFFIX)
+        self._files[(symbol, day)] = day_file
+        return day_file
+
+    def _close_file(self, key):
+        day_file = self._files.pop(key)
+        try:
+            self._write_chunk(day_file)
+        finally:
+            day_file.close()
+
+    def _flush_all(self):
+        for day_file in self._files.values():
+            self._write_chunk(day_file)
+        self._last_flush = time.time()
+
+    def _write_chunk(self, day_file):
+        if not day_file.records:
+            return
+        raw = b''.join(day_file.records)
+        compressed = zlib.compress(raw, self.compression_level)
+        offset = day_file.data.tell()
+        count = len(day_file.records)
+
+        day_file.data.write(CHUNK_HEADER.pack(CHUNK_MAGIC, count, len(compressed), len(raw),
+                                              day_file.first_ts, day_file.last_ts))
+        day_file.data.write(compressed)
+        day_file.data.flush()
+        # Index erst nach dem Chunk schreiben - ein Indexeintrag zeigt nie auf halbe Daten
+        day_file.index.write(INDEX_ENTRY.pack(offset, count, day_file.first_ts, day_file.last_ts))
+        day_file.index.flush()
+
+        self.stats['chunks'] += 1
+        self.stats['bytes_raw'] += len(raw)
+        self.stats['bytes_written'] += CHUNK_HEADER.size + len(compressed)
+        day_file.records = []
+        day_file.raw_size = 0
+        day_file.first_ts = day_file.last_ts = None
+
+
+class MarketReplay:
+    def __init__(self, base_dir):
+        """
+        Liest Aufzeichnungen des MarketRecorder
+
+        Args:
+            base_dir: Verzeichnis der Aufzeichnungen
+        """
+        self.logger = logging.getLogger(__name__)
+        self.base_dir = base_dir
+
+    def symbols(self):
+        """Gibt alle aufgezeichneten Symbole zurück"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(name for name in os.listdir(self.base_dir)
+                      if os.path.isdir(os.path.join(self.base_dir, name)))
+
+    def days(self, symbol):
+        """Gibt alle aufgezeichneten Tage eines Symbols zurück (YYYY-MM-DD)"""
+        directory = os.path.join(self.base_dir, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len(DATA_SUFFIX)] for name in os.listdir(directory)
+                      if name.endswith(DATA_SUFFIX))
+
+    def load_index(self, symbol, day):
+        """
+        Lädt den Chunk-Index eines Tages
+
+        Returns:
+            Liste von (offset, anzahl, erster_ts, letzter_ts), nach Offset sortiert
+        """
+        base = os.path.join(self.base_dir, symbol, day)
+        data_path = base + DATA_SUFFIX
+        index_path = base + INDEX_SUFFIX
+        data_size = os.path.getsize(data_path)
+
+        entries = []
+        if os.path.exists(index_path):
+            with open(index_path, 'rb') as f:
+                raw = f.read()
+            usable = len(raw) - len(raw) % INDEX_ENTRY.size
+            entries = [INDEX_ENTRY.unpack_from(raw, pos) for pos in range(0, usable, INDEX_ENTRY.size)]
+
+        # Chunks hinter dem letzten Indexeintrag (Absturz zwischen Chunk und Index) nachscannen
+        offset = 0
+        if entries:
+            last_offset = entries[-1][0]
+            with open(data_path, 'rb') as f:
+                f.seek(last_offset)
+                header = f.read(CHUNK_HEADER.size)
+            if len(header) == CHUNK_HEADER.size:
+                offset = last_offset + CHUNK_HEADER.size + CHUNK_HEADER.unpack(header)[2]
+        if offset < data_size:
+            entries.extend(self._scan_chunks(data_path, offset))
+        return entries
+
+    def _scan_chunks(self, data_path, offset):
+        entries = []
+        with open(data_path, 'rb') as f:
+            f.seek(offset)
+            while True:
+                header = f.read(CHUNK_HEADER.size)
+                if len(header) < CHUNK_HEADER.size:
+                    break
+                magic, count, length, _, first_ts, last_ts = CHUNK_HEADER.unpack(header)
+                if magic != CHUNK_MAGIC:
+                    self.logger.warning(f"Beschädigter Chunk in {data_path} bei Offset {offset}")
+                    break
+                f.seek(length, os.SEEK_CUR)
+                if f.tell() > os.fstat(f.fileno()).st_size:
+                    # Unvollständig geschriebener letzter Chunk
+                    break
+                entries.append((offset, count, first_ts, last_ts))
+                offset += CHUNK_HEADER.size + length
+        return entries
+
+    def _read_chunk(self, f, offset):
+        f.seek(offset)
+        magic, count, length, _, _, _ = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+        if magic != CHUNK_MAGIC:
+            raise ValueError(f"Ungültiger Chunk bei Offset {offset}")
+        raw = zlib.decompress(f.read(length))
+        return [json.loads(line) for line in raw.splitlines()]
+
+    def read(self, symbol, start_ms=None, end_ms=None, kinds=None):
+        """
+        Liest Records eines Symbols in einem Zeitbereich
+
+        Args:
+            symbol: Handelssymbol
+            start_ms: Beginn (inklusive, Standard: Anfang der Aufzeichnung)
+            end_ms: Ende (exklusive, Standard: Ende der Aufzeichnung)
+            kinds: Optional nur diese Nachrichtentypen
+
+        Yields:
+            (ts_ms, symbol, kind, data) in Aufzeichnungsreihenfolge
+        """
+        kinds = set(kinds) if kinds else None
+        first_day = _day_of(start_ms) if start_ms is not None else None
+        last_day = _day_of(end_ms - 1) if end_ms is not None else None
+
+        for day in self.days(symbol):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            entries = self.load_index(symbol, day)
+            data_path = os.path.join(self.base_dir, symbol, day + DATA_SUFFIX)
+            with open(data_path, 'rb') as f:
+                for offset, _, chunk_first, chunk_last in entries:
+                    # Chunks außerhalb des Bereichs nicht dekomprimieren
+                    if start_ms is not None and chunk_last < start_ms:
+                        continue
+                    if end_ms is not None and chunk_first >= end_ms:
+                        continue
+                    for ts_ms, kind, data in self._read_chunk(f, offset):
+                        if start_ms is not None and ts_ms < start_ms:
+                            continue
+                        if end_ms is not None and ts_ms >= end_ms:
+                            continue
+                        if kinds and kind not in kinds:
+                            continue
+                        yield ts_ms, symbol, kind, data
+
+    def read_merged(self, symbols=None, start_ms=None, end_ms=None, kinds=None):
+        """
+        Liest mehrere Symbole zeitlich gemischt (k-Wege-Merge)
+
+        Yields:
+            (ts_ms, symbol, kind, data) nach Zeitstempel sortiert
+        """
+        symbols = symbols or self.symbols()
+        streams = [self.read(symbol, start_ms, end_ms, kinds) for symbol in symbols]
+        return heapq.merge(*streams, key=lambda record: record[0])
+
+    def replay(self, callback, symbols=None, start_ms=None, end_ms=None, kinds=None,
+               speed=None, sleep=time.sleep):
+        """
+        Spielt Aufzeichnungen ab
+
+        Args:
+            callback: Funktion(ts_ms, symbol, kind, data)
+            speed: None = volle Geschwindigkeit, sonst N-fache Echtzeit
+            sleep: Sleep-Funktion (austauschbar für virtuelle Uhren)
+
+        Returns:
+            Anzahl abgespielter Records
+        """
+        count = 0
+        first_ts = None
+        started = time.monotonic()
+        for ts_ms, symbol, kind, data in self.read_merged(symbols, start_ms, end_ms, kinds):
+            if speed:
+                if first_ts is None:
+                    first_ts = ts_ms
+                delay = (ts_ms - first_ts) / 1000 / speed - (time.monotonic() - started)
+                if delay > 0:
+                    sleep(delay)
+            callback(ts_ms, symbol, kind, data)
+            count += 1
+        return count
+
+    def time_range(self, symbol):
+        """Gibt (erster_ts, letzter_ts) der Aufzeichnung eines Symbols zurück (oder None)"""
+        first_ts = last_ts = None
+        for day in self.days(symbol):
+            for _, _, chunk_first, chunk_last in self.load_index(symbol, day):
+                first_ts = chunk_first if first_ts is None else min(first_ts, chunk_first)
+                last_ts = chunk_last if last_ts is None else max(last_ts, chunk_last)
+        return (first_ts, last_ts) if first_ts is not None else None
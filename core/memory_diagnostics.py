@@ -0,0 +1,156 @@
+"""
+Memory Diagnostics - tracemalloc-Snapshots auf Befehl
+
+Für lange laufende Sessions (Wochen) ohne Neustart:
+
+- MEM_START: startet tracemalloc und nimmt einen Basis-Snapshot
+- MEM_SNAPSHOT: neuer Snapshot, Differenz zur Basis und zum vorherigen
+  Snapshot, Top-Allokationsstellen -> Bericht neben der Status-Datei
+- MEM_STOP: beendet tracemalloc und gibt die Snapshots frei
+
+tracemalloc kostet nur zwischen MEM_START und MEM_STOP Laufzeit und Speicher.
+Den RSS-Verlauf ohne tracemalloc überwacht BotStatusMonitor.record_memory().
+"""
+
+import json
+import logging
+import os
+import tracemalloc
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Allokationen der Diagnose selbst und des Import-Systems ausblenden
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _format_stat(stat, diff=False):
+    frame = stat.traceback[0]
+    entry = {
+        'site': f"{frame.filename}:{frame.lineno}",
+        'size_kb': round(stat.size / 1024, 1),
+        'count': stat.count
+    }
+    if diff:
+        entry['size_diff_kb'] = round(stat.size_diff / 1024, 1)
+        entry['count_diff'] = stat.count_diff
+    return entry
+
+
+class MemoryDiagnostics:
+    def __init__(self, output_dir, frames=10):
+        """
+        Initialisiert die Diagnose
+
+        Args:
+            output_dir: Verzeichnis für die Berichte
+            frames: Gespeicherte Stacktiefe je Allokation (mehr = genauer, aber teurer)
+        """
+        self.output_dir = output_dir
+        self.frames = frames
+        self.baseline = None
+        self.previous = None
+        self.started_at = None
+        self.last_report = None
+        self._owns_tracing = False
+
+    @property
+    def active(self):
+        return self.baseline is not None
+
+    def start(self, frames=None):
+        """Startet tracemalloc und nimmt den Basis-Snapshot"""
+        if self.active:
+            logger.warning("Speicherdiagnose läuft bereits")
+            return False
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(int(frames or self.frames))
+            self._owns_tracing = True
+        self.baseline = self._take()
+        self.previous = None
+        self.started_at = datetime.now()
+        logger.info("Speicherdiagnose gestartet (tracemalloc, %s Frames)", tracemalloc.get_traceback_limit())
+        return True
+
+    def snapshot(self, limit=15):
+        """
+        Nimmt einen Snapshot und schreibt einen Bericht
+
+        Args:
+            limit: Anzahl der Einträge je Liste
+
+        Returns:
+            Bericht als Dictionary (None, wenn nicht gestartet)
+        """
+        if not self.active:
+            logger.warning("Speicherdiagnose nicht gestartet (MEM_START)")
+            return None
+
+        current = self._take()
+        since_start = current.compare_to(self.baseline, 'lineno')
+        report = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'started': self.started_at.isoformat(timespec='seconds'),
+            'traced_mb': round(sum(stat.size for stat in current.statistics('filename')) / 1048576, 2),
+            'growth_since_start_kb': round(sum(stat.size_diff for stat in since_start) / 1024, 1),
+            'top_growth_since_start': [_format_stat(stat, diff=True) for stat in since_start[:limit]],
+            'top_allocations': [_format_stat(stat) for stat in current.statistics('lineno')[:limit]],
+            'top_traceback': self._largest_traceback(current)
+        }
+        if self.previous is not None:
+            since_last = current.compare_to(self.previous, 'lineno')
+            report['growth_since_last_kb'] = round(sum(stat.size_diff for stat in since_last) / 1024, 1)
+            report['top_growth_since_last'] = [_format_stat(stat, diff=True) for stat in since_last[:limit]]
+        self.previous = current
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        report['file'] = path
+
+        top = report['top_growth_since_start'][:1]
+        logger.info("Speicher-Snapshot: +%.1f KB seit Start%s -> %s", report['growth_since_start_kb'],
+                    f" (größter Zuwachs {top[0]['site']})" if top else "", path)
+        self.last_report = {key: report[key] for key in ('timestamp', 'traced_mb', 'growth_since_start_kb', 'file')}
+        self.last_report['top_growth'] = top
+        return report
+
+    def stop(self):
+        """Beendet die Diagnose und gibt die Snapshots frei"""
+        if not self.active:
+            return False
+        self.baseline = None
+        self.previous = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        logger.info("Speicherdiagnose beendet")
+        return True
+
+    def status(self):
+        """Zustand für die Status-Datei"""
+        traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+        return {
+            'active': self.active,
+            'traced_mb': round(traced[0] / 1048576, 2) if traced else None,
+            'peak_mb': round(traced[1] / 1048576, 2) if traced else None,
+            'last': self.last_report
+        }
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    @staticmethod
+    def _largest_traceback(snapshot):
+        stats = snapshot.statistics('traceback')
+        if not stats:
+            return None
+        stat = stats[0]
+        return {'size_kb': round(stat.size / 1024, 1), 'count': stat.count,
+                'traceback': stat.traceback.format()}
@@ -0,0 +1,253 @@
+"""
+Orderbook Analytics - Vektorisierte Tiefen- und Slippage-Schätzung
+
+Wandelt die Level eines Orderbuchs einmalig in NumPy-Arrays mit kumulierter
+Menge und kumuliertem Notional um. Danach sind alle Abfragen Array-Lookups
+(searchsorted) statt Python-Schleifen über die Level:
+
+- fill_estimate(): durchschnittlicher Fill-Preis und Slippage für eine Ordergröße
+- fill_estimates(): dasselbe für viele Ordergrößen in einem Aufruf
+- max_qty_for_slippage(): größte Menge innerhalb eines Slippage-Limits
+- depth_within(): Tiefe innerhalb von X Basispunkten um den Mid-Preis
+- imbalance(): Bid/Ask-Ungleichgewicht
+
+Slippage wird in Basispunkten gegenüber dem Mid-Preis angegeben und ist
+immer positiv, wenn der Fill ungünstiger als der Mid ist.
+"""
+
+import numpy as np
+
+
+def _levels(rows):
+    if not rows:
+        return np.empty(0), np.empty(0)
+    levels = np.asarray(rows, dtype=np.float64).reshape(-1, 2)
+    return levels[:, 0], levels[:, 1]
+
+
+class OrderBookSnapshot:
+    __slots__ = ('symbol', 'ts', 'bid_px', 'bid_qty', 'ask_px', 'ask_qty',
+                 'bid_cum_qty', 'bid_cum_notional', 'ask_cum_qty', 'ask_cum_notional')
+
+    def __init__(self, bids, asks, symbol=None, ts=None):
+        """
+        Erstellt einen Snapshot aus Preis-/Mengen-Leveln
+
+        Args:
+            bids: [[preis, menge], ...] absteigend nach Preis (Strings oder Zahlen)
+            asks: [[preis, menge], ...] aufsteigend nach Preis
+            symbol: Handelssymbol
+            ts: Zeitstempel des Orderbuchs in Millisekunden
+        """
+        self.symbol = symbol
+        self.ts = ts
+        self.bid_px, self.bid_qty = _levels(bids)
+        self.ask_px, self.ask_qty = _levels(asks)
+        self.bid_cum_qty = np.cumsum(self.bid_qty)
+        self.bid_cum_notional = np.cumsum(self.bid_px * self.bid_qty)
+        self.ask_cum_qty = np.cumsum(self.ask_qty)
+        self.ask_cum_notional = np.cumsum(self.ask_px * self.ask_qty)
+
+    @classmethod
+    def from_bybit(cls, result):
+        """
+        Erstellt einen Snapshot aus BybitAPI.get_order_book()
+
+        Args:
+            result: V5-Ergebnis mit 'b'/'a' (oder 'bids'/'asks'), 's' und 'ts'
+        """
+        bids = result.get('b', result.get('bids', []))
+        asks = result.get('a', result.get('asks', []))
+        return cls(bids, asks, symbol=result.get('s'), ts=result.get('ts'))
+
+    @property
+    def empty(self):
+        return not (len(self.bid_px) and len(self.ask_px))
+
+    @property
+    def best_bid(self):
+        return float(self.bid_px[0]) if len(self.bid_px) else None
+
+    @property
+    def best_ask(self):
+        return float(self.ask_px[0]) if len(self.ask_px) else None
+
+    @property
+    def mid(self):
+        if self.empty:
+            return None
+        return (self.bid_px[0] + self.ask_px[0]) / 2
+
+    @property
+    def spread_bps(self):
+        if self.empty:
+            return None
+        return float((self.ask_px[0] - self.bid_px[0]) / self.mid * 1e4)
+
+    def _side(self, side):
+        # Kauf läuft die Asks hoch, Verkauf die Bids hinunter
+        if side == 'Buy':
+            return self.ask_px, self.ask_cum_qty, self.ask_cum_notional
+        return self.bid_px, self.bid_cum_qty, self.bid_cum_notional
+
+    def _slippage_bps(self, side, avg_price):
+        mid = self.mid
+        if side == 'Buy':
+            return (avg_price / mid - 1) * 1e4
+        return (1 - avg_price / mid) * 1e4
+
+    def fill_estimates(self, side, qtys):
+        """
+        Schätzt Fills für viele Ordergrößen gleichzeitig
+
+        Args:
+            side: 'Buy' oder 'Sell'
+            qtys: Array von Mengen (Basis-Coin)
+
+        Returns:
+            Dictionary mit Arrays 'avg_price', 'filled_qty', 'notional', 'slippage_bps'
+            und 'levels' (Anzahl berührter Level); Mengen über der sichtbaren Tiefe
+            werden nur bis zur Tiefe gefüllt
+        """
+        px, cum_qty, cum_notional = self._side(side)
+        qtys = np.asarray(qtys, dtype=np.float64)
+        if self.empty:
+            nan = np.full(qtys.shape, np.nan)
+            return {'avg_price': nan, 'filled_qty': np.zeros(qtys.shape), 'notional': np.zeros(qtys.shape),
+                    'slippage_bps': nan, 'levels': np.zeros(qtys.shape, dtype=np.int64)}
+
+        filled = np.minimum(qtys, cum_qty[-1])
+        # Index des Levels, in dem die Order endet
+        idx = np.minimum(np.searchsorted(cum_qty, filled, side='left'), len(px) - 1)
+        prev_qty = np.where(idx > 0, cum_qty[idx - 1], 0.0)
+        prev_notional = np.where(idx > 0, cum_notional[idx - 1], 0.0)
+        notional = prev_notional + (filled - prev_qty) * px[idx]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_price = np.where(filled > 0, notional / filled, px[0])
+        return {
+            'avg_price': avg_price,
+            'filled_qty': filled,
+            'notional': notional,
+            'slippage_bps': self._slippage_bps(side, avg_price),
+            'levels': idx + 1
+        }
+
+    def fill_estimate(self, side, qty=None, notional=None):
+        """
+        Schätzt den Fill einer Market-Order
+
+        Args:
+            side: 'Buy' oder 'Sell'
+            qty: Menge (Basis-Coin)
+            notional: Alternativ Orderwert in Quote-Währung (wird über den Mid umgerechnet)
+
+        Returns:
+            Dictionary mit avg_price, filled_qty, notional, slippage_bps, levels, fully_filled
+            (None bei leerem Orderbuch)
+        """
+        if self.empty:
+            return None
+        if qty is None:
+            qty = notional / self.mid
+        # Skalare Variante von fill_estimates() ohne Array-Overhead
+        px, cum_qty, cum_notional = self._side(side)
+        filled = min(float(qty), float(cum_qty[-1]))
+        idx = min(int(np.searchsorted(cum_qty, filled)), len(px) - 1)
+        prev_qty = float(cum_qty[idx - 1]) if idx else 0.0
+        prev_notional = float(cum_notional[idx - 1]) if idx else 0.0
+        fill_notional = prev_notional + (filled - prev_qty) * float(px[idx])
+        avg_price = fill_notional / filled if filled > 0 else float(px[0])
+        return {
+            'avg_price': avg_price,
+            'filled_qty': filled,
+            'notional': fill_notional,
+            'slippage_bps': float(self._slippage_bps(side, avg_price)),
+            'levels': idx + 1,
+            'fully_filled': filled >= qty
+        }
+
+    def max_qty_for_slippage(self, side, max_slippage_bps):
+        """
+        Größte Menge, deren Durchschnittspreis innerhalb des Slippage-Limits bleibt
+
+        Args:
+            side: 'Buy' oder 'Sell'
+            max_slippage_bps: Erlaubte Slippage gegenüber dem Mid in Basispunkten
+
+        Returns:
+            Menge (0.0 bei leerem Buch oder wenn schon das beste Level zu teuer ist)
+        """
+        if self.empty:
+            return 0.0
+        px, cum_qty, cum_notional = self._side(side)
+        mid = self.mid
+        limit = mid * (1 + max_slippage_bps / 1e4) if side == 'Buy' else mid * (1 - max_slippage_bps / 1e4)
+
+        # Durchschnittspreis nach vollständigem Abräumen jedes Levels (monoton)
+        avg_at_level = cum_notional / cum_qty
+        within = avg_at_level <= limit if side == 'Buy' else avg_at_level >= limit
+        k = int(np.argmin(within)) if not within.all() else len(px)
+        if k == len(px):
+            return float(cum_qty[-1])
+
+        # Level k nur teilweise: (N + (q - Q) * p) / q = limit nach q auflösen
+        prev_qty = cum_qty[k - 1] if k > 0 else 0.0
+        prev_notional = cum_notional[k - 1] if k > 0 else 0.0
+        p = px[k]
+        if p == limit:
+            return float(cum_qty[k])
+        q = (prev_qty * p - prev_notional) / (p - limit)
+        return float(max(0.0, min(q, cum_qty[k])))
+
+    def depth_within(self, bps):
+        """
+        Sichtbare Tiefe innerhalb von bps Basispunkten um den Mid-Preis
+
+        Returns:
+            Dictionary mit bid_qty, ask_qty, bid_notional, ask_notional
+        """
+        if self.empty:
+            return {'bid_qty': 0.0, 'ask_qty': 0.0, 'bid_notional': 0.0, 'ask_notional': 0.0}
+        mid = self.mid
+        bid_mask = self.bid_px >= mid * (1 - bps / 1e4)
+        ask_mask = self.ask_px <= mid * (1 + bps / 1e4)
+        return {
+            'bid_qty': float(self.bid_qty[bid_mask].sum()),
+            'ask_qty': float(self.ask_qty[ask_mask].sum()),
+            'bid_notional': float((self.bid_px[bid_mask] * self.bid_qty[bid_mask]).sum()),
+            'ask_notional': float((self.ask_px[ask_mask] * self.ask_qty[ask_mask]).sum())
+        }
+
+    def imbalance(self, levels=None, within_bps=None):
+        """
+        Bid/Ask-Ungleichgewicht (bid - ask) / (bid + ask) im Bereich [-1, 1]
+
+        Args:
+            levels: Nur die ersten N Level je Seite
+            within_bps: Alternativ nur Level innerhalb von X Basispunkten um den Mid
+        """
+        if self.empty:
+            return 0.0
+        if within_bps is not None:
+            depth = self.depth_within(within_bps)
+            bid, ask = depth['bid_qty'], depth['ask_qty']
+        else:
+            bid = float(self.bid_qty[:levels].sum())
+            ask = float(self.ask_qty[:levels].sum())
+        total = bid + ask
+        return (bid - ask) / total if total else 0.0
+
+    def summary(self, depth_bps=(10, 50)):
+        """Kennzahlen für Logs und Status-Datei"""
+        if self.empty:
+            return {'empty': True}
+        result = {
+            'mid': float(self.mid),
+            'spread_bps': self.spread_bps,
+            'imbalance': self.imbalance(levels=10)
+        }
+        for bps in depth_bps:
+            depth = self.depth_within(bps)
+            result[f'depth_{bps}bps'] = depth['bid_notional'] + depth['ask_notional']
+        return result
@@ -0,0 +1,250 @@
+"""
+Performance Tracker - Laufende Performance- und Risikokennzahlen
+
+Aktualisiert Equity-Kurve, Drawdown, Trefferquote, Profit Factor,
+rollierende Sharpe-/Sortino-Ratio und Exposure inkrementell: jeder Trade und
+jede Mark-to-Market-Bewertung kostet O(1), jede Abfrage ebenfalls. Werte
+liegen in kompakten array('d')-Puffern statt in Listen von Dictionaries.
+
+Sharpe und Sortino beruhen auf Renditen fester Perioden (Standard: UTC-Tage),
+nicht auf den einzelnen Bewertungen - deren Abstand hängt vom Polling ab, und
+die vielen Null-Renditen ohne Position ergäben sinnlos hohe Jahreswerte.
+
+Die Risikogrenzen (maximaler Drawdown, Tagesverlust) werden bei jeder
+Bewertung mitgeprüft und können so direkt in der Handelsschleife
+abgefragt werden.
+"""
+
+import math
+from array import array
+
+SECONDS_PER_YEAR = 365 * 86400
+
+# Relative Varianz, unterhalb der Renditen als konstant gelten
+RESIDUE = 1e-12
+
+
+class PerformanceTracker:
+    def __init__(self, start_equity, max_drawdown=0.15, daily_loss_limit=5.0,
+                 window=30, history=100000, period=86400):
+        """
+        Initialisiert den Tracker
+
+        Args:
+            start_equity: Startkapital
+            max_drawdown: Maximaler Drawdown vom Höchststand als Anteil (0.15 = 15%, 0 = aus)
+            daily_loss_limit: Maximaler Verlust je UTC-Tag in Prozent des Tagesanfangs (0 = aus)
+            window: Anzahl abgeschlossener Perioden für die rollierende Sharpe-/Sortino-Ratio
+            history: Maximale Länge der gespeicherten Equity-Kurve (älteste Hälfte wird verworfen)
+            period: Periodenlänge der Renditen in Sekunden (Standard: ein Tag)
+        """
+        self.start_equity = float(start_equity)
+        self.max_drawdown_limit = max_drawdown
+        self.daily_loss_limit = daily_loss_limit
+        self.history = history
+
+        # Equity-Kurve (Zeitstempel in Sekunden, Equity)
+        self.ts = array('d')
+        self.equity = array('d')
+        self.peak = self.start_equity
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+
+        # Trade-Ergebnisse
+        self.trade_pnl = array('d')
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+        # Rollierendes Fenster der Periodenrenditen mit Summen je abgeschlossener Periode
+        self.window = window
+        self.period = period
+        self._returns = array('d', bytes(8 * window))
+        self._ret_index = 0
+        self._ret_count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._sum_down_sq = 0.0
+        self._period = None
+        self._period_start_equity = self.start_equity
+
+        # Exposure: Zeit im Markt und aktueller Positionswert
+        self.exposure = 0.0
+        self._time_total = 0.0
+        self._time_exposed = 0.0
+
+        # Tagesverlust
+        self.day = None
+        self.day_start_equity = self.start_equity
+
+        self.last_ts = None
+        self.last_equity = self.start_equity
+        self.breach = None
+
+    def mark(self, ts, equity, exposure=0.0):
+        """
+        Mark-to-Market-Bewertung
+
+        Args:
+            ts: Zeitstempel in Sekunden seit der Epoche
+            equity: Kontostand inkl. unrealisiertem P&L
+            exposure: Positionswert (absolut) in Quote-Währung
+
+        Returns:
+            Grund der Grenzverletzung oder None
+        """
+        equity = float(equity)
+        day = int(ts // 86400)
+        if day != self.day:
+            self.day = day
+            self.day_start_equity = self.last_equity if self.last_ts is not None else equity
+            if self.breach and self.breach.startswith('DAILY'):
+                self.breach = None
+
+        period = int(ts // self.period)
+        if self._period is None:
+            self._period = period
+            self._period_start_equity = equity
+        elif period > self._period:
+            # Abgeschlossene Periode: Rendite vom Periodenbeginn bis zur letzten Bewertung
+            if self._period_start_equity:
+                self._push_return(self.last_equity / self._period_start_equity - 1.0)
+            # Perioden ohne Bewertung (Bot gestoppt) zählen mit Rendite 0
+            for _ in range(min(period - self._period - 1, self.window)):
+                self._push_return(0.0)
+            self._period = period
+            self._period_start_equity = self.last_equity
+        
+        if self.last_ts is not None:
+            dt = ts - self.last_ts
+            if dt > 0:
+                self._time_total += dt
+                if self.exposure:
+                    self._time_exposed += dt
+
+        if len(self.equity) >= self.history:
+            # Älteste Hälfte verwerfen statt bei jedem Eintrag zu verschieben
+            del self.ts[:self.history // 2]
+            del self.equity[:self.history // 2]
+        self.ts.append(ts)
+        self.equity.append(equity)
+
+        if equity > self.peak:
+            self.peak = equity
+        self.drawdown = 1.0 - equity / self.peak if self.peak > 0 else 0.0
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+
+        self.exposure = abs(float(exposure))
+        self.last_ts = ts
+        self.last_equity = equity
+        return self._check_limits()
+
+    def record_trade(self, pnl):
+        """Nimmt das Ergebnis eines geschlossenen Trades auf"""
+        pnl = float(pnl)
+        self.trade_pnl.append(pnl)
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss -= pnl
+
+    @property
+    def trades(self):
+        return len(self.trade_pnl)
+
+    @property
+    def win_rate(self):
+        return self.wins / self.trades if self.trade_pnl else None
+
+    @property
+    def profit_factor(self):
+        if self.gross_loss:
+            return self.gross_profit / self.gross_loss
+        return math.inf if self.gross_profit else None
+
+    @property
+    def daily_pnl(self):
+        return self.last_equity - self.day_start_equity
+
+    @property
+    def exposure_ratio(self):
+        """Aktueller Positionswert relativ zur Equity"""
+        return self.exposure / self.last_equity if self.last_equity else 0.0
+
+    @property
+    def time_in_market(self):
+        """Anteil der Zeit mit offener Position"""
+        return self._time_exposed / self._time_total if self._time_total else 0.0
+
+    def sharpe(self):
+        """Annualisierte Sharpe-Ratio über die Periodenrenditen im Fenster (None bei zu wenig Daten)"""
+        n = self._ret_count
+        if n < 2:
+            return None
+        mean = self._sum / n
+        variance = (self._sum_sq / n - mean * mean) * n / (n - 1)
+        if variance <= RESIDUE * max(self._sum_sq / n, RESIDUE):
+            # Konstante Renditen (z.B. nur flache Perioden) - Ratio nicht definiert
+            return None
+        return mean / math.sqrt(variance) * self._annualization()
+
+    def sortino(self):
+        """Annualisierte Sortino-Ratio über die Periodenrenditen im Fenster (None ohne Verlustperiode)"""
+        n = self._ret_count
+        if n < 2 or self._sum_down_sq <= 0:
+            return None
+        downside = math.sqrt(self._sum_down_sq / n)
+        return self._sum / n / downside * self._annualization()
+
+    def snapshot(self):
+        """Alle Kennzahlen für Logs und Status-Datei"""
+        profit_factor = self.profit_factor
+        sharpe = self.sharpe()
+        sortino = self.sortino()
+        return {
+            'equity': round(self.last_equity, 2),
+            'peak': round(self.peak, 2),
+            'return_pct': round((self.last_equity / self.start_equity - 1) * 100, 2) if self.start_equity else None,
+            'drawdown_pct': round(self.drawdown * 100, 2),
+            'max_drawdown_pct': round(self.max_drawdown * 100, 2),
+            'daily_pnl': round(self.daily_pnl, 2),
+            'trades': self.trades,
+            'win_rate': round(self.win_rate, 3) if self.win_rate is not None else None,
+            'profit_factor': round(profit_factor, 2) if profit_factor not in (None, math.inf) else profit_factor,
+            'sharpe': round(sharpe, 2) if sharpe is not None else None,
+            'sortino': round(sortino, 2) if sortino is not None else None,
+            'exposure': round(self.exposure_ratio, 3),
+            'time_in_market': round(self.time_in_market, 3),
+            'breach': self.breach
+        }
+
+    def _push_return(self, value):
+        i = self._ret_index
+        self._returns[i] = value
+        self._ret_count = min(self._ret_count + 1, self.window)
+        self._ret_index = (i + 1) % self.window
+        # Einmal je Periode neu summieren statt laufend zu addieren und abzuziehen -
+        # so bleibt kein Rundungsrest, wenn das Fenster wieder nur flache Perioden enthält
+        values = self._returns[:self._ret_count]
+        self._sum = math.fsum(values)
+        self._sum_sq = math.fsum(v * v for v in values)
+        self._sum_down_sq = math.fsum(v * v for v in values if v < 0)
+
+    def _annualization(self):
+        # Perioden pro Jahr aus der festen Periodenlänge
+        return math.sqrt(SECONDS_PER_YEAR / self.period)
+
+    def _check_limits(self):
+        if self.breach:
+            return self.breach
+        if self.max_drawdown_limit and self.drawdown >= self.max_drawdown_limit:
+            self.breach = f"MAX_DRAWDOWN {self.drawdown * 100:.2f}% >= {self.max_drawdown_limit * 100:.2f}%"
+        elif (self.daily_loss_limit and self.day_start_equity > 0
+              and -self.daily_pnl / self.day_start_equity * 100 >= self.daily_loss_limit):
+            self.breach = (f"DAILY_LOSS {-self.daily_pnl / self.day_start_equity * 100:.2f}% "
+                           f">= {self.daily_loss_limit:.2f}%")
+        return self.breach
@@ -0,0 +1,306 @@
+"""
+Pipeline - Stufen der Handelsschleife, verbunden durch begrenzte Queues
+
+Statt Preisabruf, Signal, Order, Status und Logging nacheinander in einem
+Thread auszuführen, läuft jede Stufe in einem eigenen Thread:
+
+    Ingest -> [ConflatingQueue] -> Strategie -> [BoundedQueue] -> Ausführung
+                                        \\______________________/
+                                                   v
+                                   [BoundedQueue, verwerfend] -> Telemetrie
+
+- ConflatingQueue: hält je Schlüssel nur den neuesten Wert; veraltete Ticks
+  werden ersetzt statt abgearbeitet
+- BoundedQueue: feste Kapazität mit explizitem Backpressure (put blockiert
+  bis zum Timeout, danach wird verworfen und gezählt)
+- Stage: Thread, der eine Queue abarbeitet, mit Durchsatz- und Latenzzählern
+  und Fortschrittszeit (Pipeline.stalled() erkennt hängende Stufen)
+
+Eine langsame Order blockiert damit nicht mehr den Preisabruf, ein langsamer
+Preisabruf nicht mehr die Ausführung.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedQueue:
+    def __init__(self, name, maxsize=16):
+        """
+        FIFO-Queue mit fester Kapazität
+
+        Args:
+            name: Bezeichnung für Metriken
+            maxsize: Maximale Anzahl wartender Einträge
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {'put': 0, 'get': 0, 'dropped': 0, 'blocked': 0, 'max_depth': 0}
+
+    def put(self, item, timeout=None):
+        """
+        Reiht einen Eintrag ein; blockiert bei voller Queue (Backpressure)
+
+        Args:
+            item: Eintrag
+            timeout: Maximale Wartezeit in Sekunden (0 = nicht warten, None = unbegrenzt)
+
+        Returns:
+            False, wenn der Eintrag verworfen wurde (Queue voll oder geschlossen)
+        """
+        with self._cond:
+            if len(self._items) >= self.maxsize and not self._closed:
+                self.stats['blocked'] += 1
+                if timeout != 0:
+                    self._cond.wait_for(lambda: len(self._items) < self.maxsize or self._closed, timeout)
+            if self._closed or len(self._items) >= self.maxsize:
+                self.stats['dropped'] += 1
+                return False
+            self._items.append(item)
+            self.stats['put'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Entnimmt den ältesten Eintrag
+
+        Returns:
+            Eintrag oder None bei Timeout bzw. geschlossener, leerer Queue
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout) or not self._items:
+                return None
+            item = self._items.popleft()
+            self.stats['get'] += 1
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        """Weckt alle Wartenden; weitere put()-Aufrufe werden verworfen"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_metrics(self):
+        with self._cond:
+            return dict(self.stats, depth=len(self._items), maxsize=self.maxsize)
+
+
+class ConflatingQueue:
+    def __init__(self, name):
+        """
+        Queue mit einem Platz je Schlüssel - neuere Werte ersetzen ältere
+
+        Args:
+            name: Bezeichnung für Metriken
+        """
+        self.name = name
+        self._items = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {'put': 0, 'get': 0, 'conflated': 0, 'max_depth': 0}
+
+    def put(self, key, item):
+        """Legt den neuesten Wert für key ab (nie blockierend)"""
+        with self._cond:
+            if self._closed:
+                return False
+            if key in self._items:
+                # Noch nicht verarbeiteter, veralteter Wert wird ersetzt
+                self.stats['conflated'] += 1
+            self._items[key] = item
+            self.stats['put'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Entnimmt den Wert mit dem am längsten wartenden Schlüssel
+
+        Returns:
+            Wert oder None bei Timeout bzw. geschlossener, leerer Queue
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout) or not self._items:
+                return None
+            _, item = self._items.popitem(last=False)
+            self.stats['get'] += 1
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_metrics(self):
+        with self._cond:
+            return dict(self.stats, depth=len(self._items))
+
+
+class Stage:
+    def __init__(self, name, inbox, handler, emit=None):
+        """
+        Verarbeitungsstufe in einem eigenen Thread
+
+        Args:
+            name: Bezeichnung (Thread-Name und Metriken)
+            inbox: BoundedQueue oder ConflatingQueue
+            handler: Funktion(item) -> Ergebnis oder None; Exceptions werden geloggt und gezählt
+            emit: Funktion(Ergebnis), die Ergebnisse an die nächste Stufe weiterreicht
+        """
+        self.name = name
+        self.inbox = inbox
+        self.handler = handler
+        self.emit = emit
+        self.processed = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+        self.started = None
+        # Fortschritt (time.monotonic): Ende des letzten Eintrags bzw. Beginn des laufenden
+        self.last_progress = None
+        self.current_since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self.last_progress = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"Stage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Beendet die Stufe nach dem aktuellen Eintrag"""
+        self._stop.set()
+        self.inbox.close()
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def process(self, item):
+        """Verarbeitet einen Eintrag (auch direkt aufrufbar im sequentiellen Modus)"""
+        started = time.perf_counter()
+        self.current_since = time.monotonic()
+        try:
+            return self.handler(item)
+        except Exception as e:
+            self.errors += 1
+            logger.error("Fehler in Stufe %s: %s", self.name, e)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.processed += 1
+            self.busy += elapsed
+            self.last_latency = elapsed
+            if elapsed > self.max_latency:
+                self.max_latency = elapsed
+            self.last_progress = time.monotonic()
+            self.current_since = None
+    
+    def stalled(self, timeout):
+        """
+        Prüft, ob die Stufe hängt
+        
+        Args:
+            timeout: Sekunden ohne Fortschritt, ab denen die Stufe als hängend gilt
+        
+        Returns:
+            Grund als Text oder None
+        """
+        if not self.alive:
+            return "Thread beendet"
+        now = time.monotonic()
+        current = self.current_since
+        if current is not None and now - current > timeout:
+            return f"Eintrag seit {now - current:.0f}s in Bearbeitung"
+        # Wartende Einträge, aber kein abgeschlossener Eintrag innerhalb des Timeouts
+        if current is None and len(self.inbox) and now - self.last_progress > timeout:
+            return f"{len(self.inbox)} Einträge wartend, {now - self.last_progress:.0f}s ohne Fortschritt"
+        return None
+
+    def get_metrics(self, timing=True):
+        """Zähler der Stufe; timing=False lässt die Wanduhr-Kennzahlen weg (reproduzierbare Läufe)"""
+        metrics = {'processed': self.processed, 'errors': self.errors, 'alive': self.alive}
+        if timing:
+            runtime = time.perf_counter() - self.started if self.started else None
+            metrics.update({
+                'per_second': round(self.processed / runtime, 3) if runtime else None,
+                'utilization': round(self.busy / runtime, 3) if runtime else None,
+                'avg_ms': round(self.busy / self.processed * 1000, 2) if self.processed else None,
+                'last_ms': round(self.last_latency * 1000, 2),
+                'max_ms': round(self.max_latency * 1000, 2)
+            })
+        return metrics
+
+    def _run(self):
+        while not self._stop.is_set():
+            item = self.inbox.get(timeout=0.5)
+            if item is None:
+                # Leerlauf zählt als Fortschritt - die Stufe wartet nur auf Arbeit
+                self.last_progress = time.monotonic()
+                continue
+            result = self.process(item)
+            if result is not None and self.emit:
+                self.emit(result)
+
+
+class Pipeline:
+    def __init__(self):
+        """Sammelt Stufen und Queues für Start, Stopp und Metriken"""
+        self.stages = []
+        self.queues = []
+        self.threaded = False
+
+    def add_queue(self, queue):
+        self.queues.append(queue)
+        return queue
+
+    def add_stage(self, stage):
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        """Startet alle Stufen als Threads"""
+        self.threaded = True
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self, timeout=5.0):
+        """Stoppt alle Stufen in Reihenfolge (vorgelagerte zuerst)"""
+        for stage in self.stages:
+            stage.stop(timeout)
+        self.threaded = False
+
+    def stalled(self, timeout):
+        """Hängende Stufen als {Name: Grund} (nur im threaded-Modus, sonst leer)"""
+        if not self.threaded:
+            return {}
+        reasons = {stage.name: stage.stalled(timeout) for stage in self.stages}
+        return {name: reason for name, reason in reasons.items() if reason}
+    
+    def get_metrics(self, timing=True):
+        return {
+            'mode': 'threaded' if self.threaded else 'sequential',
+            'stages': {stage.name: stage.get_metrics(timing) for stage in self.stages},
+            'queues': {queue.name: queue.get_metrics() for queue in self.queues}
+        }
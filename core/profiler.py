@@ -0,0 +1,227 @@
+"""
+Profiler - Profiling des laufenden Bots auf Befehl
+
+Zwei Modi für ein zeitlich begrenztes Fenster, ohne den Bot neu zu starten:
+
+- sampling: Ein Hintergrund-Thread liest in festen Abständen die Stacks aller
+  Threads (sys._current_frames) und zählt sie. Der Bot selbst wird nicht
+  instrumentiert; der Overhead hängt nur von der Abtastrate ab.
+- cprofile: cProfile für den Thread der Handelsschleife (deterministisch,
+  genauer pro Funktion, aber mit spürbarem Overhead).
+
+Ergebnisse werden neben die Status-Datei geschrieben: Sampling als
+Collapsed-Stacks (direkt verwendbar mit flamegraph.pl oder speedscope),
+cProfile als .prof (pstats/snakeviz) plus Textzusammenfassung.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+MODES = ('sampling', 'cprofile')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.01, max_depth=128, max_duration=None):
+        """
+        Stack-Sampling aller Threads
+
+        Args:
+            interval: Abstand der Samples in Sekunden
+            max_depth: Maximale Stacktiefe je Sample
+            max_duration: Hartes Zeitlimit in Sekunden (Sicherheitsnetz)
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_duration = max_duration
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Startet den Sampling-Thread"""
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stoppt das Sampling und wartet auf den Thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self
+
+    def collapsed(self):
+        """Collapsed-Stack-Zeilen ("thread;frame;frame anzahl"), häufigste zuerst"""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def top_functions(self, limit=20):
+        """Funktionen mit den meisten Samples an der Stackspitze"""
+        leaf = Counter()
+        for stack, count in self.stacks.items():
+            leaf[stack.rsplit(';', 1)[-1]] += count
+        return leaf.most_common(limit)
+
+    def _run(self):
+        own = threading.get_ident()
+        deadline = self.started + self.max_duration if self.max_duration else None
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(labels))] += 1
+            self.samples += 1
+            if deadline and time.perf_counter() >= deadline:
+                break
+        self.elapsed = time.perf_counter() - self.started
+
+
+class ProfilerController:
+    def __init__(self, output_dir, clock=None, max_duration=600.0):
+        """
+        Steuert zeitlich begrenzte Profiling-Fenster (PROFILE_START/PROFILE_STOP)
+
+        Args:
+            output_dir: Verzeichnis für die Ergebnisdateien
+            clock: Zeitquelle mit time() für das Ende des Fensters (Standard: time.time)
+            max_duration: Obergrenze für die angeforderte Dauer in Sekunden
+        """
+        self.output_dir = output_dir
+        self.clock = clock
+        self.max_duration = max_duration
+        self.mode = None
+        self.deadline = None
+        self.last_result = None
+        self._sampler = None
+        self._profile = None
+        self._started_at = None
+
+    @property
+    def active(self):
+        return self.mode is not None
+
+    def start(self, mode='sampling', duration=60.0, interval=0.01):
+        """
+        Startet ein Profiling-Fenster
+
+        Args:
+            mode: 'sampling' oder 'cprofile' (cProfile erfasst nur den aufrufenden Thread)
+            duration: Dauer in Sekunden; danach stoppt poll() automatisch
+            interval: Abstand der Samples im Sampling-Modus
+
+        Returns:
+            True, wenn gestartet wurde
+        """
+        if self.active:
+            logger.warning("Profiling läuft bereits (%s)", self.mode)
+            return False
+        if mode not in MODES:
+            logger.warning("Unbekannter Profiling-Modus: %s", mode)
+            return False
+
+        duration = min(max(float(duration), 1.0), self.max_duration)
+        self._started_at = self._now()
+        self.deadline = self._started_at + duration
+        if mode == 'sampling':
+            # Das harte Limit in Echtzeit greift auch, wenn die Schleife hängt
+            self._sampler = SamplingProfiler(interval=max(float(interval), 0.001), max_duration=duration)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self.mode = mode
+        logger.info("Profiling gestartet: %s für %.0fs", mode, duration)
+        return True
+
+    def poll(self):
+        """Stoppt das Fenster nach Ablauf der Dauer; gibt dann das Ergebnis zurück"""
+        if self.active and self._now() >= self.deadline:
+            return self.stop()
+        return None
+
+    def stop(self):
+        """
+        Stoppt das Profiling und schreibt die Ergebnisdateien
+
+        Returns:
+            Dictionary mit Modus, Dauer, Dateien und Top-Funktionen (None, wenn inaktiv)
+        """
+        if not self.active:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.mode}")
+
+        if self.mode == 'sampling':
+            sampler = self._sampler.stop()
+            path = base + '.collapsed'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(sampler.collapsed()) + '\n')
+            result = {
+                'files': [path],
+                'samples': sampler.samples,
+                'top': [[label, count] for label, count in sampler.top_functions(10)]
+            }
+        else:
+            self._profile.disable()
+            prof_path = base + '.prof'
+            self._profile.dump_stats(prof_path)
+            text = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=text).sort_stats('cumulative')
+            stats.print_stats(40)
+            text_path = base + '.txt'
+            with open(text_path, 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+            top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:10]
+            result = {
+                'files': [prof_path, text_path],
+                'top': [[f"{func[2]} ({os.path.basename(func[0])}:{func[1]})", round(entry[3], 4)]
+                        for func, entry in top]
+            }
+
+        result.update({'mode': self.mode, 'duration': round(self._now() - self._started_at, 1)})
+        logger.info("Profiling beendet: %s", ', '.join(result['files']))
+        self.mode = None
+        self.deadline = None
+        self._sampler = None
+        self._profile = None
+        self.last_result = result
+        return result
+
+    def status(self):
+        """Zustand für die Status-Datei"""
+        return {
+            'active': self.mode,
+            'remaining': round(self.deadline - self._now(), 1) if self.active else None,
+            'last': self.last_result
+        }
+
+    def _now(self):
+        return self.clock.time() if self.clock else time.time()
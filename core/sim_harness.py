@@ -0,0 +1,367 @@
+"""
+Simulation Harness - Bausteine für Offline-Läufe des Live-Bots
+
+Ersetzt Bybit-HTTP, Streams und Orderausführung durch deterministische
+Gegenstücke, die alle an einer VirtualClock hängen:
+
+- SyntheticMarketData: reproduzierbarer Random Walk aus einem Seed
+- RecordedMarketData: Ticker und Trades aus Aufzeichnungen des MarketRecorder
+- SimulatedBroker: füllt Orders sofort zum aktuellen Preis (plus Slippage/Gebühr),
+  bedingte Stop-Orders beim Erreichen des Triggerpreises
+- schedule_commands: Dashboard-Befehle zu festen simulierten Zeitpunkten
+
+Marktdaten-Quellen bieten get_price() im Format von
+EnhancedLiveTradingBot.get_bybit_price() sowie get_historical_data() im
+Format von BybitAPI, damit die Bar Engine unverändert daraus nachladen kann.
+Der Broker bietet get_instruments_info() für den InstrumentIndex.
+"""
+
+import json
+import logging
+import math
+import random
+import threading
+
+from core.candle_aggregator import CandleAggregator
+
+MINUTE_MS = 60000
+
+
+class SyntheticMarketData:
+    def __init__(self, clock, seed=42, start_price=40000.0, volatility=0.0015,
+                 drift=0.0, history_minutes=1440, symbol='BTCUSDT'):
+        """
+        Initialisiert den synthetischen Feed (1m-Random-Walk)
+
+        Args:
+            clock: Zeitquelle (VirtualClock)
+            seed: Seed des Zufallsgenerators - gleicher Seed, gleiche Kurse
+            start_price: Schlusskurs der ersten Minute
+            volatility: Standardabweichung der Log-Rendite pro Minute
+            drift: Mittlere Log-Rendite pro Minute
+            history_minutes: Minuten Historie vor dem Startzeitpunkt (für Backfill und 24h-Änderung)
+            symbol: Simuliertes Symbol
+        """
+        self.clock = clock
+        self.symbol = symbol
+        self.volatility = volatility
+        self.drift = drift
+        self._rng = random.Random(seed)
+        start_ms = clock.time_ms()
+        self.origin_ms = start_ms - start_ms % MINUTE_MS - history_minutes * MINUTE_MS
+        self._bars = []
+        self._cum_volume = [0.0]
+        self._last_close = start_price
+        self._lock = threading.Lock()
+
+    def _ensure(self, index):
+        # Minuten strikt der Reihe nach erzeugen - unabhängig vom Abfragemuster
+        if len(self._bars) > index:
+            return
+        with self._lock:
+            self._generate(index)
+    
+    def _generate(self, index):
+        rng = self._rng
+        while len(self._bars) <= index:
+            open_ = self._last_close
+            close = open_ * math.exp(rng.gauss(self.drift, self.volatility))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility / 2)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility / 2)))
+            volume = rng.uniform(1.0, 20.0)
+            self._bars.append((open_, high, low, close, volume))
+            self._cum_volume.append(self._cum_volume[-1] + volume)
+            self._last_close = close
+
+    def _index(self, ts_ms):
+        return max(0, (ts_ms - self.origin_ms) // MINUTE_MS)
+
+    def get_price(self, symbol):
+        """Aktueller Preis, 24h-Volumen und 24h-Änderung zur simulierten Zeit"""
+        if symbol != self.symbol:
+            return {'success': False, 'error': f'Unbekanntes Symbol {symbol}'}
+        index = self._index(self.clock.time_ms())
+        self._ensure(index)
+        price = self._bars[index][3]
+        day_ago = max(0, index - 1440)
+        reference = self._bars[day_ago][0]
+        volume = self._cum_volume[index + 1] - self._cum_volume[day_ago]
+        return {
+            'success': True,
+            'price': price,
+            'volume': volume,
+            'change': (price / reference - 1) * 100
+        }
+
+    def get_historical_data(self, symbol, interval, start_time=None, end_time=None, limit=200):
+        """Abgeschlossene 1m-Bars bis zur simulierten Zeit (neueste zuerst, wie Bybit)"""
+        if symbol != self.symbol or interval != '1m':
+            return []
+        last = self._index(self.clock.time_ms()) - 1
+        first = self._index(start_time) if start_time is not None else 0
+        if end_time is not None:
+            last = min(last, self._index(end_time))
+        first = max(first, last - limit + 1)
+        if last < first:
+            return []
+        self._ensure(last)
+        return [self._bar_dict(i) for i in range(last, first - 1, -1)]
+
+    def _bar_dict(self, index):
+        open_, high, low, close, volume = self._bars[index]
+        return {
+            'timestamp': self.origin_ms + index * MINUTE_MS,
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume
+        }
+
+
+class RecordedMarketData:
+    def __init__(self, clock, replay, symbol='BTCUSDT', start_ms=None, end_ms=None, maxlen=5000):
+        """
+        Initialisiert den Feed aus einer Aufzeichnung
+
+        Args:
+            clock: Zeitquelle (VirtualClock, üblicherweise auf den Aufzeichnungsbeginn gestellt)
+            replay: core.market_recorder.MarketReplay
+            symbol: Aufgezeichnetes Symbol
+            start_ms, end_ms: Optionaler Zeitbereich
+            maxlen: Maximale Anzahl gehaltener 1m-Bars
+        """
+        self.clock = clock
+        self.symbol = symbol
+        self.maxlen = maxlen
+        self._records = replay.read(symbol, start_ms, end_ms, kinds=('ticker', 'trade'))
+        self._pending = None
+        self._ticker = None
+        self._bars = []
+        self.candles = CandleAggregator(specs=('time:60',))
+        self.candles.on_close(self._on_bar_close)
+
+    def _on_bar_close(self, symbol, spec, bar):
+        self._bars.append(bar.as_dict())
+        if len(self._bars) > self.maxlen:
+            del self._bars[:len(self._bars) - self.maxlen]
+
+    def _advance(self):
+        # Alle Records bis zur simulierten Zeit einspielen
+        now_ms = self.clock.time_ms()
+        while True:
+            if self._pending is None:
+                self._pending = next(self._records, None)
+                if self._pending is None:
+                    break
+            ts_ms, _, kind, data = self._pending
+            if ts_ms > now_ms:
+                break
+            if kind == 'ticker':
+                self._ticker = data
+            elif kind == 'trade':
+                self.candles.add_bybit_trades(data)
+            self._pending = None
+        self.candles.flush(now_ms)
+
+    def get_price(self, symbol):
+        """Letzter aufgezeichneter Ticker bis zur simulierten Zeit"""
+        if symbol != self.symbol:
+            return {'success': False, 'error': f'Unbekanntes Symbol {symbol}'}
+        self._advance()
+        if not self._ticker:
+            return {'success': False, 'error': 'Noch keine Ticker-Daten aufgezeichnet'}
+        return {
+            'success': True,
+            'price': float(self._ticker['lastPrice']),
+            'volume': float(self._ticker.get('volume24h') or 0),
+            'change': float(self._ticker.get('price24hPcnt') or 0) * 100
+        }
+
+    def get_historical_data(self, symbol, interval, start_time=None, end_time=None, limit=200):
+        """Aus aufgezeichneten Trades gebildete 1m-Bars (neueste zuerst, wie Bybit)"""
+        if symbol != self.symbol or interval != '1m':
+            return []
+        self._advance()
+        bars = [bar for bar in self._bars
+                if (start_time is None or bar['timestamp'] >= start_time)
+                and (end_time is None or bar['timestamp'] <= end_time)]
+        return list(reversed(bars[-limit:]))
+
+
+class SimulatedBroker:
+    def __init__(self, clock, market_data, fee_rate=0.001, slippage_bps=0.0,
+                 tick_size='0.01', qty_step='0.000001', min_qty='0.000048', min_notional='1'):
+        """
+        Initialisiert den simulierten Broker
+
+        Args:
+            clock: Zeitquelle
+            market_data: Marktdaten-Quelle mit get_price(symbol)
+            fee_rate: Gebühr pro Fill (0.001 = 0.1%)
+            slippage_bps: Preisverschlechterung für Market-Orders in Basispunkten
+            tick_size, qty_step, min_qty, min_notional: Handelsregeln für get_instruments_info()
+
+        Bedingte Orders (trigger_price) werden bei jeder Abfrage über
+        lookup_order()/cancel_order()/amend_order() gegen den aktuellen Preis
+        geprüft und dann zu diesem Preis ausgeführt.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.clock = clock
+        self.market_data = market_data
+        self.fee_rate = fee_rate
+        self.slippage_bps = slippage_bps
+        self.rules = {
+            'tickSize': tick_size,
+            'basePrecision': qty_step,
+            'minOrderQty': min_qty,
+            'minOrderAmt': min_notional
+        }
+        self.orders = []
+        self.conditional_orders = {}
+        self.fees_paid = 0.0
+
+    def place_order(self, symbol, side, qty, order_type='Market', price=None,
+                    take_profit=None, stop_loss=None, trigger_price=None):
+        """
+        Führt eine Order sofort aus
+
+        Market-Orders werden zum aktuellen Preis plus Slippage gefüllt,
+        Limit-Orders zum Limitpreis. Mit trigger_price wird eine bedingte
+        Stop-Order angelegt (Sell löst bei Preis <= Trigger aus, Buy bei >=).
+        take_profit/stop_loss werden nur an der Order gespeichert und nie
+        ausgelöst - wie angehängte TP/SL an Spot-Market-Orders der Börse.
+
+        Returns:
+            Dictionary wie EnhancedLiveTradingBot._place_order() plus avg_price und filled_qty
+            (bedingte Orders: nur order_id)
+        """
+        if trigger_price is not None:
+            order_id = f"SIM-C{len(self.conditional_orders) + 1:06d}"
+            self.conditional_orders[order_id] = {
+                'orderId': order_id,
+                'symbol': symbol,
+                'side': side,
+                'qty': float(qty),
+                'triggerPrice': float(trigger_price),
+                'orderStatus': 'Untriggered',
+                'cumExecQty': '0',
+                'avgPrice': '0'
+            }
+            return {'success': True, 'order_id': order_id}
+        
+        if order_type == 'Limit' and price is not None:
+            fill_price = float(price)
+        else:
+            ticker = self.market_data.get_price(symbol)
+            if not ticker.get('success'):
+                return {'success': False, 'error': ticker.get('error', 'Kein Preis')}
+            slippage = self.slippage_bps / 10000
+            fill_price = ticker['price'] * (1 + slippage if side == 'Buy' else 1 - slippage)
+
+        qty = float(qty)
+        fee = fill_price * qty * self.fee_rate
+        self.fees_paid += fee
+        order_id = f"SIM-{len(self.orders) + 1:06d}"
+        self.orders.append({
+            'order_id': order_id,
+            'time': self.clock.time(),
+            'symbol': symbol,
+            'side': side,
+            'order_type': order_type,
+            'qty': qty,
+            'price': fill_price,
+            'fee': fee,
+            'take_profit': take_profit,
+            'stop_loss': stop_loss
+        })
+        return {'success': True, 'order_id': order_id, 'avg_price': fill_price, 'filled_qty': qty}
+
+    def amend_order(self, symbol, order_id, take_profit=None, stop_loss=None, trigger_price=None):
+        """Ändert den Triggerpreis einer offenen bedingten Order bzw. die gespeicherten TP/SL-Level"""
+        conditional = self._conditional(order_id)
+        if conditional is not None:
+            if conditional['orderStatus'] != 'Untriggered':
+                return {'success': False, 'error': f"Order {order_id} ist {conditional['orderStatus']}"}
+            if trigger_price is not None:
+                conditional['triggerPrice'] = float(trigger_price)
+            return {'success': True, 'order_id': order_id}
+        
+        for order in self.orders:
+            if order['order_id'] == order_id:
+                if take_profit is not None:
+                    order['take_profit'] = take_profit
+                if stop_loss is not None:
+                    order['stop_loss'] = stop_loss
+                return {'success': True, 'order_id': order_id}
+        return {'success': False, 'error': f'Order {order_id} nicht gefunden'}
+    
+    def cancel_order(self, symbol, order_id):
+        """Storniert eine noch nicht ausgelöste bedingte Order"""
+        conditional = self._conditional(order_id)
+        if conditional is None:
+            return {'success': False, 'error': f'Order {order_id} nicht gefunden'}
+        if conditional['orderStatus'] != 'Untriggered':
+            return {'success': False, 'error': f"Order {order_id} ist {conditional['orderStatus']}"}
+        conditional['orderStatus'] = 'Cancelled'
+        return {'success': True, 'order_id': order_id}
+    
+    def lookup_order(self, symbol, order_id):
+        """Zustand einer bedingten Order im Format der V5-Orderabfrage (None, wenn unbekannt)"""
+        conditional = self._conditional(order_id)
+        return dict(conditional) if conditional is not None else None
+    
+    def _conditional(self, order_id):
+        # Bedingte Order nach Prüfung des Triggers gegen den aktuellen Preis
+        order = self.conditional_orders.get(order_id)
+        if order is None or order['orderStatus'] != 'Untriggered':
+            return order
+        ticker = self.market_data.get_price(order['symbol'])
+        if not ticker.get('success'):
+            return order
+        price = ticker['price']
+        triggered = price <= order['triggerPrice'] if order['side'] == 'Sell' else price >= order['triggerPrice']
+        if triggered:
+            fill = self.place_order(order['symbol'], order['side'], order['qty'])
+            if fill['success']:
+                order.update(orderStatus='Filled', cumExecQty=str(fill['filled_qty']),
+                             avgPrice=str(fill['avg_price']))
+        return order
+
+    def get_instruments_info(self, category='spot', symbol=None, cursor=None, limit=None):
+        """Handelsregeln im Format von BybitAPI.get_instruments_info()"""
+        symbol = symbol or self.market_data.symbol
+        return {
+            'list': [{
+                'symbol': symbol,
+                'status': 'Trading',
+                'lotSizeFilter': {key: self.rules[key] for key in ('basePrecision', 'minOrderQty', 'minOrderAmt')},
+                'priceFilter': {'tickSize': self.rules['tickSize']}
+            }],
+            'nextPageCursor': ''
+        }
+
+
+def schedule_commands(clock, command_file, script):
+    """
+    Plant Dashboard-Befehle auf der virtuellen Uhr
+
+    Args:
+        clock: VirtualClock
+        command_file: Befehlsdatei des Bots
+        script: Liste (Sekunden ab jetzt, Befehl[, Parameter]), z.B.
+                [(3600, 'PAUSE'), (7200, 'RESUME'), (8000, 'PROFILE_START', {'duration': 600})]
+    """
+    start = clock.time()
+
+    def writer(command, params):
+        def write():
+            data = {"command": command, "timestamp": clock.time()}
+            if params:
+                data["params"] = params
+            with open(command_file, 'w') as f:
+                json.dump(data, f)
+        return write
+
+    for offset, command, *params in script:
+        clock.call_at(start + offset, writer(command, params[0] if params else None))
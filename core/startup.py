@@ -0,0 +1,130 @@
+"""
+Startup - Paralleles Aufwärmen des Bots
+
+Führt unabhängige Startaufgaben (Verbindungsaufbau, Zeitsynchronisation,
+Instrument-Daten, Kontostand, Indikator-Historie) gleichzeitig in einem
+Thread-Pool aus. run_warmup() kehrt zurück, sobald alle *benötigten*
+Aufgaben fertig sind; optionale Aufgaben laufen im Hintergrund weiter.
+Damit beginnt der Handel, sobald der nötige Zustand bereit ist - nicht erst,
+wenn die langsamste Aufgabe fertig ist.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupTask:
+    __slots__ = ('name', 'func', 'required')
+
+    def __init__(self, name, func, required=True):
+        """
+        Eine Startaufgabe
+
+        Args:
+            name: Bezeichnung (Schlüssel im Report)
+            func: Funktion ohne Argumente; eine Exception oder der Rückgabewert
+                  False/0/None gilt als Fehlschlag
+            required: Ob der Handel auf diese Aufgabe warten muss
+        """
+        self.name = name
+        self.func = func
+        self.required = required
+
+
+class WarmupReport:
+    def __init__(self, tasks):
+        """Sammelt Ergebnis, Dauer und Fehler je Aufgabe"""
+        self.started = time.perf_counter()
+        self.required = [task.name for task in tasks if task.required]
+        self.results = {task.name: {'ok': None, 'duration_ms': None, 'error': None, 'result': None}
+                        for task in tasks}
+        self.elapsed_ms = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        """True, wenn alle benötigten Aufgaben erfolgreich waren"""
+        return all(self.results[name]['ok'] for name in self.required)
+
+    @property
+    def failed(self):
+        """Namen der fehlgeschlagenen Aufgaben"""
+        return [name for name, result in self.results.items() if result['ok'] is False]
+
+    @property
+    def pending(self):
+        """Namen der noch laufenden Aufgaben"""
+        return [name for name, result in self.results.items() if result['ok'] is None]
+
+    def result(self, name):
+        """Rückgabewert einer Aufgabe (oder None)"""
+        return self.results[name]['result']
+
+    def wait_all(self, timeout=None):
+        """Wartet auch auf die optionalen Aufgaben"""
+        return self._done.wait(timeout)
+
+    def as_dict(self):
+        """Zusammenfassung für Logs und Benchmarks"""
+        with self._lock:
+            tasks = {name: {'ok': result['ok'], 'duration_ms': result['duration_ms'], 'error': result['error']}
+                     for name, result in self.results.items()}
+        return {'ready': self.ready, 'elapsed_ms': self.elapsed_ms, 'tasks': tasks}
+
+    def _record(self, name, ok, result, error):
+        with self._lock:
+            entry = self.results[name]
+            entry['ok'] = ok
+            entry['result'] = result
+            entry['error'] = error
+            entry['duration_ms'] = round((time.perf_counter() - self.started) * 1000, 1)
+            if not self.pending:
+                self._done.set()
+
+
+def _run_task(report, task):
+    try:
+        result = task.func()
+        ok = bool(result)
+        report._record(task.name, ok, result, None if ok else 'Kein Ergebnis')
+    except Exception as e:
+        logger.warning(f"Startaufgabe '{task.name}' fehlgeschlagen: {e}")
+        report._record(task.name, False, None, str(e))
+
+
+def run_warmup(tasks, timeout=30.0, max_workers=None):
+    """
+    Führt Startaufgaben parallel aus
+
+    Args:
+        tasks: Liste von WarmupTask
+        timeout: Maximale Wartezeit auf die benötigten Aufgaben in Sekunden
+        max_workers: Threads im Pool (Standard: eine pro Aufgabe)
+
+    Returns:
+        WarmupReport (optionale Aufgaben können noch laufen, siehe pending)
+    """
+    report = WarmupReport(tasks)
+    if not tasks:
+        report.elapsed_ms = 0.0
+        report._done.set()
+        return report
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(tasks), thread_name_prefix='warmup')
+    futures = {task.name: executor.submit(_run_task, report, task) for task in tasks}
+    # Nicht auf optionale Aufgaben warten - der Pool arbeitet sie im Hintergrund ab
+    executor.shutdown(wait=False)
+
+    required = [futures[name] for name in report.required]
+    _, not_done = wait(required, timeout=timeout)
+    report.elapsed_ms = round((time.perf_counter() - report.started) * 1000, 1)
+
+    for name in report.required:
+        if futures[name] in not_done:
+            logger.warning(f"Startaufgabe '{name}' nach {timeout:.0f}s noch nicht fertig")
+    return report
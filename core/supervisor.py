@@ -0,0 +1,255 @@
+"""
+Supervisor - Watchdog mit Warm-Restart für den Bot-Prozess
+
+Startet den Bot als Kindprozess und überwacht statt der reinen Prozess-
+existenz den Heartbeat (Zeitstempel der Status-Datei):
+
+- Absturz: Prozess endet mit Exit-Code != 0 -> Neustart
+- Hänger: Heartbeat älter als heartbeat_timeout -> terminate()/kill, Neustart
+- Reguläres Ende (STOP-Befehl, Exit-Code 0): Supervisor beendet sich ebenfalls
+
+Neustarts erfolgen mit exponentiellem Backoff bis max_restarts; läuft der
+Bot stable_after Sekunden stabil, beginnt die Zählung von vorn. Neu
+gestartete Bots erhalten --resume und übernehmen Position, Kontostand und
+ungeklärte Orders aus dem State-Snapshot (save_state/load_state).
+"""
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from core.bot_status_monitor import BotStatusMonitor
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+# Status, mit denen sich der Bot selbst beendet (kein Heartbeat mehr nötig)
+STOPPING_STATUS = ('STOPPED', 'EMERGENCY_STOP')
+
+
+def write_json_atomic(path, data):
+    """Schreibt JSON über eine temporäre Datei und os.replace (nie halb geschriebene Dateien)"""
+    write_text_atomic(path, json.dumps(data))
+
+
+def write_text_atomic(path, text):
+    """Schreibt bereits serialisierten Text über eine temporäre Datei und os.replace"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path), suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_state(path, state):
+    """
+    Speichert den State-Snapshot des Bots
+
+    Args:
+        path: Zieldatei (z.B. bot_state.json)
+        state: Dictionary mit position, balance usw. (JSON-serialisierbar)
+    """
+    write_json_atomic(path, dict(state, version=STATE_VERSION, saved_at=time.time(), pid=os.getpid()))
+
+
+def load_state(path):
+    """
+    Lädt einen State-Snapshot
+
+    Returns:
+        Dictionary oder None, wenn keine gültige Datei vorhanden ist
+    """
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.error("State-Snapshot %s nicht lesbar: %s", path, e)
+        return None
+    if state.get('version') != STATE_VERSION:
+        logger.error("State-Snapshot %s hat unbekannte Version %s", path, state.get('version'))
+        return None
+    return state
+
+
+class Supervisor:
+    def __init__(self, command, status_file, monitor=None, max_restarts=None, heartbeat_timeout=180.0,
+                 startup_grace=120.0, check_interval=None, backoff_min=2.0, backoff_max=60.0,
+                 stable_after=600.0, stop_timeout=30.0):
+        """
+        Initialisiert den Supervisor
+
+        Args:
+            command: Startbefehl des Bots als Liste (Neustarts erhalten zusätzlich --resume)
+            status_file: Status-Datei des Bots (Heartbeat)
+            monitor: BotStatusMonitor für Event-Log und Terminate (Standard: neu erzeugt)
+            max_restarts: Neustarts ohne stabile Phase dazwischen (Standard: Konfiguration)
+            heartbeat_timeout: Maximales Alter des Heartbeats in Sekunden
+            startup_grace: Sekunden nach dem Start ohne Heartbeat-Prüfung (Warmup)
+            check_interval: Prüfabstand in Sekunden (Standard: Konfiguration)
+            backoff_min: Wartezeit vor dem ersten Neustart (verdoppelt sich je Neustart)
+            backoff_max: Obergrenze der Wartezeit
+            stable_after: Laufzeit in Sekunden, nach der der Neustartzähler zurückgesetzt wird
+            stop_timeout: Wartezeit nach terminate() bis kill()
+        """
+        self.command = list(command)
+        self.status_file = status_file
+        self.monitor = monitor or BotStatusMonitor(bot_pid=-1)
+        general = self.monitor.config.get('general', {})
+        self.max_restarts = max_restarts if max_restarts is not None else general.get('max_restarts', 3)
+        self.check_interval = check_interval if check_interval is not None else general.get('check_interval', 5)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_grace = startup_grace
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self.process = None
+        self.restarts = 0
+        self.total_restarts = 0
+        self.started_at = None
+        self.last_failure = None
+        self._stop_requested = False
+
+    def run(self, resume=False):
+        """
+        Startet den Bot und überwacht ihn bis zum regulären Ende
+
+        Args:
+            resume: Schon den ersten Start mit --resume ausführen
+
+        Returns:
+            Exit-Code (0 = Bot regulär beendet, 1 = max_restarts überschritten)
+        """
+        signal.signal(signal.SIGTERM, self._request_stop)
+        self._spawn(resume)
+        try:
+            while True:
+                time.sleep(self.check_interval)
+                failure = self._check()
+                if failure is None:
+                    continue
+                if failure == 'EXIT':
+                    self.monitor.log_events("INFO", "Bot regulär beendet - Supervisor endet")
+                    return 0
+
+                self.last_failure = failure
+                self.monitor.log_events("ERROR", f"Bot-Ausfall erkannt: {failure}")
+                if self.restarts >= self.max_restarts:
+                    self.monitor.log_events("EMERGENCY",
+                                            f"{self.restarts} Neustarts ohne stabile Phase - Supervisor gibt auf")
+                    return 1
+
+                delay = min(self.backoff_min * 2 ** self.restarts, self.backoff_max)
+                self.restarts += 1
+                self.total_restarts += 1
+                self.monitor.log_events("WARNING", f"Neustart {self.restarts}/{self.max_restarts} in {delay:.1f}s")
+                time.sleep(delay)
+                if self._stop_requested:
+                    return 0
+                self._spawn(resume=True)
+        except KeyboardInterrupt:
+            # Ctrl+C erreicht auch den Bot (gleiche Prozessgruppe) - nur auf sein Ende warten
+            self._stop_child(graceful=True)
+            return 0
+
+    def _spawn(self, resume):
+        command = self.command + (['--resume'] if resume else [])
+        self.process = subprocess.Popen(command)
+        self.started_at = time.monotonic()
+        self.monitor.bot_pid = self.process.pid
+        self.monitor.start_time = None
+        self.monitor.status_check()
+        self.monitor.log_events("INFO", f"Bot gestartet (PID {self.process.pid}{', resume' if resume else ''})")
+
+    def _check(self):
+        # Returns None (ok), 'EXIT' (reguläres Ende) oder eine Fehlerbeschreibung
+        if self._stop_requested:
+            self._stop_child(graceful=True)
+            return 'EXIT'
+
+        code = self.process.poll()
+        if code is not None:
+            return 'EXIT' if code == 0 else f"Prozess beendet mit Exit-Code {code}"
+
+        uptime = time.monotonic() - self.started_at
+        if self.restarts and uptime >= self.stable_after:
+            self.monitor.log_events("INFO", f"Bot seit {uptime:.0f}s stabil - Neustartzähler zurückgesetzt")
+            self.restarts = 0
+        if uptime < self.startup_grace:
+            return None
+
+        heartbeat = self._read_heartbeat()
+        if heartbeat is None:
+            self._stop_child(graceful=False)
+            return f"kein Heartbeat seit dem Start ({uptime:.0f}s)"
+        status, age = heartbeat
+        if status in STOPPING_STATUS:
+            return None
+        if age > self.heartbeat_timeout:
+            self._stop_child(graceful=False)
+            return f"Heartbeat seit {age:.0f}s ausgeblieben (Status {status})"
+        return None
+
+    def _read_heartbeat(self):
+        # (Status, Alter in Sekunden) aus der Status-Datei des aktuellen Kindprozesses
+        try:
+            with open(self.status_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('pid') != self.process.pid:
+            # Status-Datei eines früheren Laufs
+            return None
+        return data.get('status'), time.time() - float(data.get('timestamp', 0))
+
+    def _stop_child(self, graceful):
+        if self.process is None or self.process.poll() is not None:
+            return
+        if not graceful:
+            self.monitor.status_check()
+            self.monitor.emergency_stop()
+        try:
+            self.process.wait(self.stop_timeout)
+        except subprocess.TimeoutExpired:
+            self.monitor.log_events("WARNING", f"Bot reagiert nicht auf terminate() - kill (PID {self.process.pid})")
+            self.process.kill()
+            self.process.wait()
+
+    def _request_stop(self, signum, frame):
+        # SIGTERM an den Supervisor: Bot regulär beenden, nicht neu starten
+        self._stop_requested = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGINT)
+
+
+def supervise(script, status_file, resume=False):
+    """
+    Startet den Supervisor für ein Bot-Skript (Konfiguration über Umgebungsvariablen)
+
+    Returns:
+        Exit-Code des Supervisors
+    """
+    max_restarts = os.getenv('MAX_RESTARTS')
+    supervisor = Supervisor(
+        [sys.executable, script], status_file,
+        max_restarts=int(max_restarts) if max_restarts else None,
+        heartbeat_timeout=float(os.getenv('SUPERVISOR_HEARTBEAT_TIMEOUT', 180)),
+        startup_grace=float(os.getenv('SUPERVISOR_STARTUP_GRACE', 120)),
+        backoff_min=float(os.getenv('SUPERVISOR_BACKOFF_MIN', 2)),
+        backoff_max=float(os.getenv('SUPERVISOR_BACKOFF_MAX', 60)),
+        stable_after=float(os.getenv('SUPERVISOR_STABLE_AFTER', 600))
+    )
+    return supervisor.run(resume=resume)
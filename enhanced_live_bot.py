@@ -4,16 +4,40 @@ ENHANCED SMART MONEY LIVE TRADING BOT - MAINNET VERSION
 Läuft auf Bybit Mainnet mit echten Trades
 """
 
+import hashlib
 import os
 import sys
 import time
 import logging
-import requests
 import json  # Added for command handling
-import psutil
+from collections import deque
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from decimal import Decimal
+import numpy as np
 from core.bot_status_monitor import BotStatusMonitor
+from core.clock import SystemClock
+from core.log_utils import LogThrottle, start_queue_logging
+from core.startup import WarmupTask, run_warmup
+from core.batch_strategy import BatchStrategy, REGIME_NAMES, REGIME_CODES, POSITION_CODES
+from core.market_data_ring import MarketDataRing, RingReader, TICK, BAR
+from core.bar_engine import BarEngine
+from core.candle_aggregator import CandleAggregator
+from core.orderbook_analytics import OrderBookSnapshot
+from core.market_recorder import MarketRecorder
+from core.performance_tracker import PerformanceTracker
+from core.profiler import ProfilerController
+from core.memory_diagnostics import MemoryDiagnostics
+from core.pipeline import Pipeline, Stage, BoundedQueue, ConflatingQueue
+from core.supervisor import write_text_atomic, save_state, load_state, supervise
+from exchange.bybit_api import BybitAPI
+from exchange.bybit_ws import BybitPrivateStream, BybitPublicTradeStream, FINAL_ORDER_STATES
+from exchange.account_cache import AccountStateCache
+from exchange.instruments import InstrumentIndex
+from exchange.clock_sync import ClockSync
+from exchange.resilience import CircuitOpenError
+from exchange.market_cache import MarketDataCache
+from exchange.order_registry import OrderRegistry
+from exchange.ticker_scanner import TickerScanner
 
 # Windows Console Encoding Fix
 if sys.platform == "win32":
@@ -21,24 +45,24 @@ if sys.platform == "win32":
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
     sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
 
-# Environment laden
-load_dotenv()
-
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('live_trading_bot.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Ungeklärte Orders dieser Art sperren auch das Schließen (sonst droht ein doppelter Verkauf)
+CLOSE_INTENTS = ('CLOSE_LONG', 'CLOSE_SHORT', 'STOP')
+
 class EnhancedLiveTradingBot:
     """Enhanced Smart Money Live Trading Bot für Bybit Mainnet"""
     
-    def __init__(self):
+    def __init__(self, clock=None, market_data=None, broker=None,
+                 status_file="bot_status.json", command_file="bot_commands.json",
+                 monitor=None):
+        # Zeitquelle, Marktdaten und Orderausführung sind austauschbar
+        # (Standard: Systemuhr, Bybit-HTTP/Streams; Simulation: siehe core/sim_harness.py)
+        self.clock = clock or SystemClock()
+        self.market_data = market_data
+        self.broker = broker
+        self.offline = market_data is not None or broker is not None
+        
         # Deine Bybit API Konfiguration
         self.api_key = os.getenv('BYBIT_API_KEY')
         self.api_secret = os.getenv('BYBIT_API_SECRET')
@@ -52,47 +76,258 @@ class EnhancedLiveTradingBot:
         self.current_balance = float(os.getenv('INITIAL_PORTFOLIO_VALUE', 50.0))
         self.start_balance = self.current_balance
         self.current_position = None
+        # Enhanced Strategy (vektorisiert, auch für ganze Symbol-Universen nutzbar)
+        self.strategy = BatchStrategy()
+        # TP/SL an der Börse hinterlegen statt nur im Bot-Speicher
+        self.exchange_tpsl = os.getenv('EXCHANGE_TPSL', 'true').lower() == 'true'
+        # Ohne Private-Stream wird die Stop-Order höchstens alle X Sekunden per REST abgefragt
+        self.stop_check_interval = float(os.getenv('EXCHANGE_STOP_CHECK_INTERVAL', 15))
+        self.last_stop_check = 0.0
+        # Slippage-Schätzung aus dem Orderbuch vor jeder Market-Order (0 = aus)
+        self.max_slippage_bps = float(os.getenv('MAX_SLIPPAGE_BPS', 10))
+        self.orderbook_depth = int(os.getenv('ORDERBOOK_DEPTH', 50))
+        self.last_slippage_estimate = None
+        # Private-Stream für Fills und Kontostände (statt Polling)
+        self.use_private_stream = os.getenv('PRIVATE_STREAM', 'true').lower() == 'true'
+        self.fill_timeout = float(os.getenv('PRIVATE_STREAM_FILL_TIMEOUT', 2.0))
+        self.private_stream = None
+        
+        # Gemeinsamer Marktdaten-Feed aus dem Ingest-Prozess (Shared Memory)
+        self.market_data_ring = os.getenv('MARKET_DATA_RING')
+        self.ring_max_age = float(os.getenv('MARKET_DATA_MAX_AGE', 5.0))
+        self.ring_reader = None
+        
+        # Multi-Timeframe-Bars (1m -> 5m/15m/1h/4h/1d) für höheren Timeframe-Kontext
+        self.use_bar_engine = os.getenv('BAR_ENGINE', 'true').lower() == 'true'
+        self.bar_engine = BarEngine(maxlen=int(os.getenv('BAR_ENGINE_MAXLEN', 500)))
+        
+        # Live-OHLCV aus öffentlichen Trades (1m-Zeit-Bars speisen die Bar Engine)
+        self.use_trade_stream = os.getenv('TRADE_STREAM', 'true').lower() == 'true'
+        extra_specs = [spec.strip() for spec in os.getenv('TRADE_BAR_SPECS', '').split(',') if spec.strip()]
+        self.candles = CandleAggregator(specs=['time:60'] + extra_specs)
+        self.candles.on_close(self._on_trade_bar_close)
+        self.trade_stream = None
+        
+        # Aufzeichnung der rohen Marktdaten (Ticker, Trades, Orderbuch) für Replays
+        recorder_dir = os.getenv('MARKET_RECORDER_DIR')
+        self.recorder = MarketRecorder(recorder_dir) if recorder_dir else None
+        self.recorder_depth = int(os.getenv('MARKET_RECORDER_DEPTH', 50))
+        
+        # Exchange-Client und Account-Cache (echte Kontostände für Positionsgrößen)
+        # Timeouts, Hedging und Circuit Breaker gegen hängende Requests
+        self.api = BybitAPI(
+            self.api_key, self.api_secret, testnet=self.testnet,
+            request_timeout=float(os.getenv('HTTP_TIMEOUT', 10.0)),
+            connect_timeout=float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.0)),
+            hedge=os.getenv('HEDGE_REQUESTS', 'true').lower() == 'true',
+            breaker_threshold=int(os.getenv('BREAKER_FAILURES', 5)),
+            breaker_reset=float(os.getenv('BREAKER_RESET', 30.0)),
+            market_cache=self._build_market_cache(),
+            order_timeout=float(os.getenv('ORDER_TIMEOUT', 0.8))
+        )
+        # Orders mit orderLinkId: nach Timeouts Status abfragen statt blind neu zu senden
+        self.orders = OrderRegistry(
+            retries=int(os.getenv('ORDER_RETRIES', 2)),
+            resolve_attempts=int(os.getenv('ORDER_RESOLVE_ATTEMPTS', 3)),
+            resolve_delay=float(os.getenv('ORDER_RESOLVE_DELAY', 0.5)),
+            sleep=self.clock.sleep
+        )
+        self.api.orders = self.orders
+        # Wartezeit nach Fehlern in der Handelsschleife (verdoppelt sich bis zum Maximum)
+        self.error_backoff_min = float(os.getenv('ERROR_BACKOFF_MIN', 5.0))
+        self.error_backoff_max = float(os.getenv('ERROR_BACKOFF_MAX', 60.0))
+        self.error_backoff = self.error_backoff_min
+        self.account = AccountStateCache(self.api, ttl=float(os.getenv('ACCOUNT_CACHE_TTL', 15.0)))
+        self.use_account_balance = os.getenv('USE_ACCOUNT_BALANCE', 'true').lower() == 'true'
+        # Serverzeit-Offset für signierte Requests (vermeidet 10002-Timestamp-Fehler)
+        self.time_sync = ClockSync(self.api, interval=float(os.getenv('TIME_SYNC_INTERVAL', 30)))
+        self.api.time_sync = self.time_sync
+        # Tick-/Lot-Größen für gültige Orders vor dem Versand
+        self.instruments = InstrumentIndex(self.broker or self.api, refresh_interval=float(os.getenv('INSTRUMENTS_REFRESH_INTERVAL', 3600)))
+        # Marktweiter Ticker-Snapshot (ein Request je Zyklus für alle Spot-Paare)
+        self.scanner = (TickerScanner(self.api, interval=float(os.getenv('TICKER_SCAN_INTERVAL', 10)))
+                        if os.getenv('TICKER_SCANNER', 'false').lower() == 'true' else None)
+        self.scan_min_turnover = float(os.getenv('TICKER_SCAN_MIN_TURNOVER', 1000000))
         
-        # Performance Tracking
-        self.trades_history = []
-        self.regime_history = []
+        # Performance Tracking (begrenzt - Kennzahlen über alle Trades hält der PerformanceTracker)
+        history_max = int(os.getenv('TRADES_HISTORY_MAX', 1000))
+        self.trades_history = deque(maxlen=history_max)
+        self.regime_history = deque(maxlen=history_max)
+        # Laufende Kennzahlen und Risikogrenzen (O(1) je Bewertung)
+        self.max_drawdown = float(os.getenv('MAX_DRAWDOWN', 0.15))
+        self.daily_risk_limit = float(os.getenv('DAILY_RISK_LIMIT', 5.0))
+        self.performance = PerformanceTracker(
+            self.start_balance, max_drawdown=self.max_drawdown, daily_loss_limit=self.daily_risk_limit,
+            window=int(os.getenv('PERFORMANCE_WINDOW', 30))
+        )
+        
+        # Wiederkehrende Meldungen drosseln (Zeitbasis: Bot-Uhr, auch in der Simulation)
+        self.log_throttle = LogThrottle(logger, interval=float(os.getenv('LOG_THROTTLE_INTERVAL', 300)),
+                                        clock=self.clock.time)
+        self.log_market_every = int(os.getenv('LOG_MARKET_EVERY', 10))
+        
+        # Handelsschleife als Pipeline (Ingest -> Strategie -> Ausführung -> Telemetrie)
+        # Simulation standardmäßig sequentiell, damit Läufe reproduzierbar bleiben
+        self.pipeline_mode = os.getenv('PIPELINE_MODE', 'sequential' if self.offline else 'threaded').lower()
+        self.poll_interval = float(os.getenv('POLL_INTERVAL', 30))
+        # Stufe ohne Fortschritt (threaded) -> Status STALLED, Heartbeat bleibt stehen
+        self.stall_timeout = float(os.getenv('PIPELINE_STALL_TIMEOUT', 120))
+        self.pipeline = self._build_pipeline(int(os.getenv('PIPELINE_ORDER_QUEUE', 8)),
+                                             int(os.getenv('PIPELINE_TELEMETRY_QUEUE', 64)))
+        self.last_status_log = self.clock.now()
         
         logger.info("Enhanced Live Trading Bot initialisiert")
-        logger.info(f"API Key: {self.api_key[:8] if self.api_key else 'MISSING'}...")
-        logger.info(f"Mainnet Mode: Echte Trades")
+        logger.info("API Key: %s...", self.api_key[:8] if self.api_key else 'MISSING')
+        logger.info("Mainnet Mode: Echte Trades")
         
         # Status reporting setup
-        self.status_file = "bot_status.json"
-        self.command_file = "bot_commands.json"
+        self.status_file = status_file
+        self.command_file = command_file
+        self.command_params = {}
+        self.last_status_write = 0.0
+        # Offline: laufende Status-Schreibvorgänge nur vormerken (geschrieben bei Statuswechsel und am Ende)
+        self.last_status_written = None
+        self.pending_status = None
+        # Offline: Prüfsumme über alle Status-Schreibvorgänge (Teil des Simulations-Digests)
+        self.status_digest = hashlib.sha256() if self.offline else None
         self._initialize_status_files()
+        # State-Snapshot für den Warm-Restart durch den Supervisor (--resume)
+        self.state_file = os.getenv('BOT_STATE_FILE') or os.path.join(
+            os.path.dirname(os.path.abspath(status_file)), 'bot_state.json')
+        
+        # Profiling auf Befehl (PROFILE_START/PROFILE_STOP), Ergebnisse neben der Status-Datei
+        self.profiler = ProfilerController(os.path.dirname(os.path.abspath(status_file)), clock=self.clock,
+                                           max_duration=float(os.getenv('PROFILE_MAX_DURATION', 600)))
+        # Speicherdiagnose auf Befehl (MEM_START/MEM_SNAPSHOT/MEM_STOP)
+        self.memory = MemoryDiagnostics(os.path.dirname(os.path.abspath(status_file)),
+                                        frames=int(os.getenv('MEM_TRACE_FRAMES', 10)))
         
         # Trading control flags
         self.paused = False
         self.running = True
         
         # Status-Monitor initialisieren
-        self.monitor = BotStatusMonitor(os.getpid())
+        self.monitor = monitor or BotStatusMonitor(
+            os.getpid(), clock=self.clock,
+            memory_warn_mb=float(os.getenv('MEMORY_WARN_MB', 500)),
+            memory_growth_warn_mb_h=float(os.getenv('MEMORY_GROWTH_WARN_MB_H', 20)),
+            memory_sample_interval=float(os.getenv('MEMORY_SAMPLE_INTERVAL', 60))
+        )
         self.monitor.log_events("INFO", "Bot gestartet")
     
+    def _get_ring_price(self):
+        # Liest den neuesten BTC-Tick aus dem Shared-Memory-Feed
+        if self.ring_reader is None:
+            try:
+                self.ring_reader = RingReader(MarketDataRing.attach(self.market_data_ring), from_start=True)
+                logger.info("Marktdaten-Feed verbunden: %s", self.market_data_ring)
+            except (FileNotFoundError, ValueError):
+                self._ring_fallback("nicht verfügbar")
+                return None
+        
+        # Abgeschlossene 1m-Bars aus dem Feed direkt in die Bar Engine übernehmen
+        for record in self.ring_reader.poll():
+            if record.kind == BAR and record.symbol == 'BTCUSDT' and record.values[6] == 60:
+                bar = self.ring_reader.as_dict(record)
+                bar['timestamp'] = int(bar['start_ms'])
+                self.bar_engine.on_base_bar('BTCUSDT', bar)
+        
+        record = self.ring_reader.latest.get((TICK, 'BTCUSDT'))
+        if record is None or time.time_ns() - record.ts_ns > self.ring_max_age * 1e9:
+            ring = self.ring_reader.ring
+            if not ring.owner_alive():
+                # Ingest abgestürzt: ein Neustart legt ein neues Segment unter demselben Namen an,
+                # die alte Abbildung bleibt tot - lösen und beim nächsten Aufruf neu verbinden
+                logger.warning("Ingest-Prozess des Marktdaten-Feeds %s (PID %s) läuft nicht mehr - Feed wird neu verbunden",
+                               self.market_data_ring, ring.owner_info()[0])
+                ring.close()
+                self.ring_reader = None
+            self._ring_fallback("ohne aktuellen Tick")
+            return None
+        
+        tick = self.ring_reader.as_dict(record)
+        return {
+            'success': True,
+            'price': tick['price'],
+            'volume': tick['volume'],
+            'change': tick['change']
+        }
+    
+    def _ring_fallback(self, reason):
+        # Preis kommt per REST, solange der Feed nichts liefert (gedrosselt geloggt)
+        self.log_throttle.log(logging.WARNING, "Marktdaten-Feed %s %s - Preise per REST",
+                              self.market_data_ring, reason, key='ring_fallback')
+    
+    def _start_trade_stream(self):
+        # Startet den öffentlichen Trade-Stream für Live-Bars
+        if not (self.use_trade_stream or self.recorder) or self.trade_stream:
+            return
+        on_trades = self.candles.add_bybit_trades if self.use_trade_stream else (lambda trades: None)
+        self.trade_stream = BybitPublicTradeStream(
+            ['BTCUSDT'], on_trades, testnet=self.testnet,
+            orderbook_depth=self.recorder_depth if self.recorder else 0,
+            on_message=self.recorder.record_bybit_message if self.recorder else None
+        )
+        self.trade_stream.start()
+    
+    def _on_trade_bar_close(self, symbol, spec, bar):
+        # Abgeschlossene 1m-Trade-Bars an die Bar Engine weitergeben
+        if spec == 'time:60' and self.use_bar_engine:
+            self.bar_engine.on_base_bar(symbol, bar.as_dict())
+    
+    def _update_bars(self):
+        # Holt fehlende abgeschlossene 1m-Bars (höchstens ein Request pro Minute)
+        source = self.market_data or self.api
+        now_ms = self.clock.time_ms()
+        last = self.bar_engine.last_base_timestamp('BTCUSDT')
+        if last is None:
+            added = self.bar_engine.backfill(source, 'BTCUSDT', now_ms=now_ms)
+            logger.info("Bar Engine initialisiert: %s 1m-Bars geladen", added)
+        elif now_ms >= last + 120000:
+            self.bar_engine.backfill(source, 'BTCUSDT', start_time=last + 60000, now_ms=now_ms)
+    
+    @staticmethod
+    def _build_market_cache():
+        # Cache für öffentliche Marktdaten (TTL je Endpoint, 0 = nicht cachen)
+        if os.getenv('MARKET_CACHE', 'true').lower() != 'true':
+            return False
+        return MarketDataCache(
+            max_entries=int(os.getenv('MARKET_CACHE_SIZE', 1024)),
+            ttls={
+                '/v5/market/tickers': float(os.getenv('MARKET_CACHE_TICKER_TTL', 1.0)),
+                '/v5/market/orderbook': float(os.getenv('MARKET_CACHE_ORDERBOOK_TTL', 0.5)),
+                '/v5/market/kline': float(os.getenv('MARKET_CACHE_KLINE_TTL', 5.0)),
+                '/v5/market/instruments-info': float(os.getenv('MARKET_CACHE_INSTRUMENTS_TTL', 60.0)),
+            }
+        )
+    
+    def get_timeframe_view(self):
+        """Multi-Timeframe-Snapshot für BTCUSDT (letzter und laufender Bar je Timeframe)"""
+        return self.bar_engine.get_view('BTCUSDT')
+    
     def get_bybit_price(self):
         # Holt aktuellen BTC Preis von Bybit MAINNET
+        # (bevorzugt aus dem Shared-Memory-Feed, falls ein Ingest-Prozess läuft)
+        if self.market_data:
+            return self.market_data.get_price('BTCUSDT')
+        
+        if self.market_data_ring:
+            ring_price = self._get_ring_price()
+            if ring_price:
+                return ring_price
+        
         try:
-            base_url = "https://api.bybit.com"  # MAINNET URL
-            url = f"{base_url}/v5/market/tickers"
-            params = {'category': 'spot', 'symbol': 'BTCUSDT'}
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('retCode') == 0:
-                    ticker = data['result']['list'][0]
-                    return {
-                        'success': True,
-                        'price': float(ticker['lastPrice']),
-                        'volume': float(ticker['volume24h']),
-                        'change': float(ticker['price24hPcnt']) * 100
-                    }
+            # Über BybitAPI: Timeout, Hedge-Request und Circuit Breaker
+            ticker = self.api.get_ticker('BTCUSDT')
+            if ticker:
+                if self.recorder:
+                    self.recorder.record('BTCUSDT', 'ticker', ticker)
+                return {
+                    'success': True,
+                    'price': float(ticker['lastPrice']),
+                    'volume': float(ticker['volume24h']),
+                    'change': float(ticker['price24hPcnt']) * 100
+                }
             
             return {'success': False, 'error': 'API Error'}
             
@@ -101,71 +336,29 @@ class EnhancedLiveTradingBot:
     
     def detect_market_regime(self, price_data):
         # Erkennt aktuelles Market Regime (BULL/BEAR/SIDEWAYS)
-        # Vereinfachte Regime-Erkennung basierend auf Preisänderung
-        change_24h = price_data.get('change', 0)
-        
-        if change_24h > 2.0:
-            return {'regime': 'BULL', 'confidence': 0.8}
-        elif change_24h < -2.0:
-            return {'regime': 'BEAR', 'confidence': 0.8}
-        else:
-            return {'regime': 'SIDEWAYS', 'confidence': 0.6}
+        # Vereinfachte Regime-Erkennung basierend auf Preisänderung (Wrapper um BatchStrategy)
+        regimes, confidences = self.strategy.detect_regimes(np.array([price_data.get('change', 0)], dtype=np.float64))
+        return {'regime': REGIME_NAMES[regimes[0]], 'confidence': float(confidences[0])}
     
     def generate_trading_signal(self, price_data, regime_info):
-        # Generiert Trading Signal basierend auf Enhanced Strategy
+        # Generiert Trading Signal basierend auf Enhanced Strategy (Wrapper um BatchStrategy)
         current_price = price_data['price']
-        regime = regime_info['regime']
         confidence = regime_info['confidence']
+        position = self.current_position
         
-        # Enhanced Strategy Logic (vereinfacht)
-        if regime == 'BULL' and confidence > 0.7:
-            # In Bull Markets: Buy bei günstigen Einstiegen
-            if not self.current_position:
-                return {
-                    'signal': 'BUY',
-                    'entry_price': current_price,
-                    'stop_loss': current_price * 0.98,  # 2% Stop Loss
-                    'take_profit': current_price * 1.04,  # 4% Take Profit
-                    'reason': f'Bull Market Entry (Confidence: {confidence:.2f})'
-                }
-        
-        elif regime == 'BEAR' and confidence > 0.7:
-            # In Bear Markets: Sell bei Rebounds
-            if not self.current_position:
-                return {
-                    'signal': 'SELL',
-                    'entry_price': current_price,
-                    'stop_loss': current_price * 1.02,  # 2% Stop Loss
-                    'take_profit': current_price * 0.96,  # 4% Take Profit
-                    'reason': f'Bear Market Entry (Confidence: {confidence:.2f})'
-                }
-        
-        # Position Management
-        if self.current_position:
-            position_type = self.current_position['type']
-            entry_price = self.current_position['entry_price']
-            stop_loss = self.current_position['stop_loss']
-            take_profit = self.current_position['take_profit']
-            
-            # Check Stop Loss / Take Profit
-            if position_type == 'LONG':
-                if current_price <= stop_loss:
-                    return {'signal': 'CLOSE_LONG', 'reason': 'Stop Loss Hit'}
-                elif current_price >= take_profit:
-                    return {'signal': 'CLOSE_LONG', 'reason': 'Take Profit Hit'}
-            
-            elif position_type == 'SHORT':
-                if current_price >= stop_loss:
-                    return {'signal': 'CLOSE_SHORT', 'reason': 'Stop Loss Hit'}
-                elif current_price <= take_profit:
-                    return {'signal': 'CLOSE_SHORT', 'reason': 'Take Profit Hit'}
-        
-        return {'signal': 'HOLD', 'reason': 'No valid setup'}
+        result = self.strategy.evaluate_signals(
+            np.array([current_price], dtype=np.float64),
+            np.array([REGIME_CODES[regime_info['regime']]]),
+            np.array([confidence], dtype=np.float64),
+            np.array([POSITION_CODES[position['type'] if position else None]]),
+            np.array([position['stop_loss'] if position else np.nan], dtype=np.float64),
+            np.array([position['take_profit'] if position else np.nan], dtype=np.float64)
+        )
+        return self.strategy.signal_dict(result, 0, current_price, confidence)
     
     def _generate_signature(self, params):
         """HMAC SHA256 Signatur für Bybit V5 API"""
         import hmac
-        import hashlib
         import urllib.parse
         
         # Sortierte Parameter
@@ -177,45 +370,442 @@ class EnhancedLiveTradingBot:
         ).hexdigest()
         return signature
     
-    def _place_order(self, side, qty, order_type="Market"):
-        # Platziert echte Order über Bybit API
-        endpoint = "/v5/order/create"
+    def _signed_post(self, endpoint, body_params):
+        # Signierter POST-Request an die Bybit V5 API
+        # Orders werden nie gehedgt (nicht idempotent), aber per Timeout und Breaker begrenzt
+        breaker = self.api.breaker(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open: {endpoint}")
+        
         base_url = "https://api.bybit.com"  # MAINNET URL
         url = f"{base_url}{endpoint}"
-        timestamp = str(int(time.time() * 1000))
+        timestamp = str(self.time_sync.timestamp_ms())
+        recv_window = str(self.time_sync.recv_window_ms())
         
-        params = {
+        params = dict(body_params)
+        params.update({
+            "api_key": self.api_key,
+            "timestamp": timestamp,
+            "recv_window": recv_window
+        })
+        
+        # ECHTE Signatur generieren
+        params["sign"] = self._generate_signature(params)
+        
+        headers = {
+            "X-BAPI-API-KEY": self.api_key,
+            "X-BAPI-SIGN": params["sign"],
+            "X-BAPI-TIMESTAMP": timestamp,
+            "X-BAPI-RECV-WINDOW": recv_window,
+            "Content-Type": "application/json"
+        }
+        
+        started = time.perf_counter()
+        try:
+            response = self.api.session.post(url, headers=headers, json=body_params,
+                                             timeout=self.api.timeout_for(endpoint))
+        except Exception:
+            breaker.record_failure()
+            raise
+        self.api.record_latency(endpoint, time.perf_counter() - started)
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        response.raise_for_status()
+        return response.json()
+    
+    def _place_order(self, side, qty, order_type="Market", price=None, trigger_price=None, intent=None):
+        # Platziert echte Order über Bybit API
+        # Mit trigger_price als bedingte Order (Spot-StopOrder), die die Börse selbst auslöst
+        # intent (OPEN_LONG, CLOSE_LONG, STOP, ...) ordnet eine später aufgelöste Order der Position zu
+        if self.broker:
+            return self.broker.place_order("BTCUSDT", side, qty, order_type=order_type, price=price,
+                                           trigger_price=trigger_price)
+        
+        body_params = {
             "category": "spot",
             "symbol": "BTCUSDT",
             "side": side,
             "orderType": order_type,
-            "qty": str(qty),
-            "api_key": self.api_key,
-            "timestamp": timestamp,
-            "recv_window": "5000"
+            "qty": format(Decimal(str(qty)), 'f')
         }
         
-        # ECHTE Signatur generieren
-        params["sign"] = self._generate_signature(params)
+        if order_type == "Limit" and price is not None:
+            body_params["price"] = str(price)
+        
+        if trigger_price is not None:
+            body_params["triggerPrice"] = str(trigger_price)
+            body_params["orderFilter"] = "StopOrder"
+        
+        # orderLinkId erlaubt nach einem Timeout die Statusabfrage statt eines Duplikats
+        result = self.orders.submit(body_params, lambda params: self._signed_post("/v5/order/create", params),
+                                    self._lookup_order, intent=intent)
+        if not result['success']:
+            logger.error("API-Fehler bei Orderplatzierung: %s", result.get('error'))
+        return result
+    
+    def _lookup_order(self, order_link_id):
+        # Orderstatus über die orderLinkId: zuerst Private-Stream, dann REST
+        if self.private_stream:
+            order = self.private_stream.store.get_order(order_link_id=order_link_id)
+            if order:
+                return order
+        return self.api.lookup_order("BTCUSDT", order_link_id=order_link_id)
+    
+    def _orders_unresolved(self, intents=None):
+        # Offene Orders mit unbekanntem Zustand erneut prüfen; True, solange (zu intents passende) übrig sind
+        if not self.orders.unresolved():
+            return False
+        for entry in self.orders.reconcile(self._lookup_order):
+            self._adopt_order(entry)
+        return any(intents is None or entry.get('intent') in intents for entry in self.orders.unresolved())
+    
+    def _adopt_order(self, entry):
+        # Übernimmt eine nachträglich an der Börse gefundene Order in Position und State-Snapshot
+        intent = entry.get('intent')
+        filled_qty = entry.get('filled_qty') or 0.0
+        avg_price = entry.get('avg_price')
+        position = self.current_position
+        event_msg = (f"Order {entry['order_link_id']} ({intent}, {entry['side']} {entry['qty']}) nachträglich "
+                     f"an der Börse gefunden - ausgeführt: {filled_qty}")
+        logger.warning(event_msg)
+        self.monitor.log_events("WARNING", event_msg)
+        
+        if intent == 'STOP':
+            if position and not position.get('stop_order_id'):
+                position['stop_order_id'] = entry['order_id']
+                position['exchange_protected'] = True
+            else:
+                # Keine Position (mehr) zu schützen - verwaiste Stop-Order entfernen
+                self._cancel_order(entry['order_id'])
+        elif not filled_qty or not avg_price:
+            return
+        elif intent in ('OPEN_LONG', 'OPEN_SHORT'):
+            if position:
+                error_msg = f"Fill von {entry['order_link_id']} trifft auf offene Position - Position manuell prüfen"
+                logger.error(error_msg)
+                self.monitor.log_events("ERROR", error_msg)
+                return
+            # Schutzlevel wie die Strategie, aber vom tatsächlichen Fill-Preis aus
+            direction = 1 if intent == 'OPEN_LONG' else -1
+            stop_loss = avg_price * (1 - direction * self.strategy.stop_pct)
+            take_profit = avg_price * (1 + direction * self.strategy.target_pct)
+            self._record_trade(self._open_position(intent, avg_price, filled_qty, stop_loss, take_profit,
+                                                   entry['order_id'], "Nachträglich aufgelöste Order"))
+            return
+        elif intent in ('CLOSE_LONG', 'CLOSE_SHORT'):
+            if not position or f"CLOSE_{position['type']}" != intent:
+                return
+            self._record_trade(self._book_close(avg_price, min(filled_qty, position['qty']),
+                                                "Nachträglich aufgelöste Order"))
+            return
+        self._save_state()
+    
+    def _get_order(self, order_id):
+        # Aktueller Zustand einer Order über die Order-ID (Endzustände aus dem Private-Stream, sonst REST)
+        if self.broker:
+            return self.broker.lookup_order("BTCUSDT", order_id)
+        if self.private_stream:
+            order = self.private_stream.store.get_order(order_id=order_id)
+            if order and order.get('orderStatus') in FINAL_ORDER_STATES:
+                return order
+        return self.api.lookup_order("BTCUSDT", order_id=order_id, order_filter="StopOrder")
+    
+    def _cancel_order(self, order_id):
+        # Storniert eine bedingte Order an der Börse
+        if self.broker:
+            return self.broker.cancel_order("BTCUSDT", order_id)
+        
+        body_params = {
+            "category": "spot",
+            "symbol": "BTCUSDT",
+            "orderId": order_id,
+            "orderFilter": "StopOrder"
+        }
         
         try:
-            headers = {
-                "X-BAPI-API-KEY": self.api_key,
-                "X-BAPI-SIGN": params["sign"],
-                "X-BAPI-TIMESTAMP": timestamp,
-                "X-BAPI-RECV-WINDOW": "5000",
-                "Content-Type": "application/json"
-            }
-            # Sign aus dem Body entfernen
-            body_params = {k: v for k, v in params.items() if k not in ['api_key', 'timestamp', 'recv_window', 'sign']}
-            
-            response = requests.post(url, headers=headers, json=body_params)
-            response.raise_for_status()
-            return response.json()
+            data = self._signed_post("/v5/order/cancel", body_params)
         except Exception as e:
-            logger.error(f"API-Fehler bei Orderplatzierung: {str(e)}")
+            logger.error("API-Fehler bei Stornierung: %s", e)
             return {"success": False, "error": str(e)}
-
+        
+        if data.get('retCode') == 0:
+            return {"success": True, "order_id": order_id}
+        return {"success": False, "error": data.get('retMsg', 'API Error')}
+    
+    def _amend_order(self, order_id, trigger_price):
+        # Verschiebt den Triggerpreis einer bedingten Order an der Börse
+        if self.broker:
+            return self.broker.amend_order("BTCUSDT", order_id, trigger_price=trigger_price)
+        
+        body_params = {
+            "category": "spot",
+            "symbol": "BTCUSDT",
+            "orderId": order_id,
+            "triggerPrice": str(trigger_price)
+        }
+        
+        try:
+            data = self._signed_post("/v5/order/amend", body_params)
+        except Exception as e:
+            logger.error("API-Fehler bei Orderänderung: %s", e)
+            return {"success": False, "error": str(e)}
+        
+        if data.get('retCode') == 0:
+            return {"success": True, "order_id": data.get('result', {}).get('orderId')}
+        return {"success": False, "error": data.get('retMsg', 'API Error')}
+    
+    def _protect_position(self):
+        # Hinterlegt den Stop-Loss als eigene bedingte Order an der Börse
+        # (Spot-Market-Orders übernehmen angehängte TP/SL nicht; der Take-Profit bleibt im Bot)
+        position = self.current_position
+        position['stop_order_id'] = None
+        position['exchange_protected'] = False
+        if not self.exchange_tpsl:
+            return
+        
+        side = "Sell" if position['type'] == 'LONG' else "Buy"
+        qty = self._prepare_qty(position['qty'])
+        result = self._place_order(side, qty, trigger_price=position['stop_loss'], intent='STOP')
+        if not result.get('success'):
+            error_msg = f"Stop-Order an der Börse fehlgeschlagen ({result.get('error')}) - Stop nur im Bot"
+            logger.error(error_msg)
+            self.monitor.log_events("ERROR", error_msg)
+            return
+        position['stop_order_id'] = result.get('order_id')
+        position['exchange_protected'] = True
+        logger.info("Stop-Order %s an der Börse hinterlegt: %s %.6f @ $%.2f",
+                    position['stop_order_id'], side, qty, position['stop_loss'])
+    
+    def update_protection(self, stop_loss=None, take_profit=None):
+        """Verschiebt Stop-Loss/Take-Profit der offenen Position (lokal und an der Börse)"""
+        if not self.current_position:
+            return False
+        
+        position = self.current_position
+        if stop_loss is not None and position.get('stop_order_id'):
+            result = self._amend_order(position['stop_order_id'], stop_loss)
+            if not result.get('success'):
+                logger.error("Stop-Änderung fehlgeschlagen: %s", result.get('error'))
+                return False
+        
+        if stop_loss is not None:
+            position['stop_loss'] = stop_loss
+        if take_profit is not None:
+            position['take_profit'] = take_profit
+        
+        logger.info("Schutzlevel aktualisiert | Stop: $%.2f | Target: $%.2f", position['stop_loss'], position['take_profit'])
+        return True
+    
+    def _settle_stop_order(self):
+        # Storniert die Stop-Order der Position; Returns (Menge, Durchschnittspreis) ihres Fills
+        # oder None, wenn ihr Zustand nicht ermittelbar ist
+        order_id = self.current_position['stop_order_id']
+        try:
+            order = self._get_order(order_id)
+            if order and order.get('orderStatus') not in FINAL_ORDER_STATES:
+                # Schlägt fehl, wenn die Börse die Order gerade auslöst - der Zustand danach zählt
+                cancel = self._cancel_order(order_id)
+                if not cancel.get('success'):
+                    logger.warning("Stop-Order %s nicht storniert: %s", order_id, cancel.get('error'))
+                order = self._get_order(order_id)
+        except Exception as e:
+            logger.error("Zustand der Stop-Order %s unbekannt: %s", order_id, e)
+            return None
+        if order is None:
+            logger.warning("Stop-Order %s an der Börse nicht gefunden", order_id)
+            return 0.0, None
+        if order.get('orderStatus') not in FINAL_ORDER_STATES:
+            logger.error("Stop-Order %s noch aktiv (%s)", order_id, order.get('orderStatus'))
+            return None
+        
+        self.current_position['stop_order_id'] = None
+        filled_qty = float(order.get('cumExecQty') or 0)
+        avg_price = float(order.get('avgPrice') or 0) or None
+        if filled_qty > 0:
+            logger.info("Stop-Order %s an der Börse ausgeführt: %.6f @ $%.2f", order_id, filled_qty, avg_price)
+        return filled_qty, avg_price
+    
+    def _check_stop_order(self):
+        # Erkennt eine zwischen zwei Abfragen ausgelöste Stop-Order der Börse und bucht das Schließen
+        position = self.current_position
+        order_id = position.get('stop_order_id') if position else None
+        if not order_id:
+            return
+        if self.private_stream and self.private_stream.connected:
+            order = self.private_stream.store.get_order(order_id=order_id)
+        else:
+            now = self.clock.time()
+            if now - self.last_stop_check < self.stop_check_interval:
+                return
+            self.last_stop_check = now
+            try:
+                order = self._get_order(order_id)
+            except Exception as e:
+                self.log_throttle.log(logging.WARNING, "Stop-Order %s nicht abgefragt: %s", order_id, e,
+                                      key='stop_order_check', interval=60)
+                return
+        if not order or order.get('orderStatus') not in FINAL_ORDER_STATES:
+            return
+        
+        position['stop_order_id'] = None
+        filled_qty = float(order.get('cumExecQty') or 0)
+        avg_price = float(order.get('avgPrice') or 0)
+        if filled_qty <= 0 or not avg_price:
+            # Ohne Ausführung beendet (z.B. an der Börse storniert) - Position neu schützen
+            error_msg = f"Stop-Order {order_id} ohne Ausführung beendet ({order.get('orderStatus')}) - wird neu hinterlegt"
+            logger.warning(error_msg)
+            self.monitor.log_events("WARNING", error_msg)
+            self._protect_position()
+            self._save_state()
+            return
+        
+        event_msg = f"Stop-Order {order_id} an der Börse ausgeführt: {filled_qty:.6f} @ ${avg_price:.2f}"
+        logger.info(event_msg)
+        self.monitor.log_events("TRADE", event_msg)
+        self._record_trade(self._book_close(avg_price, min(filled_qty, position['qty']),
+                                            "Stop-Order an der Börse ausgeführt"))
+    
+    def _close_position_order(self, side, qty, current_price):
+        # Schließt die Position: zuerst die Stop-Order der Börse auflösen (ggf. schon ausgeführt),
+        # dann nur den Rest per Market-Order
+        intent = f"CLOSE_{self.current_position['type']}"
+        if not self.current_position.get('stop_order_id'):
+            return self._place_order(side, qty, intent=intent)
+        
+        settled = self._settle_stop_order()
+        if settled is None:
+            # Ein zweiter Verkauf neben einer womöglich ausgelösten Stop-Order wäre eine Doppelorder
+            return {"success": False, "error": "Zustand der Stop-Order unbekannt"}
+        stop_qty, stop_price = settled
+        
+        remaining = self._prepare_qty(max(qty - stop_qty, 0.0))
+        if not remaining:
+            return {"success": True, "order_id": None, "avg_price": stop_price, "filled_qty": stop_qty}
+        
+        order_result = self._place_order(side, remaining, intent=intent)
+        if not order_result.get('success'):
+            if stop_qty > 0:
+                # Teil über die Stop-Order geschlossen, Rest bleibt offen
+                return {"success": True, "order_id": None, "avg_price": stop_price, "filled_qty": stop_qty}
+            return order_result
+        
+        fill_price, fill_qty = self._resolve_fill(order_result, current_price, remaining)
+        filled = stop_qty + fill_qty
+        avg_price = (stop_qty * stop_price + fill_qty * fill_price) / filled if stop_qty > 0 else fill_price
+        return dict(order_result, avg_price=avg_price, filled_qty=filled)
+    
+    def _start_private_stream(self):
+        # Startet den Private-Stream für Order-, Fill- und Wallet-Updates
+        if not self.use_private_stream or self.private_stream or not self.api_key or self.offline:
+            return
+        self.private_stream = BybitPrivateStream(self.api_key, self.api_secret, testnet=self.testnet)
+        self.account.attach_stream(self.private_stream.store)
+        self.private_stream.start()
+    
+    def _trading_balance(self):
+        # Verfügbares USDT aus dem Account-Cache, sonst lokaler Kontostand
+        if self.use_account_balance and self.api_key and not self.offline:
+            available = self.account.get_available_balance('USDT')
+            if available is not None:
+                return available
+        return self.current_balance
+    
+    def _prepare_qty(self, qty, reference_price=None):
+        # Rundet die Menge auf den Lot-Schritt; prüft Neuaufträge gegen die Mindestwerte
+        if reference_price is not None and qty <= 0:
+            logger.warning("Order verworfen: Menge ist 0")
+            return None
+        
+        info = self.instruments.get("BTCUSDT")
+        if info is None:
+            return qty
+        
+        if reference_price is None:
+            return float(info.quantize_qty(qty))
+        
+        qty_str, _, error = self.instruments.prepare_order("BTCUSDT", qty, reference_price)
+        if error:
+            logger.warning("Order verworfen: %s", error)
+            return None
+        return float(qty_str)
+    
+    def _check_liquidity(self, side, qty):
+        # Schätzt die Slippage der Market-Order und begrenzt die Menge auf MAX_SLIPPAGE_BPS
+        source = self.market_data or self.api
+        if self.max_slippage_bps <= 0 or not hasattr(source, 'get_order_book'):
+            return qty
+        
+        book = OrderBookSnapshot.from_bybit(source.get_order_book("BTCUSDT", self.orderbook_depth))
+        if book.empty:
+            logger.warning("Orderbuch leer - Order ohne Slippage-Schätzung")
+            return qty
+        
+        estimate = book.fill_estimate(side, qty)
+        self.last_slippage_estimate = dict(estimate, side=side, qty=qty, spread_bps=book.spread_bps,
+                                           imbalance=book.imbalance(levels=10))
+        logger.info("Slippage-Schätzung %s %.6f: %.2f bps (Ø $%.2f, %s Level)",
+                    side, qty, estimate['slippage_bps'], estimate['avg_price'], estimate['levels'])
+        if estimate['fully_filled'] and estimate['slippage_bps'] <= self.max_slippage_bps:
+            return qty
+        
+        max_qty = book.max_qty_for_slippage(side, self.max_slippage_bps)
+        logger.warning("Menge von %.6f auf %.6f reduziert (Slippage-Limit %.1f bps)", qty, max_qty, self.max_slippage_bps)
+        return max_qty
+    
+    def _resolve_fill(self, order_result, fallback_price, fallback_qty):
+        # Liefert (Fill-Preis, ausgeführte Menge) aus dem Private-Stream
+        if order_result.get('avg_price') is not None:
+            # Simulierter Broker meldet den Fill direkt
+            return order_result['avg_price'], order_result['filled_qty']
+        
+        order_id = order_result.get('order_id')
+        if not self.private_stream or not order_id:
+            return fallback_price, fallback_qty
+        
+        fill = self.private_stream.store.wait_for_fill(order_id, timeout=self.fill_timeout)
+        if not fill:
+            logger.warning("Kein Fill für Order %s empfangen - verwende $%.2f", order_id, fallback_price)
+            return fallback_price, fallback_qty
+        
+        if fill['status'] != 'Filled':
+            logger.warning("Order %s nur teilweise ausgeführt: %s von %s", order_id, fill['filled_qty'], fallback_qty)
+        return fill['avg_price'], fill['filled_qty']
+    
+    def _reduce_position(self, filled_qty):
+        # Zieht eine (Teil-)Schließung von der Position ab; ein Rest bleibt mit neuer Stop-Order offen
+        position = self.current_position
+        remaining = self._prepare_qty(max(position['qty'] - filled_qty, 0.0))
+        if not remaining:
+            self.current_position = None
+            return
+        
+        error_msg = (f"{position['type']}-Position nur teilweise geschlossen: {filled_qty:.6f} von "
+                     f"{position['qty']:.6f} - Rest {remaining:.6f} bleibt offen")
+        logger.warning(error_msg)
+        self.monitor.log_events("WARNING", error_msg)
+        position['qty'] = remaining
+        if self.exchange_tpsl and not position.get('stop_order_id'):
+            self._protect_position()
+    
+    def _mark_to_market(self, current_price):
+        # Bewertet Kontostand inkl. offener Position und prüft die Risikogrenzen
+        position = self.current_position
+        unrealized = 0.0
+        exposure = 0.0
+        if position:
+            direction = 1 if position['type'] == 'LONG' else -1
+            unrealized = (current_price - position['entry_price']) * position['qty'] * direction
+            exposure = current_price * position['qty']
+        
+        was_breached = self.performance.breach
+        breach = self.performance.mark(self.clock.time(), self.current_balance + unrealized, exposure)
+        if breach and breach != was_breached:
+            logger.warning("Risikogrenze erreicht (%s) - keine neuen Positionen", breach)
+            self.monitor.log_events("WARNING", f"Risikogrenze erreicht: {breach}")
+        return breach
+    
     def execute_trade(self, signal_data, current_price):
         # Führt echte Trades über Bybit API aus
         signal = signal_data['signal']
@@ -224,143 +814,154 @@ class EnhancedLiveTradingBot:
         if signal == 'HOLD':
             return
         
-        logger.info(f"TRADE SIGNAL: {signal} @ ${current_price:.2f}")
-        logger.info(f"Reason: {reason}")
+        # Keine neue Position, solange eine frühere Order in unbekanntem Zustand ist;
+        # kein zweites Schließen, solange eine Schließ- oder Stop-Order ungeklärt ist
+        # (vor der Positionsprüfung: die Auflösung kann eine Position übernehmen)
+        if not self.broker and self._orders_unresolved(None if signal in ('BUY', 'SELL') else CLOSE_INTENTS):
+            self.log_throttle.log(logging.WARNING, "Signal %s ignoriert - Orderstatus ungeklärt", signal,
+                                  key='orders_unresolved', interval=60)
+            return
+        
+        # Nach Erreichen von MAX_DRAWDOWN/DAILY_RISK_LIMIT nur noch Positionen schließen
+        if signal in ('BUY', 'SELL') and self.performance.breach:
+            logger.info("Signal %s ignoriert - %s", signal, self.performance.breach)
+            return
         
-        if signal == 'BUY':
-            # Positionwert berechnen (50% des aktuellen Kontostands)
-            position_value = self.current_balance * 0.5
-            qty = position_value / current_price
+        # Im Pipeline-Modus kann das Signal auf einer veralteten Position beruhen
+        if signal in ('BUY', 'SELL') and self.current_position:
+            logger.debug("Signal %s ignoriert - Position %s bereits offen", signal, self.current_position)
+            return
+        
+        logger.info("TRADE SIGNAL: %s @ $%.2f", signal, current_price)
+        logger.info("Reason: %s", reason)
+        
+        if signal in ('BUY', 'SELL'):
+            side = "Buy" if signal == 'BUY' else "Sell"
+            intent = 'OPEN_LONG' if signal == 'BUY' else 'OPEN_SHORT'
+            # Positionwert berechnen (50% des verfügbaren Kontostands)
+            position_value = self._trading_balance() * 0.5
+            qty = self._check_liquidity(side, position_value / current_price)
+            qty = self._prepare_qty(qty, current_price)
+            if qty is None:
+                return
             
-            # Marktorder platzieren
-            order_result = self._place_order("Buy", qty)
+            # Marktorder platzieren (Stop-Loss folgt nach dem Fill als eigene Order an der Börse)
+            order_result = self._place_order(side, qty, intent=intent)
             
             if order_result.get('success'):
-                self.current_position = {
-                    'type': 'LONG',
-                    'entry_price': current_price,
-                    'stop_loss': signal_data['stop_loss'],
-                    'take_profit': signal_data['take_profit'],
-                    'qty': qty,
-                    'timestamp': datetime.now()
-                }
-                
-                trade_record = {
-                    'timestamp': datetime.now(),
-                    'type': 'OPEN_LONG',
-                    'price': current_price,
-                    'qty': qty,
-                    'reason': reason
-                }
+                # Tatsächlichen Fill-Preis und ausgeführte Menge übernehmen
+                entry_price, qty = self._resolve_fill(order_result, current_price, qty)
+                trade_record = self._open_position(intent, entry_price, qty, signal_data['stop_loss'],
+                                                   signal_data['take_profit'], order_result.get('order_id'), reason)
             else:
-                logger.error(f"Kauforder fehlgeschlagen: {order_result.get('error')}")
+                logger.error("%s fehlgeschlagen: %s", "Kauforder" if signal == 'BUY' else "Verkaufsorder",
+                             order_result.get('error'))
                 return
-                
-        elif signal == 'SELL':
-            # Positionwert berechnen (50% des aktuellen Kontostands)
-            position_value = self.current_balance * 0.5
-            qty = position_value / current_price
             
-            # Marktorder platzieren
-            order_result = self._place_order("Sell", qty)
+        elif signal in ('CLOSE_LONG', 'CLOSE_SHORT'):
+            position_type = signal[len('CLOSE_'):]
+            if not self.current_position or self.current_position['type'] != position_type:
+                return
+            
+            qty = self._prepare_qty(self.current_position['qty'])
+            side = "Sell" if position_type == 'LONG' else "Buy"
+            order_result = self._close_position_order(side, qty, current_price)
             
             if order_result.get('success'):
-                self.current_position = {
-                    'type': 'SHORT',
-                    'entry_price': current_price,
-                    'stop_loss': signal_data['stop_loss'],
-                    'take_profit': signal_data['take_profit'],
-                    'qty': qty,
-                    'timestamp': datetime.now()
-                }
-                
-                trade_record = {
-                    'timestamp': datetime.now(),
-                    'type': 'OPEN_SHORT',
-                    'price': current_price,
-                    'qty': qty,
-                    'reason': reason
-                }
+                # P&L nur auf die tatsächlich ausgeführte Menge, ein Rest bleibt offen
+                exit_price, filled_qty = self._resolve_fill(order_result, current_price, qty)
+                if not filled_qty:
+                    logger.error("Schließorder ohne Ausführung - %s-Position bleibt offen", position_type)
+                    return
+                trade_record = self._book_close(exit_price, filled_qty, reason)
             else:
-                logger.error(f"Verkaufsorder fehlgeschlagen: {order_result.get('error')}")
+                logger.error("Schließorder fehlgeschlagen: %s", order_result.get('error'))
                 return
-            
-        elif signal == 'CLOSE_LONG':
-            if self.current_position and self.current_position['type'] == 'LONG':
-                qty = self.current_position['qty']
-                order_result = self._place_order("Sell", qty)
-                
-                if order_result.get('success'):
-                    entry_price = self.current_position['entry_price']
-                    pnl = (current_price - entry_price) * qty
-                    self.current_balance += pnl
-                    
-                    logger.info(f"LONG-Position geschlossen: P&L = ${pnl:.2f}")
-                    logger.info(f"Neuer Kontostand: ${self.current_balance:.2f}")
-                    
-                    trade_record = {
-                        'timestamp': datetime.now(),
-                        'type': 'CLOSE_LONG',
-                        'price': current_price,
-                        'pnl': pnl,
-                        'reason': reason
-                    }
-                    
-                    self.current_position = None
-                else:
-                    logger.error(f"Schließorder fehlgeschlagen: {order_result.get('error')}")
-                    return
-                    
-        elif signal == 'CLOSE_SHORT':
-            if self.current_position and self.current_position['type'] == 'SHORT':
-                qty = self.current_position['qty']
-                order_result = self._place_order("Buy", qty)
-                
-                if order_result.get('success'):
-                    entry_price = self.current_position['entry_price']
-                    pnl = (entry_price - current_price) * qty
-                    self.current_balance += pnl
-                    
-                    logger.info(f"SHORT-Position geschlossen: P&L = ${pnl:.2f}")
-                    logger.info(f"Neuer Kontostand: ${self.current_balance:.2f}")
-                    
-                    trade_record = {
-                        'timestamp': datetime.now(),
-                        'type': 'CLOSE_SHORT',
-                        'price': current_price,
-                        'pnl': pnl,
-                        'reason': reason
-                    }
-                    
-                    self.current_position = None
-                else:
-                    logger.error(f"Schließorder fehlgeschlagen: {order_result.get('error')}")
-                    return
+        else:
+            return
+        
+        self._record_trade(trade_record)
+    
+    def _open_position(self, intent, entry_price, qty, stop_loss, take_profit, order_id, reason):
+        # Legt die Position nach dem Fill an und hinterlegt den Stop an der Börse
+        self.current_position = {
+            'type': 'LONG' if intent == 'OPEN_LONG' else 'SHORT',
+            'entry_price': entry_price,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'qty': qty,
+            'order_id': order_id,
+            'timestamp': self.clock.now()
+        }
+        self._protect_position()
+        
+        return {
+            'timestamp': self.clock.now(),
+            'type': intent,
+            'price': entry_price,
+            'qty': qty,
+            'reason': reason
+        }
+    
+    def _book_close(self, exit_price, filled_qty, reason):
+        # Bucht P&L der geschlossenen Menge und verkleinert bzw. entfernt die Position
+        position = self.current_position
+        direction = 1 if position['type'] == 'LONG' else -1
+        pnl = (exit_price - position['entry_price']) * filled_qty * direction
+        self.current_balance += pnl
+        self.performance.record_trade(pnl)
+        
+        logger.info("%s-Position geschlossen: P&L = $%.2f", position['type'], pnl)
+        logger.info("Neuer Kontostand: $%.2f", self.current_balance)
+        
+        trade_record = {
+            'timestamp': self.clock.now(),
+            'type': f"CLOSE_{position['type']}",
+            'price': exit_price,
+            'pnl': pnl,
+            'reason': reason
+        }
+        
+        self._reduce_position(filled_qty)
+        return trade_record
+    
+    def _record_trade(self, trade_record):
+        # Kontostand nach eigenem Fill sofort neu laden
+        if not self.offline:
+            self.account.invalidate(refresh=True)
         
         self.trades_history.append(trade_record)
         self.trade_count += 1
+        self._save_state()
         
-        logger.info(f"Trade #{self.trade_count} ausgeführt")
+        logger.info("Trade #%s ausgeführt", self.trade_count)
     
     def log_status(self):
         # Loggt aktuellen Trading Status
-        uptime = datetime.now() - self.start_time
+        uptime = self.clock.now() - self.start_time
         total_pnl = self.current_balance - self.start_balance
         
         logger.info("=" * 50)
         logger.info("TRADING STATUS")
         logger.info("=" * 50)
-        logger.info(f"Uptime: {uptime}")
-        logger.info(f"Balance: ${self.current_balance:.2f}")
-        logger.info(f"Total P&L: ${total_pnl:.2f} ({total_pnl/self.start_balance*100:.2f}%)")
-        logger.info(f"Trades: {self.trade_count}")
-        logger.info(f"Position: {self.current_position['type'] if self.current_position else 'None'}")
+        logger.info("Uptime: %s", uptime)
+        logger.info("Balance: $%.2f", self.current_balance)
+        logger.info("Total P&L: $%.2f (%.2f%%)", total_pnl, total_pnl/self.start_balance*100)
+        logger.info("Trades: %s", self.trade_count)
+        logger.info("Position: %s", self.current_position['type'] if self.current_position else 'None')
+        self._log_performance()
         
         if self.current_position:
             entry = self.current_position['entry_price']
             stop = self.current_position['stop_loss']
             target = self.current_position['take_profit']
-            logger.info(f"Entry: ${entry:.2f} | Stop: ${stop:.2f} | Target: ${target:.2f}")
+            logger.info("Entry: $%.2f | Stop: $%.2f | Target: $%.2f", entry, stop, target)
+        
+        if self.scanner and self.scanner.latest is not None:
+            movers = self.scanner.top_movers(3, min_turnover=self.scan_min_turnover)
+            logger.info("Top Mover (24h): %s | Verlierer: %s",
+                        ', '.join(f"{m['symbol']} {m['change_pct']:+.1f}%" for m in movers['gainers']),
+                        ', '.join(f"{m['symbol']} {m['change_pct']:+.1f}%" for m in movers['losers']))
         
         logger.info("=" * 50)
     
@@ -368,16 +969,141 @@ class EnhancedLiveTradingBot:
         # Initialize status and command files
         if not os.path.exists(self.status_file):
             with open(self.status_file, 'w') as f:
-                json.dump({"status": "RUNNING", "pid": os.getpid(), "timestamp": time.time()}, f)
+                json.dump({"status": "RUNNING", "pid": self._status_pid(), "timestamp": self.clock.time()}, f)
         
         if not os.path.exists(self.command_file):
             with open(self.command_file, 'w') as f:
-                json.dump({"command": "NONE", "timestamp": time.time()}, f)
+                json.dump({"command": "NONE", "timestamp": self.clock.time()}, f)
 
-    def _update_status(self, status: str):
-        # Update status file
-        with open(self.status_file, 'w') as f:
-            json.dump({"status": status, "pid": os.getpid(), "timestamp": time.time()}, f)
+    def _update_status(self, status: str, periodic=False):
+        # Update status file (inkl. Kennzahlen der Exchange-Komponenten)
+        # periodic=True: laufende Aktualisierung ohne Befehl oder Zustandsänderung
+        # Atomar ersetzen: Dashboard und Supervisor lesen nie eine halb geschriebene Datei
+        stalled = self.pipeline.stalled(self.stall_timeout) if status in ("RUNNING", "PAUSED") else {}
+        if stalled:
+            # Hängende Stufe: Zeitstempel nicht fortschreiben, damit der Supervisor neu startet
+            status = "STALLED"
+            reason = ", ".join(f"{name}: {why}" for name, why in stalled.items())
+            if self.log_throttle.log(logging.ERROR, "Pipeline hängt - %s", reason, key='pipeline_stalled', interval=60):
+                self.monitor.log_events("ERROR", f"Pipeline hängt - {reason}")
+        else:
+            self.last_status_write = self.clock.time()
+        payload = {"status": status, "pid": self._status_pid(), "timestamp": self.last_status_write,
+                   "metrics": self._collect_metrics()}
+        # Einmal serialisieren - dieselben Bytes für Datei und Digest
+        data = json.dumps(payload, sort_keys=True)
+        if self.status_digest is not None:
+            self.status_digest.update(data.encode('utf-8'))
+        if self.offline and periodic and status == self.last_status_written:
+            # Offline liest niemand mit - die Datei folgt beim nächsten Wechsel oder am Ende
+            self.pending_status = data
+            return
+        write_text_atomic(self.status_file, data)
+        self.last_status_written = status
+        self.pending_status = None
+    
+    def _flush_status(self):
+        # Vorgemerkten Status schreiben (Ende eines Offline-Laufs)
+        if self.pending_status is not None:
+            write_text_atomic(self.status_file, self.pending_status)
+            self.pending_status = None
+    
+    def _status_pid(self):
+        # Offline ohne PID, damit gleiche Simulationsläufe identische Status-Dateien schreiben
+        return None if self.offline else os.getpid()
+    
+    def _heartbeat(self):
+        # Die Status-Datei ist der Heartbeat für den Supervisor - auch ohne Ticks (Pause, API-Fehler);
+        # er schreitet nur fort, solange alle Stufen arbeiten (siehe _update_status)
+        if self.clock.time() - self.last_status_write >= self.poll_interval:
+            self._update_status("PAUSED" if self.paused else "RUNNING", periodic=True)
+    
+    def _save_state(self):
+        # State-Snapshot nach jeder Positionsänderung und beim Beenden
+        position = self.current_position
+        if position:
+            position = dict(position, timestamp=position['timestamp'].isoformat())
+        try:
+            save_state(self.state_file, {
+                'position': position,
+                'balance': self.current_balance,
+                'start_balance': self.start_balance,
+                'trade_count': self.trade_count,
+                'peak_equity': self.performance.peak,
+                'unresolved_orders': self.orders.unresolved()
+            })
+        except OSError as e:
+            logger.error("State-Snapshot nicht gespeichert: %s", e)
+    
+    def resume_from_state(self):
+        """Übernimmt Position, Kontostand und ungeklärte Orders aus dem State-Snapshot (Warm-Restart)"""
+        state = load_state(self.state_file)
+        if not state:
+            logger.warning("Kein State-Snapshot in %s - Start ohne Position", self.state_file)
+            return False
+        
+        position = state.get('position')
+        if position:
+            position = dict(position, timestamp=datetime.fromisoformat(position['timestamp']))
+        self.current_position = position
+        self.current_balance = state['balance']
+        self.start_balance = state['start_balance']
+        self.trade_count = state['trade_count']
+        # Höchststand übernehmen, damit MAX_DRAWDOWN über Neustarts hinweg greift
+        self.performance.start_equity = self.start_balance
+        self.performance.peak = max(state.get('peak_equity', self.start_balance), self.current_balance)
+        self.orders.restore(state.get('unresolved_orders', []))
+        
+        logger.info("State übernommen (%s): Kontostand $%.2f | Position: %s | Trades: %s",
+                    datetime.fromtimestamp(state['saved_at']).isoformat(timespec='seconds'),
+                    self.current_balance, position['type'] if position else 'keine', self.trade_count)
+        self.monitor.log_events("INFO", f"Warm-Restart: Position {position['type'] if position else 'keine'}, "
+                                        f"Kontostand ${self.current_balance:.2f}")
+        return True
+    
+    def _collect_metrics(self):
+        # Sammelt exportierte Kennzahlen für Status-Datei und Dashboard
+        if self.offline:
+            # Offline nur Kennzahlen der virtuellen Uhr - Laufzeiten, RSS und Profiling-Ergebnisse
+            # hängen von der Wanduhr ab und würden gleiche Läufe unterscheidbar machen
+            return {
+                "performance": self.performance.snapshot(),
+                "logging": self.log_throttle.get_metrics(),
+                "pipeline": self.pipeline.get_metrics(timing=False),
+                "orders": self.orders.get_metrics()
+            }
+        return {
+            "time_sync": self.time_sync.get_metrics(),
+            "account_cache": self.account.get_metrics(),
+            "slippage": self.last_slippage_estimate,
+            "transport": self.api.get_transport_metrics(),
+            "market_cache": self.api.market_cache.get_metrics() if self.api.market_cache else None,
+            "performance": self.performance.snapshot(),
+            "logging": self.log_throttle.get_metrics(),
+            "profiler": self.profiler.status(),
+            "memory": dict(self.monitor.get_memory_metrics(), tracemalloc=self.memory.status()),
+            "pipeline": self.pipeline.get_metrics(),
+            "orders": self.orders.get_metrics(),
+            "scanner": self.scanner.get_metrics() if self.scanner else None
+        }
+    
+    def _log_performance(self):
+        # Performance- und Risikokennzahlen aus dem PerformanceTracker
+        perf = self.performance.snapshot()
+        win_rate = f"{perf['win_rate'] * 100:.1f}%" if perf['win_rate'] is not None else "-"
+        logger.info("Drawdown: %.2f%% (Max: %.2f%% / Limit: %.0f%%) | Tages-P&L: $%.2f",
+                    perf['drawdown_pct'], perf['max_drawdown_pct'], self.max_drawdown * 100, perf['daily_pnl'])
+        logger.info("Win Rate: %s | Profit Factor: %s | Sharpe: %s | Sortino: %s | Exposure: %.1f%%",
+                    win_rate, perf['profit_factor'], perf['sharpe'], perf['sortino'], perf['exposure'] * 100)
+        if perf['breach']:
+            logger.info("Risikogrenze: %s", perf['breach'])
+    
+    def _backoff_after_error(self):
+        # Exponentielles Backoff nach Fehlern statt fester Minute
+        delay = self.error_backoff
+        self.error_backoff = min(self.error_backoff * 2, self.error_backoff_max)
+        logger.info("Nächster Versuch in %.0fs", delay)
+        self.clock.sleep(delay)
 
     def _check_commands(self):
         # Check for new commands from dashboard
@@ -385,6 +1111,8 @@ class EnhancedLiveTradingBot:
             if os.path.exists(self.command_file):
                 with open(self.command_file, 'r') as f:
                     command_data = json.load(f)
+                    # Optionale Parameter, z.B. {"command": "PROFILE_START", "params": {"duration": 60}}
+                    self.command_params = command_data.get('params') or {}
                     return command_data.get('command', 'NONE')
             return 'NONE'
         except:
@@ -393,7 +1121,7 @@ class EnhancedLiveTradingBot:
     def _clear_command(self):
         """Clear command after processing"""
         with open(self.command_file, 'w') as f:
-            json.dump({"command": "NONE", "timestamp": time.time()}, f)
+            json.dump({"command": "NONE", "timestamp": self.clock.time()}, f)
 
     def handle_command(self, command: str):
         """Execute command from dashboard"""
@@ -418,23 +1146,101 @@ class EnhancedLiveTradingBot:
             self._update_status("EMERGENCY_STOP")
             self.running = False
             return True
+        elif command == "PROFILE_START":
+            params = self.command_params
+            logger.info("Received PROFILE_START command - %s", params or "Standardwerte")
+            self.profiler.start(mode=params.get('mode', 'sampling'),
+                                duration=params.get('duration', 60),
+                                interval=params.get('interval', 0.01))
+            self._update_status("PAUSED" if self.paused else "RUNNING")
+            return True
+        elif command == "PROFILE_STOP":
+            logger.info("Received PROFILE_STOP command")
+            self.profiler.stop()
+            self._update_status("PAUSED" if self.paused else "RUNNING")
+            return True
+        elif command in ("MEM_START", "MEM_SNAPSHOT", "MEM_STOP"):
+            logger.info("Received %s command", command)
+            if command == "MEM_START":
+                self.memory.start(frames=self.command_params.get('frames'))
+            elif command == "MEM_SNAPSHOT":
+                self.memory.snapshot(limit=int(self.command_params.get('limit', 15)))
+            else:
+                self.memory.stop()
+            self._update_status("PAUSED" if self.paused else "RUNNING")
+            return True
         return False
 
+    def _warm_price(self):
+        # Erster Preis als Verbindungstest (Pflicht vor dem Handel)
+        price_data = self.get_bybit_price()
+        if not price_data['success']:
+            raise RuntimeError(price_data['error'])
+        return price_data
+    
+    def _warm_bars(self):
+        # Indikator-Historie für die Bar Engine laden
+        self._update_bars()
+        return True
+    
+    def warm_up(self, timeout=30.0):
+        """
+        Bereitet alle Komponenten parallel vor
+        
+        Preis, Instrument-Daten und (für signierte Requests) die Zeitsynchronisation
+        sind Pflicht. Kontostand und Bar-Historie laden im Hintergrund weiter,
+        falls sie länger brauchen.
+        
+        Returns:
+            WarmupReport (report.ready = Handel kann beginnen)
+        """
+        tasks = [
+            WarmupTask('price', self._warm_price),
+            WarmupTask('instruments', self.instruments.load)
+        ]
+        if not self.offline:
+            tasks.append(WarmupTask('connection', self.api.warm_up, required=False))
+            if self.api_key:
+                tasks.append(WarmupTask('time_sync', self.time_sync.sync))
+                if self.use_account_balance:
+                    tasks.append(WarmupTask('balance', self.account.refresh, required=False))
+        if self.use_bar_engine:
+            tasks.append(WarmupTask('bars', self._warm_bars, required=False))
+        
+        report = run_warmup(tasks, timeout=timeout)
+        summary = ", ".join(f"{name} {result['duration_ms']}ms" for name, result in report.results.items()
+                            if result['ok'])
+        logger.info("Warmup in %sms (bereit: %s) | %s", report.elapsed_ms, report.ready, summary)
+        if report.pending:
+            logger.info("Im Hintergrund: %s", ', '.join(report.pending))
+        return report
+    
     def start_live_trading(self):
         """Startet Live Trading (continuous until stopped)"""
         logger.info("STARTING ENHANCED LIVE TRADING BOT - MAINNET")
         logger.info("=" * 50)
         logger.info("Mode: MAINNET (Echte Trades)")
         logger.info("Strategy: Enhanced Smart Money")
-        logger.info(f"Startkapital: ${self.start_balance:.2f}")
+        logger.info("Startkapital: $%.2f", self.start_balance)
         logger.info("=" * 50)
         
         self.running = True
         self.paused = False
-        self.start_time = datetime.now()
+        self.start_time = self.clock.now()
         self._update_status("RUNNING")
+        if not self.offline:
+            self.time_sync.start()
+            self._start_private_stream()
+            self._start_trade_stream()
+            self.instruments.start()
+            if self.scanner:
+                self.scanner.start()
         
-        last_status_log = datetime.now()
+        self.last_status_log = self.clock.now()
+        threaded = self.pipeline_mode == 'threaded'
+        if threaded:
+            self.pipeline.start()
+        logger.info("Pipeline: %s | Abfrageintervall: %.0fs", self.pipeline_mode, self.poll_interval)
         
         try:
             while self.running and self.monitor.status_check() == "RUNNING":
@@ -447,113 +1253,167 @@ class EnhancedLiveTradingBot:
                             if not self.running:
                                 break
                     
+                    # Zeitlich begrenztes Profiling-Fenster beenden
+                    if self.profiler.poll():
+                        self._update_status("PAUSED" if self.paused else "RUNNING")
+                    
+                    # RSS-Verlauf (Messung höchstens einmal je MEMORY_SAMPLE_INTERVAL)
+                    self.monitor.record_memory()
+                    
+                    # Heartbeat für den Supervisor
+                    self._heartbeat()
+                    
                     # Skip trading if paused
                     if self.paused:
-                        logger.info("Trading paused - skipping trade execution")
-                        self.monitor.log_events("INFO", "Trading pausiert")
-                        time.sleep(10)
+                        self.log_throttle.log(logging.INFO, "Trading paused - skipping trade execution")
+                        self.clock.sleep(10)
                         continue
                     
-                    # Hole aktuelle Marktdaten
+                    # Ingest: aktuelle Marktdaten holen und an die Strategie übergeben
                     price_data = self.get_bybit_price()
                     
                     if price_data['success']:
-                        current_price = price_data['price']
-                        
-                        # Market Regime Detection
-                        regime_info = self.detect_market_regime(price_data)
-                        
-                        # Log Market Info
-                        market_info = f"BTC Price: ${current_price:.2f} | 24h Change: {price_data['change']:+.2f}% | Regime: {regime_info['regime']} (Confidence: {regime_info['confidence']:.2f})"
-                        logger.info(market_info)
-                        self.monitor.log_events("MARKET", market_info)
-                        try:
-                            while self.running:
-                                # Check for commands from dashboard
-                                command = self._check_commands()
-                                if command != "NONE":
-                                    if self.handle_command(command):
-                                        self._clear_command()
-                                        if not self.running:
-                                            break
-                                
-                                # Skip trading if paused
-                                if self.paused:
-                                    logger.info("Trading paused - skipping trade execution")
-                                    time.sleep(10)
-                                    continue
-                                
-                                try:
-                                    # Hole aktuelle Marktdaten
-                                    price_data = self.get_bybit_price()
-                                    
-                                    if price_data['success']:
-                                        current_price = price_data['price']
-                                        
-                                        # Market Regime Detection
-                                        regime_info = self.detect_market_regime(price_data)
-                                        
-                                        # Log Market Info
-                                        logger.info(f"BTC Price: ${current_price:.2f} | 24h Change: {price_data['change']:+.2f}%")
-                                        logger.info(f"Market Regime: {regime_info['regime']} (Confidence: {regime_info['confidence']:.2f})")
-                                        
-                                        # Trading Signal generieren
-                                        signal_data = self.generate_trading_signal(price_data, regime_info)
-                                        
-                                        # Trade ausführen
-                                        self.execute_trade(signal_data, current_price)
-                                        self.monitor.log_events("TRADE", f"Signal ausgeführt: {signal_data['signal']}")
-                                        
-                                        # Status loggen alle 5 Minuten
-                                        if datetime.now() - last_status_log > timedelta(minutes=5):
-                                            self.log_status()
-                                            last_status_log = datetime.now()
-                                    
-                                    else:
-                                        error_msg = f"API Error: {price_data['error']}"
-                                        logger.warning(error_msg)
-                                        self.monitor.log_events("WARNING", error_msg)
-                                    
-                                    # Warte 30 Sekunden bis zum nächsten Check
-                                    logger.info("Waiting 30 seconds for next analysis...")
-                                    time.sleep(30)
-                                    
-                                except Exception as e:
-                                    error_msg = f"Error in trading loop: {e}"
-                                    logger.error(error_msg)
-                                    self.monitor.log_events("ERROR", error_msg)
-                                    time.sleep(60)  # Warte 1 Minute bei Fehlern
-                                    
-                        except KeyboardInterrupt:
-                            logger.info("Trading stopped by user")
-                        except Exception as e:
-                            logger.error(f"Critical error: {e}")
-                        finally:
-                            self.generate_final_report()
-                            self.monitor.log_events("INFO", "Bot sicher gestoppt")
-                        if datetime.now() - last_status_log > timedelta(minutes=5):
-                            self.log_status()
-                            last_status_log = datetime.now()
+                        price_data['ts'] = self.clock.time()
+                        if threaded:
+                            # Noch nicht verarbeitete Ticks werden durch den neuesten ersetzt
+                            self.tick_queue.put('BTCUSDT', price_data)
+                        else:
+                            self._run_sequential(price_data)
                     
                     else:
-                        logger.warning(f"API Error: {price_data['error']}")
+                        error_msg = f"API Error: {price_data['error']}"
+                        if self.log_throttle.log(logging.WARNING, "API Error: %s", price_data['error'],
+                                                 key='price_error', interval=60):
+                            self.monitor.log_events("WARNING", error_msg)
                     
-                    # Warte 30 Sekunden bis zum nächsten Check
-                    logger.info("Waiting 30 seconds for next analysis...")
-                    time.sleep(30)
+                    # Erfolgreicher Durchlauf setzt das Fehler-Backoff zurück
+                    self.error_backoff = self.error_backoff_min
                     
-                except KeyboardInterrupt:
-                    logger.info("Trading stopped by user")
-                    break
+                    # Warte bis zum nächsten Check
+                    logger.debug("Waiting %.0f seconds for next analysis...", self.poll_interval)
+                    self.clock.sleep(self.poll_interval)
+                
                 except Exception as e:
-                    logger.error(f"Error in trading loop: {e}")
-                    time.sleep(60)  # Warte 1 Minute bei Fehlern
+                    error_msg = f"Error in trading loop: {e}"
+                    logger.error(error_msg)
+                    self.monitor.log_events("ERROR", error_msg)
+                    self._backoff_after_error()
         
+        except KeyboardInterrupt:
+            logger.info("Trading stopped by user")
         except Exception as e:
-            logger.error(f"Critical error: {e}")
+            logger.error("Critical error: %s", e)
         
         finally:
+            self.pipeline.stop()
+            self._flush_status()
+            self.profiler.stop()
+            self.memory.stop()
+            if self.private_stream:
+                self.private_stream.stop()
+            if self.trade_stream:
+                self.trade_stream.stop()
+            if self.recorder:
+                self.recorder.close()
+            self.instruments.stop()
+            if self.scanner:
+                self.scanner.stop()
+            self.time_sync.stop()
+            self._save_state()
             self.generate_final_report()
+            self.monitor.log_events("INFO", "Bot sicher gestoppt")
+    
+    def _build_pipeline(self, order_queue_size, telemetry_queue_size):
+        # Stufen und Queues der Handelsschleife (Threads startet erst start_live_trading)
+        pipeline = Pipeline()
+        self.tick_queue = pipeline.add_queue(ConflatingQueue('ticks'))
+        self.order_queue = pipeline.add_queue(BoundedQueue('orders', order_queue_size))
+        self.telemetry_queue = pipeline.add_queue(BoundedQueue('telemetry', telemetry_queue_size))
+        # Orders warten höchstens ein Abfrageintervall auf die Ausführung (Backpressure)
+        self.strategy_stage = pipeline.add_stage(Stage(
+            'strategy', self.tick_queue, self._strategy_step,
+            emit=lambda decision: self._forward(self.order_queue, decision, self.poll_interval)))
+        # Telemetrie darf die Ausführung nie aufhalten - bei voller Queue wird verworfen
+        self.execution_stage = pipeline.add_stage(Stage(
+            'execution', self.order_queue, self._execution_step,
+            emit=lambda event: self._forward(self.telemetry_queue, event, 0)))
+        self.telemetry_stage = pipeline.add_stage(Stage('telemetry', self.telemetry_queue, self._telemetry_step))
+        return pipeline
+    
+    def _forward(self, queue, item, timeout):
+        # Reicht ein Ergebnis an die nächste Stufe weiter; verworfene Einträge werden gedrosselt geloggt
+        if not queue.put(item, timeout=timeout):
+            self.log_throttle.log(logging.WARNING, "Pipeline-Queue %s voll - Eintrag verworfen (%d gesamt)",
+                                  queue.name, queue.stats['dropped'], key=f"pipeline_drop_{queue.name}", interval=60)
+    
+    def _run_sequential(self, price_data):
+        # Alle Stufen nacheinander im aufrufenden Thread (Simulation, PIPELINE_MODE=sequential)
+        decision = self.strategy_stage.process(price_data)
+        if decision is None:
+            return
+        event = self.execution_stage.process(decision)
+        if event is not None:
+            self.telemetry_stage.process(event)
+    
+    def _strategy_step(self, price_data):
+        # Strategie: Bars, Regime und Signal (liest die Position nur)
+        if self.use_bar_engine:
+            # Höhere Timeframes aktualisieren (inkrementell)
+            self._update_bars()
+            price_data['timeframes'] = self.get_timeframe_view()
+        
+        # Laufender Bar aus dem Trade-Stream (ohne Kline-Polling)
+        if self.trade_stream and self.use_trade_stream:
+            self.candles.flush(self.clock.time_ms())
+            live_bar = self.candles.get_live_bar('BTCUSDT')
+            price_data['live_bar'] = live_bar.as_dict() if live_bar else None
+        
+        # Market Regime Detection
+        regime_info = self.detect_market_regime(price_data)
+        
+        # Log Market Info (nur jeder LOG_MARKET_EVERY-te Zyklus)
+        self.log_throttle.sample(
+            logging.INFO, self.log_market_every,
+            "BTC Price: $%.2f | 24h Change: %+.2f%% | Regime: %s (Confidence: %.2f)",
+            price_data['price'], price_data['change'], regime_info['regime'], regime_info['confidence'])
+        
+        # Trading Signal generieren
+        signal_data = self.generate_trading_signal(price_data, regime_info)
+        return {'signal': signal_data, 'price': price_data['price'], 'ts': price_data['ts']}
+    
+    def _execution_step(self, decision):
+        # Ausführung: einziger Schreiber von Position und Kontostand
+        current_price = decision['price']
+        signal_data = decision['signal']
+        
+        # Zwischen zwei Abfragen ausgelöste Stop-Order übernehmen, bevor die Position bewertet wird
+        self._check_stop_order()
+        
+        # Equity bewerten und Risikogrenzen prüfen
+        self._mark_to_market(current_price)
+        
+        # Signale, die länger als zwei Abfrageintervalle gewartet haben, nicht mehr ausführen
+        age = self.clock.time() - decision['ts']
+        if signal_data['signal'] in ('BUY', 'SELL') and age > 2 * self.poll_interval:
+            logger.warning("Signal %s verworfen - %.0fs alt", signal_data['signal'], age)
+            return {'signal': 'HOLD'}
+        
+        # Trade ausführen
+        self.execute_trade(signal_data, current_price)
+        return {'signal': signal_data['signal']}
+    
+    def _telemetry_step(self, event):
+        # Telemetrie: Monitor-Log, Status-Datei und periodischer Status
+        if event['signal'] != 'HOLD':
+            self.monitor.log_events("TRADE", f"Signal ausgeführt: {event['signal']}")
+        
+        # Status-Datei mit aktuellen Kennzahlen (Clock-Skew etc.) aktualisieren
+        self._update_status("PAUSED" if self.paused else "RUNNING", periodic=event['signal'] == 'HOLD')
+        
+        # Status loggen alle 5 Minuten
+        if self.clock.now() - self.last_status_log > timedelta(minutes=5):
+            self.log_status()
+            self.last_status_log = self.clock.now()
     
     def generate_final_report(self):
         """Generiert finalen Trading Report"""
@@ -562,24 +1422,25 @@ class EnhancedLiveTradingBot:
         logger.info("=" * 60)
         
         if hasattr(self, 'start_time'):
-            total_runtime = datetime.now() - self.start_time
+            total_runtime = self.clock.now() - self.start_time
             total_pnl = self.current_balance - self.start_balance
             
-            logger.info(f"Total Runtime: {total_runtime}")
-            logger.info(f"Initial Balance: ${self.start_balance:.2f}")
-            logger.info(f"Final Balance: ${self.current_balance:.2f}")
-            logger.info(f"Total P&L: ${total_pnl:.2f} ({total_pnl/self.start_balance*100:.2f}%)")
-            logger.info(f"Total Trades: {self.trade_count}")
+            logger.info("Total Runtime: %s", total_runtime)
+            logger.info("Initial Balance: $%.2f", self.start_balance)
+            logger.info("Final Balance: $%.2f", self.current_balance)
+            logger.info("Total P&L: $%.2f (%.2f%%)", total_pnl, total_pnl/self.start_balance*100)
+            logger.info("Total Trades: %s", self.trade_count)
+            self._log_performance()
             
             if self.trades_history:
                 logger.info("\nLast 5 Trades:")
-                for trade in self.trades_history[-5:]:
+                for trade in list(self.trades_history)[-5:]:
                     timestamp = trade['timestamp'].strftime('%H:%M:%S')
                     trade_type = trade['type']
                     price = trade['price']
                     reason = trade['reason']
                     pnl = trade.get('pnl', 0)
-                    logger.info(f"  {timestamp} - {trade_type} @ ${price:.2f} | P&L: ${pnl:.2f} | {reason}")
+                    logger.info("  %s - %s @ $%.2f | P&L: $%.2f | %s", timestamp, trade_type, price, pnl, reason)
         
         logger.info("=" * 60)
         logger.info("Enhanced Smart Money Bot session completed!")
@@ -588,9 +1449,37 @@ class EnhancedLiveTradingBot:
         """Stoppt Trading"""
         logger.info("Stopping trading...")
         self.running = False
+        if self.private_stream:
+            self.private_stream.stop()
 
 def main():
     """Hauptfunktion - Startet Enhanced Live Trading Bot"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Enhanced Smart Money Live Trading Bot")
+    parser.add_argument('--supervise', action='store_true',
+                        help="Bot als überwachten Kindprozess starten (Heartbeat, Neustart mit Backoff)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Position und Kontostand aus dem State-Snapshot übernehmen")
+    args = parser.parse_args()
+    
+    # Environment laden
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    if args.supervise:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        sys.exit(supervise(os.path.abspath(__file__), os.path.abspath("bot_status.json"), resume=args.resume))
+    
+    # Logging konfigurieren: Datei-/Konsolen-I/O in einem eigenen Thread hinter einer Queue,
+    # optional zusätzlich strukturiert als JSON-Lines
+    import atexit
+    listener = start_queue_logging(
+        [logging.FileHandler('live_trading_bot.log'), logging.StreamHandler()],
+        level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO),
+        json_file=os.getenv('LOG_JSON_FILE') or None
+    )
+    atexit.register(listener.stop)
+    
     print("=" * 60)
     print("ENHANCED SMART MONEY LIVE TRADING BOT - MAINNET")
     print("=" * 60)
@@ -599,20 +1488,25 @@ def main():
     
     # Bot ZUERST initialisieren
     bot = EnhancedLiveTradingBot()
+    if args.resume:
+        bot.resume_from_state()
     
     # DANN das Startkapital anzeigen
-    print(f"Startkapital: ${bot.start_balance:.2f} | Risk: 2% pro Trade | Max Drawdown: 20%")
+    print(f"Startkapital: ${bot.start_balance:.2f} | Max Drawdown: {bot.max_drawdown * 100:.0f}% | "
+          f"Tagesverlust-Limit: {bot.daily_risk_limit:.1f}%")
     print("=" * 60)
     
-    # Teste API-Verbindung
+    # Teste API-Verbindung und wärme alle Komponenten parallel auf
     logger.info("Testing Bybit API connection...")
-    price_test = bot.get_bybit_price()
+    report = bot.warm_up()
     
-    if price_test['success']:
-        logger.info(f"[SUCCESS] Connected to Bybit Mainnet | BTC Price: ${price_test['price']:.2f}")
+    if report.ready:
+        logger.info("[SUCCESS] Connected to Bybit Mainnet | BTC Price: $%.2f", report.result('price')['price'])
     else:
-        logger.error(f"[FAILED] Cannot connect to Bybit API - {price_test['error']}")
-        return
+        errors = "; ".join(f"{name}: {report.results[name]['error'] or 'Timeout'}"
+                           for name in report.required if not report.results[name]['ok'])
+        logger.error("[FAILED] Cannot connect to Bybit API - %s", errors)
+        sys.exit(1)
     
     logger.info("Starting continuous live trading session...")
     
@@ -624,7 +1518,12 @@ def main():
         print("\nTrading stopped by user (Ctrl+C)")
         bot.stop_trading()
     except Exception as e:
-        logger.error(f"Critical error: {e}")
+        logger.error("Critical error: %s", e)
+        sys.exit(1)
+    
+    # Ohne STOP-Befehl beendet: Exit-Code 1, damit der Supervisor neu startet
+    if bot.running:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+"""
+Account-State-Cache für die Bybit API.
+
+Hält Wallet-Kontostand und Coin-Bestände im Speicher, damit Positionsgrößen
+ohne signierten Request pro Entscheidung berechnet werden können. Der Cache
+wird nach Ablauf der TTL, sofort nach eigenen Fills und bei Wallet-Updates
+aus dem Private-Stream aktualisiert. Gleichzeitige Aktualisierungen werden
+zu einem einzigen Request zusammengefasst.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from exchange.market_cache import SingleFlight
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+
+class AccountStateCache:
+    """
+    Cache für Wallet- und Account-Daten vor einer BybitAPI-Instanz.
+    """
+
+    def __init__(self, api, ttl: float = 15.0):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            api: BybitAPI-Instanz (benötigt get_wallet_balance())
+            ttl: Maximales Alter der Daten in Sekunden
+        """
+        self.api = api
+        self.ttl = ttl
+        self._wallet: Dict = {}
+        self._coins: Dict[str, Dict] = {}
+        self._updated_at = 0.0
+        self._last_error = 0.0
+        self._stale = True
+        self._flight = SingleFlight()
+        self.stats = {'hits': 0, 'refreshes': 0, 'coalesced': 0, 'errors': 0}
+
+    def get_wallet(self) -> Dict:
+        """
+        Gibt den Wallet-Snapshot zurück und aktualisiert ihn bei Bedarf.
+
+        Returns:
+            Wallet-Informationen wie von BybitAPI.get_wallet_balance()
+        """
+        if self._is_fresh() or self._in_retry_backoff():
+            self.stats['hits'] += 1
+            return self._wallet
+        self.refresh()
+        return self._wallet
+
+    def get_coin(self, coin: str = 'USDT') -> Optional[Dict]:
+        """Gibt den Wallet-Eintrag eines Coins zurück"""
+        self.get_wallet()
+        return self._coins.get(coin)
+
+    def get_balance(self, coin: str = 'USDT') -> Optional[float]:
+        """
+        Gibt den Gesamtbestand eines Coins zurück.
+
+        Returns:
+            walletBalance als float oder None, wenn unbekannt
+        """
+        entry = self.get_coin(coin)
+        if not entry:
+            return None
+        return _to_float(entry.get('walletBalance'))
+
+    def get_available_balance(self, coin: str = 'USDT') -> Optional[float]:
+        """
+        Gibt den frei verfügbaren Bestand eines Coins zurück.
+
+        Returns:
+            Verfügbarer Bestand als float oder None, wenn unbekannt
+        """
+        entry = self.get_coin(coin)
+        if not entry:
+            return None
+        for field in ('availableToWithdraw', 'free'):
+            value = _to_float(entry.get(field))
+            if value is not None:
+                return value
+        balance = _to_float(entry.get('walletBalance'))
+        if balance is None:
+            return None
+        return balance - (_to_float(entry.get('locked')) or 0.0)
+
+    def get_positions(self) -> Dict[str, float]:
+        """
+        Gibt alle Coin-Bestände ungleich Null zurück.
+
+        Returns:
+            Dictionary Coin -> Bestand
+        """
+        self.get_wallet()
+        positions = {}
+        for coin, entry in self._coins.items():
+            balance = _to_float(entry.get('walletBalance'))
+            if balance:
+                positions[coin] = balance
+        return positions
+
+    def invalidate(self, refresh: bool = False):
+        """
+        Markiert die Daten als veraltet, z.B. nach eigenen Fills.
+
+        Args:
+            refresh: Sofort im Hintergrund neu laden
+        """
+        self._stale = True
+        if refresh:
+            threading.Thread(target=self.refresh, name="AccountStateRefresh", daemon=True).start()
+
+    def refresh(self) -> Dict:
+        """
+        Lädt den Wallet-Kontostand neu.
+
+        Läuft bereits eine Aktualisierung, wird auf deren Ergebnis gewartet
+        statt einen weiteren Request zu senden.
+
+        Returns:
+            Aktueller Wallet-Snapshot
+        """
+        _, shared = self._flight.do('wallet', self._load_wallet)
+        if shared:
+            self.stats['coalesced'] += 1
+        return self._wallet
+
+    def attach_stream(self, store):
+        """
+        Verbindet den Cache mit einem OrderStateStore des Private-Streams.
+
+        Wallet-Updates werden direkt übernommen, Ausführungen lösen eine
+        sofortige Aktualisierung aus.
+
+        Args:
+            store: exchange.bybit_ws.OrderStateStore
+        """
+        store.add_listener('wallet', self._apply_wallet)
+        store.add_listener('execution', lambda row: self.invalidate(refresh=True))
+
+    def get_metrics(self) -> Dict:
+        """Gibt Cache-Kennzahlen zurück"""
+        metrics = dict(self.stats)
+        metrics['age'] = round(time.time() - self._updated_at, 3) if self._updated_at else None
+        return metrics
+    
+    def _load_wallet(self):
+        self.stats['refreshes'] += 1
+        wallet = self.api.get_wallet_balance()
+        if wallet:
+            self._apply_wallet(wallet)
+        else:
+            self.stats['errors'] += 1
+            self._last_error = time.time()
+            logger.warning("Wallet-Aktualisierung fehlgeschlagen - verwende letzten Stand")
+
+    def _is_fresh(self) -> bool:
+        return not self._stale and time.time() - self._updated_at < self.ttl
+
+    def _in_retry_backoff(self) -> bool:
+        # Nach fehlgeschlagenen Aktualisierungen nicht bei jedem Aufruf neu anfragen
+        return time.time() - self._last_error < min(self.ttl, 5.0)
+
+    def _apply_wallet(self, wallet: Dict):
+        coins = {entry['coin']: entry for entry in wallet.get('coin', []) if entry.get('coin')}
+        # Stream-Updates enthalten ggf. nur geänderte Coins
+        merged = dict(self._coins)
+        merged.update(coins)
+        self._coins = merged
+        self._wallet = dict(wallet, coin=list(merged.values()))
+        self._updated_at = time.time()
+        self._stale = False
+
+
+def _to_float(value) -> Optional[float]:
+    # Bybit liefert Beträge als Strings, teilweise auch leer
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -10,13 +10,20 @@ import hashlib
 import time
 import json
 import logging
-import requests
+import threading
 from typing import Dict, List, Optional, Union, Any
 import urllib.parse
 from datetime import datetime
 
+from core.log_utils import LogThrottle
+from exchange.market_cache import MarketDataCache
+from exchange.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, hedged_call
+from exchange.order_registry import OrderRegistry
+
 # Konfiguriere Logging
 logger = logging.getLogger(__name__)
+# Wiederkehrende Fehlermeldungen (Circuit offen, API-Fehler) höchstens alle 30s
+log_throttle = LogThrottle(logger, interval=30.0)
 
 class BybitAPI:
     """
@@ -26,8 +33,17 @@ class BybitAPI:
     einschließlich Marktdatenabruf und Handelsausführung.
     """
     
+    # Endpoints ohne Hedge (Zeitsynchronisation braucht die echte RTT)
+    NO_HEDGE_ENDPOINTS = ('/v5/market/time',)
+    # Schreibende Order-Endpoints mit eigenem Timeout (order_timeout)
+    ORDER_ENDPOINTS = ('/v5/order/create', '/v5/order/amend', '/v5/order/cancel')
+    
     def __init__(self, api_key: str = None, api_secret: str = None, 
-               testnet: bool = True):
+               testnet: bool = True, request_timeout: float = 10.0,
+               connect_timeout: float = 3.0, hedge: bool = True,
+               breaker_threshold: int = 5, breaker_reset: float = 30.0,
+               market_cache: Optional[MarketDataCache] = None,
+               order_timeout: float = None):
         """
         Initialisiere die Bybit API-Integration.
         
@@ -35,6 +51,16 @@ class BybitAPI:
             api_key: API-Schlüssel für Bybit
             api_secret: API-Secret für Bybit
             testnet: Ob Testnet oder Mainnet verwendet werden soll
+            request_timeout: Lese-Timeout je Request in Sekunden
+            connect_timeout: Verbindungs-Timeout in Sekunden
+            hedge: GET-Requests nach der p95-Latenz ein zweites Mal senden
+            breaker_threshold: Aufeinanderfolgende Fehler, nach denen ein Endpoint gesperrt wird
+            breaker_reset: Sperrdauer eines Endpoints in Sekunden bis zum Probe-Request
+            market_cache: Cache für öffentliche Marktdaten (Standard: MarketDataCache
+                          mit Standard-TTLs; False deaktiviert den Cache)
+            order_timeout: Lese-Timeout für Order-Endpoints in Sekunden (Standard:
+                           request_timeout); Orders tragen eine orderLinkId und werden
+                           nach einem Timeout über das OrderRegistry aufgelöst
         """
         self.api_key = api_key
         self.api_secret = api_secret
@@ -49,8 +75,133 @@ class BybitAPI:
             # MAINNET URLs (für echte Trades)
             self.base_url = "https://api.bybit.com"
             self.ws_url = "wss://stream.bybit.com"
+        
+        # Optionale Serverzeit-Synchronisation (exchange.clock_sync.ClockSync)
+        self.time_sync = None
+        
+        # HTTP-Session mit Keep-Alive (wird erst beim ersten Request erzeugt)
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Tail-Latenz: Timeouts, Hedging und Circuit Breaker je Endpoint
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.order_timeout = order_timeout
+        self.hedge = hedge
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self._breakers = {}
+        self._latency = {}
+        self._hedge_stats = {}
+        self._transport_lock = threading.Lock()
+        self._hedge_executor = None
+        
+        # Öffentliche Marktdaten: TTL-Cache mit Request-Coalescing
+        if market_cache is False:
+            self.market_cache = None
+        else:
+            self.market_cache = market_cache or MarketDataCache()
+        
+        # In-Flight-Orders (orderLinkId) für wiederholbare Orderplatzierung
+        self.orders = OrderRegistry()
             
-        logger.info(f"BybitAPI initialisiert. Testnet: {testnet}")
+        logger.info("BybitAPI initialisiert. Testnet: %s", testnet)
+    
+    @property
+    def session(self):
+        """
+        Gemeinsame requests.Session mit Connection-Pool.
+        
+        requests wird erst hier importiert, damit der Import des Moduls
+        den Bot-Start nicht verzögert.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    self._session = requests.Session()
+        return self._session
+    
+    @property
+    def timeout(self):
+        """(connect, read)-Timeout für requests"""
+        return (self.connect_timeout, self.request_timeout)
+    
+    def timeout_for(self, endpoint: str):
+        """(connect, read)-Timeout eines Endpoints (kurz für Order-Endpoints)"""
+        if self.order_timeout and endpoint in self.ORDER_ENDPOINTS:
+            return (self.connect_timeout, self.order_timeout)
+        return self.timeout
+    
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        Circuit Breaker eines Endpoints (wird bei Bedarf angelegt).
+        
+        Args:
+            endpoint: API-Endpunkt, z.B. "/v5/order/create"
+        """
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._transport_lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = CircuitBreaker(endpoint, self.breaker_threshold, self.breaker_reset)
+                    self._breakers[endpoint] = breaker
+                    self._latency[endpoint] = LatencyTracker()
+                    self._hedge_stats[endpoint] = {'hedges': 0, 'hedge_wins': 0}
+        return breaker
+    
+    def record_latency(self, endpoint: str, seconds: float):
+        """Nimmt die Antwortzeit eines Requests auf"""
+        self.breaker(endpoint)
+        self._latency[endpoint].record(seconds)
+    
+    def hedge_delay(self, endpoint: str) -> float:
+        """
+        Wartezeit bis zum Hedge-Request.
+        
+        Die p95-Latenz des Endpoints, sobald genug Messungen vorliegen,
+        begrenzt auf 50 ms bis zum Lese-Timeout.
+        """
+        tracker = self._latency.get(endpoint)
+        if tracker is None or len(tracker) < 20:
+            return min(0.5, self.request_timeout)
+        return min(max(tracker.percentile(95), 0.05), self.request_timeout)
+    
+    def _get_hedge_executor(self):
+        if self._hedge_executor is None:
+            with self._transport_lock:
+                if self._hedge_executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bybit-http')
+        return self._hedge_executor
+    
+    def get_transport_metrics(self) -> Dict:
+        """
+        Latenz-, Hedge- und Breaker-Kennzahlen je Endpoint.
+        
+        Returns:
+            Dictionary {endpoint: {state, failures, p50_ms, p95_ms, p99_ms, hedges, ...}}
+        """
+        with self._transport_lock:
+            endpoints = list(self._breakers)
+        metrics = {}
+        for endpoint in endpoints:
+            metrics[endpoint] = {
+                **self._breakers[endpoint].get_metrics(),
+                **self._latency[endpoint].get_metrics(),
+                **self._hedge_stats[endpoint]
+            }
+        return metrics
+    
+    def warm_up(self) -> bool:
+        """
+        Baut die TCP-/TLS-Verbindung zur API vorab auf.
+        
+        Returns:
+            True, wenn die API erreichbar war
+        """
+        return self.get_server_time().get('retCode') == 0
     
     def _generate_signature(self, params: Dict) -> str:
         """
@@ -89,9 +240,14 @@ class BybitAPI:
             return params
         
         # Timestamp und API-Schlüssel hinzufügen
+        # Mit Zeitsynchronisation: korrigierter Timestamp und RTT-abhängiges recv_window
         params['api_key'] = self.api_key
-        params['timestamp'] = str(int(time.time() * 1000))
-        params['recv_window'] = '5000'
+        if self.time_sync:
+            params['timestamp'] = str(self.time_sync.timestamp_ms())
+            params['recv_window'] = str(self.time_sync.recv_window_ms())
+        else:
+            params['timestamp'] = str(int(time.time() * 1000))
+            params['recv_window'] = '5000'
         
         # Signatur generieren und hinzufügen
         params['sign'] = self._generate_signature(params)
@@ -115,6 +271,19 @@ class BybitAPI:
         # Parameter initialisieren
         params = params or {}
         
+        # Öffentliche Marktdaten aus dem Cache; gleichzeitige identische
+        # Anfragen teilen sich einen Request
+        if (not auth and method.upper() == 'GET' and self.market_cache
+                and self.market_cache.cacheable(endpoint)):
+            return self.market_cache.fetch(
+                endpoint, params, lambda: self._send_request(method, endpoint, dict(params), auth))
+        return self._send_request(method, endpoint, params, auth)
+    
+    def _send_request(self, method: str, endpoint: str, params: Dict,
+                      auth: bool = False) -> Dict:
+        """
+        Sendet eine HTTP-Anfrage ohne Cache (Timeout, Hedge, Circuit Breaker).
+        """
         # URL zusammensetzen
         url = f"{self.base_url}{endpoint}"
         
@@ -122,41 +291,76 @@ class BybitAPI:
         if auth:
             params = self._add_auth_params(params)
         
-        # Debug-Informationen
-        logger.debug(f"Sending {method} request to {url}")
-        logger.debug(f"Params: {params}")
+        # Debug-Informationen (nur wenn DEBUG aktiv ist)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Sending %s request to %s", method, url)
+            logger.debug("Params: %s", params)
+        
+        method = method.upper()
+        if method not in ('GET', 'POST'):
+            logger.error("Nicht unterstützte HTTP-Methode: %s", method)
+            return {'error': f"Unsupported method: {method}"}
+        
+        # Gesperrter Endpoint: sofort abweisen statt bis zum Timeout zu warten
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            log_throttle.log(logging.WARNING, "Circuit offen für %s - Request übersprungen", endpoint,
+                             key=('circuit', endpoint))
+            return {'error': f"Circuit open: {endpoint}"}
+        
+        def send():
+            started = time.perf_counter()
+            if method == 'GET':
+                result = self.session.get(url, params=params, timeout=self.timeout)
+            else:
+                result = self.session.post(url, json=params, timeout=self.timeout_for(endpoint))
+            self.record_latency(endpoint, time.perf_counter() - started)
+            return result
         
         try:
-            # Anfrage senden
-            if method.upper() == 'GET':
-                response = requests.get(url, params=params)
-            elif method.upper() == 'POST':
-                response = requests.post(url, json=params)
+            # Anfrage senden (idempotente Reads mit Hedge gegen Ausreißer)
+            # Im HALF_OPEN-Zustand kein Hedge - der Endpoint bekommt genau einen Probe-Request
+            if (method == 'GET' and self.hedge and endpoint not in self.NO_HEDGE_ENDPOINTS
+                    and breaker.closed):
+                response = hedged_call(send, self.hedge_delay(endpoint), self._get_hedge_executor(),
+                                       self._hedge_stats[endpoint])
             else:
-                logger.error(f"Nicht unterstützte HTTP-Methode: {method}")
-                return {'error': f"Unsupported method: {method}"}
+                response = send()
+            
+            # Überlastung und Serverfehler zählen für den Breaker, Client-Fehler nicht
+            if response.status_code >= 500 or response.status_code == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
             
             # Debug-Informationen
-            logger.debug(f"Response status: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
+            if debug:
+                logger.debug("Response status: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
             
             # Antwort verarbeiten
             if response.status_code == 200:
                 data = response.json()
                 
                 # API-Struktur überprüfen
-                logger.debug(f"Response keys: {data.keys()}")
+                if debug:
+                    logger.debug("Response keys: %s", list(data.keys()))
                 
                 # Fehlerbehandlung
                 if data.get('retCode') != 0:
-                    logger.warning(f"API-Fehler: {data.get('retMsg')}")
+                    log_throttle.log(logging.WARNING, "API-Fehler %s: %s", endpoint, data.get('retMsg'),
+                                     key=('api', endpoint, data.get('retCode')))
                 
                 return data
             else:
-                logger.error(f"HTTP-Fehler: {response.status_code}, {response.text}")
+                log_throttle.log(logging.ERROR, "HTTP-Fehler %s: %s, %s", endpoint, response.status_code,
+                                 response.text, key=('http', endpoint, response.status_code))
                 return {'error': f"HTTP Error: {response.status_code}"}
         except Exception as e:
-            logger.error(f"Fehler bei API-Anfrage: {str(e)}")
+            breaker.record_failure()
+            log_throttle.log(logging.ERROR, "Fehler bei API-Anfrage %s: %s", endpoint, e,
+                             key=('exception', endpoint, type(e).__name__))
             return {'error': str(e)}
     
     def get_historical_data(self, symbol: str, interval: str, 
@@ -206,7 +410,7 @@ class BybitAPI:
             'limit': str(limit)
         }
         
-        logger.info(f"Anfrageparameter für historische Daten - Symbol: {symbol}, Intervall: {interval} (gemappt zu: {mapped_interval}), Limit: {limit}")
+        logger.debug("Anfrageparameter für historische Daten - Symbol: %s, Intervall: %s (gemappt zu: %s), Limit: %s", symbol, interval, mapped_interval, limit)
         
         # Zeitparameter hinzufügen, wenn vorhanden
         # Bybit erwartet Timestamps in Millisekunden, wir bekommen sie bereits in Millisekunden
@@ -216,19 +420,15 @@ class BybitAPI:
             params['end'] = str(int(end_time))
         
         # API-Anfrage senden
-        logger.info(f"Sending GET request to {self.base_url}{endpoint}")
-        logger.info(f"Params: {params}")
         response = self._make_request('GET', endpoint, params)
         
-        # API-Antwortstruktur überprüfen
-        if response:
-            logger.info(f"API Response: {response}")
-            if isinstance(response, dict):
-                logger.info(f"API Response structure: {response.keys()}")
+        # API-Antwortstruktur überprüfen (die komplette Antwort nur im DEBUG-Level)
+        if response and isinstance(response, dict) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API Response structure: %s", list(response.keys()))
             
         # Fehlerbehandlung
         if response and 'error' in response:
-            logger.error(f"Fehler beim Abrufen historischer Daten: {response['error']}")
+            logger.error("Fehler beim Abrufen historischer Daten: %s", response['error'])
             return []
         
         # Daten aus der Antwort extrahieren
@@ -267,7 +467,7 @@ class BybitAPI:
         Returns:
             Ticker-Informationen
         """
-        endpoint = "/v5/market/ticker"
+        endpoint = "/v5/market/tickers"
         params = {
             'category': 'spot',
             'symbol': symbol
@@ -276,7 +476,8 @@ class BybitAPI:
         response = self._make_request('GET', endpoint, params)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Abrufen von Ticker-Daten: {response['error']}")
+            log_throttle.log(logging.ERROR, "Fehler beim Abrufen von Ticker-Daten: %s", response['error'],
+                             key=('ticker', symbol))
             return {}
         
         if 'result' in response and 'list' in response['result']:
@@ -286,6 +487,30 @@ class BybitAPI:
         
         return {}
     
+    def get_tickers(self, category: str = 'spot') -> List[Dict]:
+        """
+        Ruft die Ticker aller Symbole einer Kategorie mit einem Request ab.
+        
+        Args:
+            category: Produktkategorie
+        
+        Returns:
+            Liste der Ticker-Einträge (leer bei Fehlern)
+        """
+        endpoint = "/v5/market/tickers"
+        
+        response = self._make_request('GET', endpoint, {'category': category})
+        
+        if 'error' in response:
+            log_throttle.log(logging.ERROR, "Fehler beim Abrufen der Ticker: %s", response['error'],
+                             key=('tickers', category))
+            return []
+        
+        if 'result' in response and 'list' in response['result']:
+            return response['result']['list']
+        
+        return []
+    
     def get_order_book(self, symbol: str, limit: int = 50) -> Dict:
         """
         Ruft das aktuelle Orderbuch für ein Symbol ab.
@@ -307,7 +532,8 @@ class BybitAPI:
         response = self._make_request('GET', endpoint, params)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Abrufen des Orderbuchs: {response['error']}")
+            log_throttle.log(logging.ERROR, "Fehler beim Abrufen des Orderbuchs: %s", response['error'],
+                             key=('orderbook', symbol))
             return {'bids': [], 'asks': []}
         
         if 'result' in response:
@@ -315,6 +541,51 @@ class BybitAPI:
         
         return {'bids': [], 'asks': []}
     
+    def get_server_time(self) -> Dict:
+        """
+        Ruft die aktuelle Bybit-Serverzeit ab.
+        
+        Returns:
+            Rohe API-Antwort (result.timeSecond, result.timeNano)
+        """
+        return self._make_request('GET', "/v5/market/time")
+    
+    def get_instruments_info(self, category: str = 'spot', symbol: str = None,
+                             cursor: str = None, limit: int = 1000) -> Dict:
+        """
+        Ruft die Handelsregeln (Tick-/Lot-Größen, Mindestwerte) von Instrumenten ab.
+        
+        Args:
+            category: Produktkategorie (z.B. "spot")
+            symbol: Optionales Handelssymbol zum Filtern
+            cursor: Paginierungs-Cursor aus nextPageCursor
+            limit: Maximale Anzahl von Ergebnissen pro Seite
+        
+        Returns:
+            Ergebnis mit "list" und ggf. "nextPageCursor"
+        """
+        endpoint = "/v5/market/instruments-info"
+        params = {
+            'category': category,
+            'limit': str(limit)
+        }
+        
+        if symbol:
+            params['symbol'] = symbol
+        if cursor:
+            params['cursor'] = cursor
+        
+        response = self._make_request('GET', endpoint, params)
+        
+        if 'error' in response:
+            logger.error("Fehler beim Abrufen der Instrument-Daten: %s", response['error'])
+            return {}
+        
+        if response.get('retCode') == 0 and 'result' in response:
+            return response['result']
+        
+        return {}
+    
     def get_wallet_balance(self) -> Dict:
         """
         Ruft den aktuellen Wallet-Kontostand ab.
@@ -330,7 +601,7 @@ class BybitAPI:
         response = self._make_request('GET', endpoint, params, auth=True)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Abrufen des Wallet-Kontostands: {response['error']}")
+            logger.error("Fehler beim Abrufen des Wallet-Kontostands: %s", response['error'])
             return {}
         
         if 'result' in response and 'list' in response['result']:
@@ -340,11 +611,22 @@ class BybitAPI:
         
         return {}
     
-    def place_order(self, symbol: str, side: str, order_type: str, 
-                  qty: float, price: float = None, time_in_force: str = 'GTC') -> Dict:
+    def place_order(self, symbol: str, side: str, order_type: str,
+                  qty: float, price: float = None, time_in_force: str = 'GTC',
+                  take_profit: float = None, stop_loss: float = None,
+                  tp_order_type: str = None, sl_order_type: str = None,
+                  tp_limit_price: float = None, sl_limit_price: float = None,
+                  trigger_price: float = None, order_filter: str = None,
+                  order_link_id: str = None) -> Dict:
         """
         Platziert eine Handelsorder.
         
+        Take-Profit und Stop-Loss werden als V5-Parameter an die Order gehängt;
+        Bybit übernimmt sie im Spot-Handel nur für Limit-Orders - Market-Orders
+        ignorieren sie. Eine Market-Position schützt deshalb eine eigene bedingte
+        Order: mit trigger_price wird sie als StopOrder angelegt und erst beim
+        Erreichen des Triggerpreises aktiv.
+        
         Args:
             symbol: Handelssymbol (z.B. "BTCUSDT")
             side: Orderrichtung ("Buy" oder "Sell")
@@ -352,9 +634,19 @@ class BybitAPI:
             qty: Ordermenge
             price: Orderpreis (nur für Limit-Orders)
             time_in_force: Zeitbeschränkung der Order
-            
+            take_profit: Angehängter Take-Profit-Triggerpreis (nur Limit-Orders)
+            stop_loss: Angehängter Stop-Loss-Triggerpreis (nur Limit-Orders)
+            tp_order_type: Ordertyp beim Auslösen des Take-Profits ("Market"/"Limit")
+            sl_order_type: Ordertyp beim Auslösen des Stop-Loss ("Market"/"Limit")
+            tp_limit_price: Limitpreis für Take-Profit (nur bei tp_order_type "Limit")
+            sl_limit_price: Limitpreis für Stop-Loss (nur bei sl_order_type "Limit")
+            trigger_price: Triggerpreis für bedingte Orders
+            order_filter: V5 orderFilter ("Order", "tpslOrder" oder "StopOrder")
+            order_link_id: Eigene Client-ID (Standard: neu erzeugt); nach einem Timeout
+                           wird der Orderstatus darüber abgefragt statt blind neu zu senden
+        
         Returns:
-            Order-Informationen
+            Order-Informationen (inkl. order_link_id)
         """
         endpoint = "/v5/order/create"
         
@@ -371,10 +663,142 @@ class BybitAPI:
         if order_type.lower() == 'limit' and price is not None:
             params['price'] = str(price)
         
+        # Bedingte Order: ohne expliziten Filter als Spot-StopOrder senden
+        if trigger_price is not None:
+            params['triggerPrice'] = str(trigger_price)
+            params['orderFilter'] = order_filter or 'StopOrder'
+        elif order_filter:
+            params['orderFilter'] = order_filter
+        
+        params.update(self._build_tpsl_params(
+            take_profit, stop_loss, tp_order_type, sl_order_type,
+            tp_limit_price, sl_limit_price
+        ))
+        if order_link_id:
+            params['orderLinkId'] = order_link_id
+        
+        def send(order_params):
+            response = self._make_request('POST', endpoint, dict(order_params), auth=True)
+            if str(response.get('error', '')).startswith('Circuit open'):
+                raise CircuitOpenError(response['error'])
+            return response
+        
+        result = self.orders.submit(params, send, lambda link_id: self.lookup_order(symbol, order_link_id=link_id))
+        if not result['success']:
+            logger.error("Fehler beim Platzieren der Order: %s", result.get('error'))
+        return result
+    
+    def lookup_order(self, symbol: str, order_id: str = None,
+                     order_link_id: str = None, order_filter: str = None) -> Optional[Dict]:
+        """
+        Sucht eine Order über Order-ID oder orderLinkId (offen, dann Historie).
+        
+        Args:
+            symbol: Handelssymbol
+            order_id: Order-ID
+            order_link_id: Eigene Client-ID der Order
+            order_filter: V5 orderFilter (z.B. "StopOrder" für bedingte Orders)
+        
+        Returns:
+            Order-Dictionary oder None, wenn die Order nicht existiert
+        
+        Raises:
+            RuntimeError: wenn die Abfrage selbst fehlschlägt (Zustand unbekannt)
+        """
+        params = {'category': 'spot', 'symbol': symbol}
+        if order_id:
+            params['orderId'] = order_id
+        if order_link_id:
+            params['orderLinkId'] = order_link_id
+        if order_filter:
+            params['orderFilter'] = order_filter
+        
+        for endpoint in ("/v5/order/realtime", "/v5/order/history"):
+            response = self._make_request('GET', endpoint, dict(params), auth=True)
+            if 'error' in response or response.get('retCode') != 0:
+                raise RuntimeError(response.get('error') or response.get('retMsg'))
+            orders = response.get('result', {}).get('list') or []
+            if orders:
+                return orders[0]
+        return None
+    
+    def place_conditional_order(self, symbol: str, side: str, qty: float,
+                                trigger_price: float, order_type: str = 'Market',
+                                price: float = None,
+                                order_filter: str = 'StopOrder') -> Dict:
+        """
+        Platziert eine bedingte Order, die beim Erreichen des Triggerpreises auslöst.
+        
+        Args:
+            symbol: Handelssymbol (z.B. "BTCUSDT")
+            side: Orderrichtung ("Buy" oder "Sell")
+            qty: Ordermenge
+            trigger_price: Triggerpreis
+            order_type: Ordertyp nach dem Auslösen ("Market" oder "Limit")
+            price: Limitpreis (nur für Limit-Orders)
+            order_filter: "StopOrder" für Conditional- oder "tpslOrder" für TP/SL-Orders
+        
+        Returns:
+            Order-Informationen
+        """
+        return self.place_order(
+            symbol, side, order_type, qty, price=price,
+            trigger_price=trigger_price, order_filter=order_filter
+        )
+    
+    def amend_order(self, symbol: str, order_id: str = None,
+                    qty: float = None, price: float = None,
+                    trigger_price: float = None, take_profit: float = None,
+                    stop_loss: float = None, tp_limit_price: float = None,
+                    sl_limit_price: float = None) -> Dict:
+        """
+        Ändert eine offene Order, z.B. wenn sich TP/SL-Level verschieben.
+        
+        Es werden nur die übergebenen Felder geändert; alle anderen Werte
+        der Order bleiben unverändert.
+        
+        Args:
+            symbol: Handelssymbol
+            order_id: Order-ID
+            qty: Neue Ordermenge
+            price: Neuer Limitpreis
+            trigger_price: Neuer Triggerpreis (bedingte Orders)
+            take_profit: Neuer Take-Profit-Preis
+            stop_loss: Neuer Stop-Loss-Preis
+            tp_limit_price: Neuer Limitpreis für den Take-Profit
+            sl_limit_price: Neuer Limitpreis für den Stop-Loss
+        
+        Returns:
+            Änderungsstatus
+        """
+        endpoint = "/v5/order/amend"
+        
+        params = {
+            'category': 'spot',
+            'symbol': symbol
+        }
+        
+        if order_id:
+            params['orderId'] = order_id
+        if qty is not None:
+            params['qty'] = str(qty)
+        if price is not None:
+            params['price'] = str(price)
+        if trigger_price is not None:
+            params['triggerPrice'] = str(trigger_price)
+        if take_profit is not None:
+            params['takeProfit'] = str(take_profit)
+        if stop_loss is not None:
+            params['stopLoss'] = str(stop_loss)
+        if tp_limit_price is not None:
+            params['tpLimitPrice'] = str(tp_limit_price)
+        if sl_limit_price is not None:
+            params['slLimitPrice'] = str(sl_limit_price)
+        
         response = self._make_request('POST', endpoint, params, auth=True)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Platzieren der Order: {response['error']}")
+            logger.error("Fehler beim Ändern der Order: %s", response['error'])
             return {'success': False, 'error': response['error']}
         
         if response.get('retCode') == 0:
@@ -382,6 +806,35 @@ class BybitAPI:
         else:
             return {'success': False, 'error': response.get('retMsg')}
     
+    @staticmethod
+    def _build_tpsl_params(take_profit: float = None, stop_loss: float = None,
+                           tp_order_type: str = None, sl_order_type: str = None,
+                           tp_limit_price: float = None,
+                           sl_limit_price: float = None) -> Dict:
+        """
+        Erstellt die V5-Parameter für angehängte Take-Profit/Stop-Loss-Level.
+        
+        Returns:
+            Parameter-Dictionary (leer, wenn keine Level übergeben wurden)
+        """
+        params = {}
+        
+        if take_profit is not None:
+            params['takeProfit'] = str(take_profit)
+            if tp_order_type:
+                params['tpOrderType'] = tp_order_type
+            if tp_limit_price is not None:
+                params['tpLimitPrice'] = str(tp_limit_price)
+        
+        if stop_loss is not None:
+            params['stopLoss'] = str(stop_loss)
+            if sl_order_type:
+                params['slOrderType'] = sl_order_type
+            if sl_limit_price is not None:
+                params['slLimitPrice'] = str(sl_limit_price)
+        
+        return params
+    
     def cancel_order(self, symbol: str, order_id: str = None) -> Dict:
         """
         Storniert eine offene Order.
@@ -406,7 +859,7 @@ class BybitAPI:
         response = self._make_request('POST', endpoint, params, auth=True)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Stornieren der Order: {response['error']}")
+            logger.error("Fehler beim Stornieren der Order: %s", response['error'])
             return {'success': False, 'error': response['error']}
         
         if response.get('retCode') == 0:
@@ -436,7 +889,7 @@ class BybitAPI:
         response = self._make_request('GET', endpoint, params, auth=True)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Abrufen offener Orders: {response['error']}")
+            logger.error("Fehler beim Abrufen offener Orders: %s", response['error'])
             return []
         
         if 'result' in response and 'list' in response['result']:
@@ -468,7 +921,7 @@ class BybitAPI:
         response = self._make_request('GET', endpoint, params, auth=True)
         
         if 'error' in response:
-            logger.error(f"Fehler beim Abrufen des Orderverlaufs: {response['error']}")
+            logger.error("Fehler beim Abrufen des Orderverlaufs: %s", response['error'])
             return []
         
         if 'result' in response and 'list' in response['result']:
@@ -0,0 +1,441 @@
+"""
+WebSocket-Integration für die Bybit V5 API.
+
+Dieses Modul stellt einen authentifizierten Private-Stream für die Topics
+order, execution, position und wallet bereit. Eingehende Nachrichten werden
+in einem thread-sicheren In-Memory-Speicher abgelegt, aus dem die
+Strategie Fill-Preise, Teilausführungen und Kontostände ohne Polling liest.
+Zusätzlich gibt es einen öffentlichen Trade-Stream für Echtzeit-Bars.
+"""
+
+import hmac
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+PRIVATE_TOPICS = ['order', 'execution', 'position', 'wallet']
+
+# Orderstatus, nach denen sich eine Order nicht mehr ändert
+FINAL_ORDER_STATES = {'Filled', 'Cancelled', 'Rejected', 'PartiallyFilledCanceled', 'Deactivated'}
+
+
+class OrderStateStore:
+    """
+    Thread-sicherer Speicher für Orders, Ausführungen, Positionen und Wallet-Daten.
+
+    Wird vom Private-Stream befüllt. Strategie-Code kann blockierend auf
+    Fills warten oder Listener für einzelne Topics registrieren.
+    """
+
+    def __init__(self, max_executions: int = 1000, max_orders: int = 500):
+        """
+        Initialisiert den Speicher.
+
+        Args:
+            max_executions: Maximale Anzahl gespeicherter Ausführungen
+            max_orders: Maximale Anzahl gespeicherter Orders (nur beendete werden verdrängt)
+        """
+        self._lock = threading.Condition()
+        self.max_orders = max_orders
+        self.orders: Dict[str, Dict] = {}
+        self.link_ids: Dict[str, str] = {}
+        self.executions = deque(maxlen=max_executions)
+        self._exec_ids = set()
+        self._fills: Dict[str, Dict] = {}
+        self.positions: Dict[str, Dict] = {}
+        self.wallet: Dict[str, Dict] = {}
+        self.last_update = None
+        self._listeners: Dict[str, List[Callable]] = {topic: [] for topic in PRIVATE_TOPICS}
+
+    def add_listener(self, topic: str, callback: Callable[[Dict], None]):
+        """
+        Registriert einen Callback, der für jeden Datensatz eines Topics aufgerufen wird.
+
+        Args:
+            topic: "order", "execution", "position" oder "wallet"
+            callback: Funktion, die den einzelnen Datensatz erhält
+        """
+        self._listeners.setdefault(topic, []).append(callback)
+
+    def apply(self, topic: str, rows: List[Dict]):
+        """
+        Übernimmt die Daten einer Stream-Nachricht.
+
+        Args:
+            topic: Topic der Nachricht
+            rows: Datensätze aus dem Feld "data"
+        """
+        handler = {
+            'order': self._apply_order,
+            'execution': self._apply_execution,
+            'position': self._apply_position,
+            'wallet': self._apply_wallet,
+        }.get(topic)
+        if handler is None:
+            return
+
+        with self._lock:
+            for row in rows:
+                handler(row)
+            self.last_update = time.time()
+            self._lock.notify_all()
+
+        for row in rows:
+            for callback in self._listeners.get(topic, []):
+                try:
+                    callback(row)
+                except Exception as e:
+                    logger.error(f"Fehler in Stream-Listener ({topic}): {str(e)}")
+
+    def _apply_order(self, row: Dict):
+        order_id = row.get('orderId')
+        if not order_id:
+            return
+        # Neu einsortieren, damit die Verdrängung nach dem letzten Update geht
+        self.orders.pop(order_id, None)
+        self.orders[order_id] = row
+        if row.get('orderLinkId'):
+            self.link_ids[row['orderLinkId']] = order_id
+        if len(self.orders) > self.max_orders:
+            self._evict(self.orders, len(self.orders) - self.max_orders)
+
+    def _apply_execution(self, row: Dict):
+        exec_id = row.get('execId')
+        if exec_id in self._exec_ids:
+            return
+        if exec_id:
+            # Nur IDs merken, die noch im Ringpuffer liegen
+            if len(self.executions) == self.executions.maxlen:
+                self._exec_ids.discard(self.executions[0].get('execId'))
+            self._exec_ids.add(exec_id)
+        self.executions.append(row)
+
+        order_id = row.get('orderId')
+        qty = float(row.get('execQty') or 0)
+        price = float(row.get('execPrice') or 0)
+        fill = self._fills.setdefault(order_id, {'qty': 0.0, 'notional': 0.0, 'fee': 0.0, 'count': 0})
+        fill['qty'] += qty
+        fill['notional'] += qty * price
+        fill['fee'] += float(row.get('execFee') or 0)
+        fill['count'] += 1
+        if len(self._fills) > self.max_orders:
+            self._evict(self._fills, len(self._fills) - self.max_orders)
+    
+    def _evict(self, table: Dict, count: int):
+        # Älteste beendete Orders vergessen (Order, Fills, orderLinkId) - offene bleiben
+        evict = []
+        for order_id in table:
+            if self.orders.get(order_id, {}).get('orderStatus', 'Filled') in FINAL_ORDER_STATES:
+                evict.append(order_id)
+                if len(evict) >= count:
+                    break
+        for order_id in evict:
+            row = self.orders.pop(order_id, None)
+            self._fills.pop(order_id, None)
+            if row and self.link_ids.get(row.get('orderLinkId')) == order_id:
+                del self.link_ids[row['orderLinkId']]
+
+    def _apply_position(self, row: Dict):
+        symbol = row.get('symbol')
+        if symbol:
+            self.positions[symbol] = row
+
+    def _apply_wallet(self, row: Dict):
+        for coin in row.get('coin', []):
+            if coin.get('coin'):
+                self.wallet[coin['coin']] = coin
+
+    def get_order(self, order_id: str = None, order_link_id: str = None) -> Optional[Dict]:
+        """Gibt den letzten bekannten Zustand einer Order zurück"""
+        with self._lock:
+            if order_id is None and order_link_id is not None:
+                order_id = self.link_ids.get(order_link_id)
+            return self.orders.get(order_id)
+
+    def get_fill_summary(self, order_id: str) -> Optional[Dict]:
+        """
+        Fasst alle bisherigen Ausführungen einer Order zusammen.
+
+        Returns:
+            Dictionary mit filled_qty, avg_price, fee, fills und status
+            oder None, wenn noch nichts ausgeführt wurde
+        """
+        with self._lock:
+            return self._fill_summary(order_id)
+
+    def _fill_summary(self, order_id: str) -> Optional[Dict]:
+        fill = self._fills.get(order_id) or {'qty': 0.0, 'notional': 0.0, 'fee': 0.0, 'count': 0}
+        order = self.orders.get(order_id, {})
+        # Der Order-Datensatz führt Menge und Durchschnittspreis kumuliert - einzelne
+        # Ausführungen können nach dem Status "Filled" eintreffen
+        cum_qty = float(order.get('cumExecQty') or 0)
+        avg_price = float(order.get('avgPrice') or 0)
+        if cum_qty > fill['qty'] and avg_price > 0:
+            filled_qty, fee = cum_qty, float(order.get('cumExecFee') or fill['fee'])
+        elif fill['qty'] > 0:
+            filled_qty, avg_price, fee = fill['qty'], fill['notional'] / fill['qty'], fill['fee']
+        else:
+            return None
+        return {
+            'filled_qty': filled_qty,
+            'avg_price': avg_price,
+            'fee': fee,
+            'fills': fill['count'],
+            'status': order.get('orderStatus', 'PartiallyFilled')
+        }
+
+    def wait_for_fill(self, order_id: str, timeout: float = 2.0) -> Optional[Dict]:
+        """
+        Wartet, bis eine Order vollständig ausgeführt oder beendet wurde.
+
+        Args:
+            order_id: Order-ID
+            timeout: Maximale Wartezeit in Sekunden
+
+        Returns:
+            Fill-Zusammenfassung (bei Timeout ggf. nur teilweise gefüllt) oder None
+        """
+        deadline = time.time() + timeout
+        with self._lock:
+            while True:
+                if self.orders.get(order_id, {}).get('orderStatus') in FINAL_ORDER_STATES:
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._lock.wait(remaining)
+            return self._fill_summary(order_id)
+
+    def get_balance(self, coin: str = 'USDT') -> Optional[Dict]:
+        """Gibt den zuletzt gestreamten Wallet-Eintrag für einen Coin zurück"""
+        with self._lock:
+            return self.wallet.get(coin)
+
+
+class BybitWebSocket:
+    """
+    Basisklasse für Bybit V5 WebSocket-Verbindungen.
+
+    Kümmert sich um Verbindungsaufbau, Heartbeat und automatische
+    Wiederverbindung mit exponentiellem Backoff. Unterklassen
+    implementieren _on_connected() und _handle_message().
+    """
+
+    PING_INTERVAL = 20
+
+    def __init__(self, url: str, max_reconnect_delay: float = 30.0):
+        """
+        Initialisiert die WebSocket-Verbindung.
+
+        Args:
+            url: Vollständige Stream-URL
+            max_reconnect_delay: Maximale Wartezeit zwischen Verbindungsversuchen
+        """
+        self.url = url
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self._ws = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Startet die Verbindung in einem Hintergrund-Thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet die Verbindung"""
+        self._stop.set()
+        if self._ws:
+            self._ws.close()
+
+    def send(self, payload: Dict):
+        """Sendet eine JSON-Nachricht über die offene Verbindung"""
+        if self._ws:
+            self._ws.send(json.dumps(payload))
+
+    def _run(self):
+        # websocket-client erst im Stream-Thread laden (schnellerer Bot-Start)
+        import websocket
+        
+        delay = 1.0
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            heartbeat = threading.Thread(target=self._heartbeat, args=(self._ws,), daemon=True)
+            heartbeat.start()
+            started = time.time()
+            self._ws.run_forever()
+            self.connected = False
+
+            if self._stop.is_set():
+                break
+            # Backoff nur nach kurzlebigen Verbindungen erhöhen
+            if time.time() - started > 60:
+                delay = 1.0
+            logger.warning(f"WebSocket getrennt ({self.url}), neuer Versuch in {delay:.0f}s")
+            self._stop.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _heartbeat(self, ws):
+        while not self._stop.wait(self.PING_INTERVAL):
+            if ws is not self._ws:
+                return
+            if self.connected:
+                try:
+                    ws.send(json.dumps({'op': 'ping'}))
+                except Exception:
+                    return
+
+    def _on_open(self, ws):
+        self.connected = True
+        logger.info(f"WebSocket verbunden: {self.url}")
+        self._on_connected()
+
+    def _on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning(f"Ungültige WebSocket-Nachricht: {message[:200]}")
+            return
+        self._handle_message(data)
+
+    def _on_error(self, ws, error):
+        logger.error(f"WebSocket-Fehler: {error}")
+
+    def _on_close(self, ws, status_code, reason):
+        self.connected = False
+
+    def _on_connected(self):
+        raise NotImplementedError
+
+    def _handle_message(self, data: Dict):
+        raise NotImplementedError
+
+
+class BybitPrivateStream(BybitWebSocket):
+    """
+    Authentifizierter Private-Stream für Order-, Ausführungs-, Positions- und Wallet-Updates.
+
+    Alle Updates landen im OrderStateStore (self.store).
+    """
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = True,
+                 store: OrderStateStore = None, topics: List[str] = None):
+        """
+        Initialisiert den Private-Stream.
+
+        Args:
+            api_key: API-Schlüssel für Bybit
+            api_secret: API-Secret für Bybit
+            testnet: Ob Testnet oder Mainnet verwendet werden soll
+            store: Optionaler gemeinsamer OrderStateStore
+            topics: Zu abonnierende Topics (Standard: alle privaten Topics)
+        """
+        base = "wss://stream-testnet.bybit.com" if testnet else "wss://stream.bybit.com"
+        super().__init__(f"{base}/v5/private")
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.topics = topics or list(PRIVATE_TOPICS)
+        self.store = store or OrderStateStore()
+        self.authenticated = False
+
+    def _auth_payload(self) -> Dict:
+        # Signatur über "GET/realtime" + Ablaufzeit in Millisekunden
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(
+            self.api_secret.encode('utf-8'),
+            f"GET/realtime{expires}".encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+        return {'op': 'auth', 'args': [self.api_key, expires, signature]}
+
+    def _on_connected(self):
+        self.authenticated = False
+        self.send(self._auth_payload())
+
+    def _handle_message(self, data: Dict):
+        op = data.get('op')
+        if op == 'auth':
+            if data.get('success'):
+                self.authenticated = True
+                logger.info("Private-Stream authentifiziert")
+                self.send({'op': 'subscribe', 'args': self.topics})
+            else:
+                logger.error(f"Private-Stream Authentifizierung fehlgeschlagen: {data.get('ret_msg')}")
+                self.stop()
+            return
+        if op in ('subscribe', 'pong', 'ping'):
+            if op == 'subscribe' and not data.get('success'):
+                logger.error(f"Abonnement fehlgeschlagen: {data.get('ret_msg')}")
+            return
+
+        topic = data.get('topic')
+        if topic:
+            self.store.apply(topic.split('.')[0], data.get('data', []))
+
+
+class BybitPublicTradeStream(BybitWebSocket):
+    """
+    Öffentlicher Spot-Stream für Trade-Prints (Topic publicTrade.{symbol}),
+    optional zusätzlich Orderbuch-Snapshots/-Deltas (orderbook.{depth}.{symbol}).
+    """
+
+    def __init__(self, symbols: List[str], on_trades: Callable[[List[Dict]], None],
+                 testnet: bool = True, orderbook_depth: int = 0,
+                 on_message: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialisiert den Trade-Stream.
+
+        Args:
+            symbols: Zu abonnierende Handelssymbole
+            on_trades: Callback, der die Trade-Liste jeder Nachricht erhält
+            testnet: Ob Testnet oder Mainnet verwendet werden soll
+            orderbook_depth: Orderbuch-Tiefe (1, 50 oder 200), 0 = kein Orderbuch
+            on_message: Optionaler Callback für jede Topic-Nachricht im Rohformat
+        """
+        base = "wss://stream-testnet.bybit.com" if testnet else "wss://stream.bybit.com"
+        super().__init__(f"{base}/v5/public/spot")
+        self.symbols = list(symbols)
+        self.on_trades = on_trades
+        self.orderbook_depth = orderbook_depth
+        self.on_message = on_message
+
+    def _on_connected(self):
+        topics = [f"publicTrade.{symbol}" for symbol in self.symbols]
+        if self.orderbook_depth:
+            topics += [f"orderbook.{self.orderbook_depth}.{symbol}" for symbol in self.symbols]
+        self.send({'op': 'subscribe', 'args': topics})
+
+    def _handle_message(self, data: Dict):
+        if data.get('op'):
+            if data.get('op') == 'subscribe' and not data.get('success'):
+                logger.error(f"Abonnement fehlgeschlagen: {data.get('ret_msg')}")
+            return
+
+        if self.on_message and data.get('topic'):
+            try:
+                self.on_message(data)
+            except Exception as e:
+                logger.error(f"Fehler im Nachrichten-Callback: {str(e)}")
+        
+        if data.get('topic', '').startswith('publicTrade.'):
+            try:
+                self.on_trades(data.get('data', []))
+            except Exception as e:
+                logger.error(f"Fehler bei der Trade-Verarbeitung: {str(e)}")
@@ -0,0 +1,172 @@
+"""
+Server-Zeit-Synchronisation für signierte Bybit-Requests.
+
+Misst im Hintergrund den Versatz zwischen lokaler Uhr und Bybit-Serverzeit
+über /v5/market/time. Wie beim NTP-Clock-Filter wird aus den letzten
+Messungen die mit der kürzesten Round-Trip-Time als Schätzung verwendet,
+da deren Fehler am kleinsten ist. Signierte Requests erhalten damit einen
+korrigierten Timestamp und ein an die gemessene RTT angepasstes recv_window.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+
+class ClockSync:
+    """
+    Schätzt Offset und Round-Trip-Time zur Bybit-Serverzeit.
+    """
+
+    def __init__(self, api, interval: float = 30.0, window: int = 8,
+                 min_recv_window: int = 2000, max_recv_window: int = 10000,
+                 default_recv_window: int = 5000):
+        """
+        Initialisiert die Zeitsynchronisation.
+
+        Args:
+            api: BybitAPI-Instanz (benötigt get_server_time())
+            interval: Abstand zwischen Messungen in Sekunden
+            window: Anzahl der Messungen im Filterfenster
+            min_recv_window: Untergrenze für das recv_window in Millisekunden
+            max_recv_window: Obergrenze für das recv_window in Millisekunden
+            default_recv_window: recv_window, solange keine Messung vorliegt
+        """
+        self.api = api
+        self.interval = interval
+        self.min_recv_window = min_recv_window
+        self.max_recv_window = max_recv_window
+        self.default_recv_window = default_recv_window
+        self._samples = deque(maxlen=window)
+        self.offset_ms = 0.0
+        self.rtt_ms = None
+        self.jitter_ms = 0.0
+        self.last_sync = None
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def timestamp_ms(self) -> int:
+        """Gibt die geschätzte aktuelle Serverzeit in Millisekunden zurück"""
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def recv_window_ms(self) -> int:
+        """
+        Berechnet das recv_window aus der gemessenen Netzwerklatenz.
+
+        Das Fenster deckt die langsamste Round-Trip-Time im Filterfenster,
+        die Unsicherheit der Offset-Schätzung und eine feste Reserve ab.
+
+        Returns:
+            recv_window in Millisekunden
+        """
+        if not self._samples:
+            return self.default_recv_window
+        worst_rtt = max(rtt for _, rtt in self._samples)
+        window = worst_rtt + 4 * self.jitter_ms + 500
+        return int(min(max(math.ceil(window), self.min_recv_window), self.max_recv_window))
+
+    def sample(self) -> Optional[Tuple[float, float]]:
+        """
+        Führt eine einzelne Messung durch.
+
+        Returns:
+            (Offset, RTT) in Millisekunden oder None bei Fehlern
+        """
+        t0 = time.time()
+        response = self.api.get_server_time()
+        t3 = time.time()
+
+        server_ms = _server_time_ms(response)
+        if server_ms is None:
+            self.failures += 1
+            logger.warning("Serverzeit konnte nicht abgerufen werden")
+            return None
+
+        rtt = (t3 - t0) * 1000
+        offset = server_ms - (t0 + t3) * 500
+        self._samples.append((offset, rtt))
+        self._update_estimate()
+        self.last_sync = t3
+        return offset, rtt
+
+    def sync(self, samples: int = 4) -> bool:
+        """
+        Führt mehrere Messungen in kurzer Folge durch (z.B. beim Start).
+
+        Returns:
+            True, wenn mindestens eine Messung erfolgreich war
+        """
+        ok = False
+        for _ in range(samples):
+            ok = self.sample() is not None or ok
+        if ok:
+            logger.info(f"Serverzeit synchronisiert: Offset {self.offset_ms:+.1f}ms, "
+                        f"RTT {self.rtt_ms:.1f}ms, recv_window {self.recv_window_ms()}ms")
+        return ok
+
+    def start(self):
+        """Synchronisiert sofort und misst danach periodisch im Hintergrund"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ClockSync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet die Hintergrundmessung"""
+        self._stop.set()
+
+    def get_metrics(self) -> Dict:
+        """Gibt Offset (Skew), RTT, Jitter und recv_window als Kennzahlen zurück"""
+        return {
+            'skew_ms': round(self.offset_ms, 3),
+            'rtt_ms': round(self.rtt_ms, 3) if self.rtt_ms is not None else None,
+            'jitter_ms': round(self.jitter_ms, 3),
+            'recv_window_ms': self.recv_window_ms(),
+            'samples': len(self._samples),
+            'failures': self.failures,
+            'last_sync_age': round(time.time() - self.last_sync, 3) if self.last_sync else None
+        }
+
+    def _run(self):
+        if not self._samples:
+            self.sync()
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Fehler bei der Zeitsynchronisation: {str(e)}")
+
+    def _update_estimate(self):
+        # Clock-Filter: Messung mit kleinster RTT hat den kleinsten Offset-Fehler
+        best_offset, best_rtt = min(self._samples, key=lambda s: s[1])
+        self.offset_ms = best_offset
+        self.rtt_ms = best_rtt
+        # Jitter als RMS-Abweichung der übrigen Offsets von der Schätzung
+        deviations = [(offset - best_offset) ** 2 for offset, _ in self._samples]
+        self.jitter_ms = math.sqrt(sum(deviations) / len(deviations))
+
+        if abs(self.offset_ms) > 1000:
+            logger.warning(f"Lokale Uhr weicht um {self.offset_ms:+.0f}ms von der Serverzeit ab")
+
+
+def _server_time_ms(response: Dict) -> Optional[float]:
+    # timeNano ist am genauesten, "time" (ms) als Fallback
+    if not response or response.get('retCode') != 0:
+        return None
+    result = response.get('result', {})
+    if result.get('timeNano'):
+        return int(result['timeNano']) / 1e6
+    if response.get('time'):
+        return float(response['time'])
+    if result.get('timeSecond'):
+        return float(result['timeSecond']) * 1000
+    return None
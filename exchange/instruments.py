@@ -0,0 +1,218 @@
+"""
+Instrument-Metadaten für Bybit Spot.
+
+Lädt /v5/market/instruments-info einmalig für alle Spot-Symbole und hält
+pro Symbol vorberechnete Decimal-Quantisierer für Tick- und Lot-Größen sowie
+Mindest- und Maximalwerte. Orders werden damit schon vor dem Versand auf
+gültige Werte gerundet, statt von der Börse abgelehnt zu werden.
+"""
+
+import logging
+import threading
+from decimal import Decimal, ROUND_DOWN, ROUND_UP, ROUND_HALF_UP
+from typing import Dict, Optional, Tuple
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+
+class InstrumentInfo:
+    """
+    Handelsregeln eines Spot-Symbols mit vorberechneten Quantisierern.
+    """
+
+    __slots__ = ('symbol', 'base_coin', 'quote_coin', 'status', 'tick_size',
+                 'qty_step', 'min_qty', 'max_qty', 'min_notional', 'max_notional')
+
+    def __init__(self, data: Dict):
+        """
+        Erstellt die Handelsregeln aus einem instruments-info-Eintrag.
+
+        Args:
+            data: Eintrag aus result.list der V5-Antwort
+        """
+        lot = data.get('lotSizeFilter', {})
+        price_filter = data.get('priceFilter', {})
+
+        self.symbol = data['symbol']
+        self.base_coin = data.get('baseCoin')
+        self.quote_coin = data.get('quoteCoin')
+        self.status = data.get('status', 'Trading')
+        self.tick_size = _decimal(price_filter.get('tickSize'))
+        # Spot nutzt basePrecision als Mengenschritt, Derivate qtyStep
+        self.qty_step = _decimal(lot.get('basePrecision') or lot.get('qtyStep'))
+        self.min_qty = _decimal(lot.get('minOrderQty'))
+        self.max_qty = _decimal(lot.get('maxOrderQty'))
+        self.min_notional = _decimal(lot.get('minOrderAmt') or lot.get('minNotionalValue'))
+        self.max_notional = _decimal(lot.get('maxOrderAmt'))
+
+    def quantize_qty(self, qty) -> Decimal:
+        """Rundet eine Menge auf den Mengenschritt ab"""
+        return _quantize(Decimal(str(qty)), self.qty_step, ROUND_DOWN)
+
+    def quantize_price(self, price, side: str = None) -> Decimal:
+        """
+        Rundet einen Preis auf die Tick-Größe.
+
+        Kaufpreise werden abgerundet, Verkaufspreise aufgerundet, damit das
+        Limit nie ungünstiger als angefragt ist. Ohne Seite wird kaufmännisch gerundet.
+        """
+        rounding = {'Buy': ROUND_DOWN, 'Sell': ROUND_UP}.get(side, ROUND_HALF_UP)
+        return _quantize(Decimal(str(price)), self.tick_size, rounding)
+
+    def validate(self, qty: Decimal, price: Decimal) -> Optional[str]:
+        """
+        Prüft eine bereits quantisierte Order gegen die Handelsregeln.
+
+        Args:
+            qty: Ordermenge
+            price: Preis (Limit- oder Referenzpreis für Market-Orders)
+
+        Returns:
+            Fehlerbeschreibung oder None, wenn die Order gültig ist
+        """
+        if self.status != 'Trading':
+            return f"{self.symbol} nicht handelbar (Status: {self.status})"
+        if qty <= 0:
+            return "Menge nach Rundung ist 0"
+        if self.min_qty and qty < self.min_qty:
+            return f"Menge {qty} unter Minimum {self.min_qty}"
+        if self.max_qty and qty > self.max_qty:
+            return f"Menge {qty} über Maximum {self.max_qty}"
+        notional = qty * price
+        if self.min_notional and notional < self.min_notional:
+            return f"Orderwert {notional:.4f} unter Minimum {self.min_notional}"
+        if self.max_notional and notional > self.max_notional:
+            return f"Orderwert {notional:.4f} über Maximum {self.max_notional}"
+        return None
+
+
+class InstrumentIndex:
+    """
+    Index aller Spot-Instrumente mit O(1)-Zugriff pro Symbol.
+    """
+
+    def __init__(self, api, category: str = 'spot', refresh_interval: float = 3600.0):
+        """
+        Initialisiert den Index.
+
+        Args:
+            api: BybitAPI-Instanz (benötigt get_instruments_info())
+            category: Produktkategorie
+            refresh_interval: Abstand der Hintergrund-Aktualisierung in Sekunden
+        """
+        self.api = api
+        self.category = category
+        self.refresh_interval = refresh_interval
+        self._instruments: Dict[str, InstrumentInfo] = {}
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self) -> int:
+        return len(self._instruments)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._instruments
+
+    def get(self, symbol: str) -> Optional[InstrumentInfo]:
+        """Gibt die Handelsregeln eines Symbols zurück (lädt beim ersten Zugriff)"""
+        if not self._instruments:
+            self.load()
+        return self._instruments.get(symbol)
+
+    def load(self) -> int:
+        """
+        Lädt alle Instrumente der Kategorie (inkl. Paginierung).
+
+        Returns:
+            Anzahl geladener Instrumente
+        """
+        with self._load_lock:
+            instruments = {}
+            cursor = None
+            while True:
+                result = self.api.get_instruments_info(category=self.category, cursor=cursor)
+                if not result:
+                    break
+                for item in result.get('list', []):
+                    try:
+                        info = InstrumentInfo(item)
+                    except (KeyError, ArithmeticError) as e:
+                        logger.warning(f"Ungültige Instrument-Daten übersprungen: {str(e)}")
+                        continue
+                    instruments[info.symbol] = info
+                cursor = result.get('nextPageCursor')
+                if not cursor:
+                    break
+
+            if instruments:
+                # Referenz atomar austauschen, Leser sehen nie einen halben Index
+                self._instruments = instruments
+                logger.info(f"{len(instruments)} Instrumente geladen ({self.category})")
+            else:
+                logger.warning("Keine Instrument-Daten erhalten - behalte bisherigen Index")
+            return len(self._instruments)
+
+    def start(self):
+        """Lädt den Index und aktualisiert ihn danach im Hintergrund"""
+        if self._thread and self._thread.is_alive():
+            return
+        if not self._instruments:
+            self.load()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="InstrumentIndexRefresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet die Hintergrund-Aktualisierung"""
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Fehler beim Aktualisieren der Instrumente: {str(e)}")
+
+    def prepare_order(self, symbol: str, qty, price) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Quantisiert Menge und Preis einer Order und prüft sie gegen die Handelsregeln.
+
+        Args:
+            symbol: Handelssymbol
+            qty: Gewünschte Menge
+            price: Limit- oder Referenzpreis
+
+        Returns:
+            (Menge als String, Preis als String, Fehlerbeschreibung). Bei
+            unbekanntem Symbol werden die Werte unverändert zurückgegeben.
+        """
+        info = self.get(symbol)
+        if info is None:
+            return str(qty), str(price), None
+
+        q_qty = info.quantize_qty(qty)
+        q_price = info.quantize_price(price)
+        error = info.validate(q_qty, q_price)
+        if error:
+            return None, None, error
+        return _format(q_qty), _format(q_price), None
+
+
+def _decimal(value) -> Optional[Decimal]:
+    if value in (None, ''):
+        return None
+    result = Decimal(str(value))
+    return result if result > 0 else None
+
+
+def _quantize(value: Decimal, step: Optional[Decimal], rounding) -> Decimal:
+    if not step:
+        return value
+    return (value / step).to_integral_value(rounding=rounding) * step
+
+
+def _format(value: Decimal) -> str:
+    # Keine Exponentialschreibweise an die API senden
+    return format(value.normalize(), 'f')
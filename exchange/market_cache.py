@@ -0,0 +1,177 @@
+"""
+Response-Cache für öffentliche Marktdaten der Bybit API.
+
+- SingleFlight: gleichzeitige identische Anfragen teilen sich einen Request
+- MarketDataCache: TTL je Endpoint, begrenzte Größe mit LRU-Verdrängung
+
+Fragen mehrere Komponenten (Bot, Scanner, Ingest, Dashboard) über dieselbe
+BybitAPI-Instanz gleichzeitig denselben Ticker oder dasselbe Orderbuch an,
+geht nur ein Request an die Börse. Nur erfolgreiche Antworten (retCode 0)
+werden gecacht; gecachte Antworten sind als read-only zu behandeln.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+# Standard-TTL je Endpoint in Sekunden (0 = nicht cachen)
+DEFAULT_TTLS = {
+    '/v5/market/tickers': 1.0,
+    '/v5/market/orderbook': 0.5,
+    '/v5/market/kline': 5.0,
+    '/v5/market/instruments-info': 60.0,
+}
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Fasst gleichzeitige Aufrufe mit gleichem Schlüssel zu einem zusammen.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Führt func aus, sofern nicht bereits ein Aufruf mit diesem Schlüssel läuft.
+
+        Args:
+            key: Schlüssel der Anfrage
+            func: Funktion ohne Argumente
+
+        Returns:
+            (Ergebnis, shared) - shared ist True, wenn das Ergebnis eines
+            bereits laufenden Aufrufs übernommen wurde. Exceptions des
+            laufenden Aufrufs werden an alle Wartenden weitergegeben.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    def inflight(self) -> int:
+        """Anzahl der laufenden Aufrufe"""
+        with self._lock:
+            return len(self._calls)
+
+
+class MarketDataCache:
+    """
+    TTL-/LRU-Cache mit Request-Coalescing für öffentliche GET-Endpoints.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            max_entries: Maximale Anzahl gecachter Antworten (älteste Nutzung fliegt zuerst)
+            ttls: TTL je Endpoint in Sekunden; Endpoints ohne TTL werden nicht gecacht
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+
+    def cacheable(self, endpoint: str) -> bool:
+        """Ob Antworten dieses Endpoints gecacht werden"""
+        return self.ttls.get(endpoint, 0) > 0
+
+    def fetch(self, endpoint: str, params: Optional[Dict], loader: Callable[[], Dict]) -> Dict:
+        """
+        Gibt eine gecachte Antwort zurück oder lädt sie (einmal je Schlüssel).
+
+        Args:
+            endpoint: API-Endpunkt
+            params: Anfrageparameter (Teil des Schlüssels)
+            loader: Führt den eigentlichen Request aus
+
+        Returns:
+            API-Antwort als Dictionary
+        """
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+
+        response, shared = self._flight.do(key, lambda: self._load(key, endpoint, loader))
+        with self._lock:
+            self.stats['coalesced' if shared else 'misses'] += 1
+        return response
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """
+        Verwirft gecachte Antworten.
+
+        Args:
+            endpoint: Nur Antworten dieses Endpoints (Standard: alle)
+        """
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == endpoint]:
+                del self._entries[key]
+
+    def get_metrics(self) -> Dict:
+        """Gibt Cache-Kennzahlen zurück"""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics['entries'] = len(self._entries)
+        lookups = metrics['hits'] + metrics['misses'] + metrics['coalesced']
+        metrics['hit_rate'] = round((metrics['hits'] + metrics['coalesced']) / lookups, 3) if lookups else None
+        return metrics
+
+    def _load(self, key: Tuple, endpoint: str, loader: Callable[[], Dict]) -> Dict:
+        response = loader()
+        # Fehler nicht cachen - der nächste Aufruf soll es erneut versuchen
+        if isinstance(response, dict) and response.get('retCode') == 0:
+            expires = time.monotonic() + self.ttls[endpoint]
+            with self._lock:
+                self._entries[key] = (expires, response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+        return response
@@ -0,0 +1,282 @@
+"""
+Idempotente Orderplatzierung über orderLinkId.
+
+Jede Order erhält eine eindeutige Client-ID (orderLinkId), bevor sie
+gesendet wird. Bleibt die Antwort aus (Timeout, Verbindungsabbruch, 5xx),
+ist unklar, ob die Börse die Order angenommen hat. Statt blind erneut zu
+senden, wird der Zustand zuerst über die orderLinkId abgefragt:
+
+- Order gefunden -> als angenommen übernehmen, nicht erneut senden
+- Order sicher nicht vorhanden -> mit derselben orderLinkId erneut senden
+  (die Börse weist doppelte orderLinkIds ab, ein Duplikat ist ausgeschlossen)
+- Zustand nicht ermittelbar -> Order bleibt als UNKNOWN im Register, bis
+  reconcile() sie auflöst
+
+Damit sind kurze Timeouts (ORDER_TIMEOUT unter einer Sekunde) auf dem
+Order-Pfad unkritisch.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from exchange.resilience import CircuitOpenError
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+SENDING = 'SENDING'
+ACKED = 'ACKED'
+REJECTED = 'REJECTED'
+UNKNOWN = 'UNKNOWN'
+
+# Bybit erlaubt höchstens 36 Zeichen
+ORDER_LINK_ID_MAX = 36
+
+# retCodes für bereits vorhandene orderLinkId (Derivate / Spot)
+DUPLICATE_LINK_ID_CODES = (110072, 170141)
+
+# Endzustände, in denen die Order nichts ausgeführt hat
+DEAD_ORDER_STATUS = ('Rejected',)
+
+
+def new_order_link_id(prefix: str = 'elb') -> str:
+    """
+    Erzeugt eine eindeutige orderLinkId.
+
+    Args:
+        prefix: Kennung des Bots (hilft beim Zuordnen in der Order-Historie)
+
+    Returns:
+        ID aus Präfix, Millisekunden-Zeitstempel (hex) und Zufallsanteil
+    """
+    link_id = f"{prefix}-{int(time.time() * 1000):x}-{uuid.uuid4().hex}"
+    return link_id[:ORDER_LINK_ID_MAX]
+
+
+def _is_client_error(error: Exception) -> bool:
+    # HTTP 4xx (außer 429): die Börse hat die Order sicher nicht angenommen
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status is not None and status < 500 and status != 429
+
+
+class OrderRegistry:
+    """
+    Register der gesendeten Orders mit Zustandsauflösung nach Timeouts.
+    """
+
+    def __init__(self, retries: int = 2, resolve_attempts: int = 3,
+                 resolve_delay: float = 0.5, sleep: Callable[[float], None] = time.sleep,
+                 prefix: str = 'elb', max_entries: int = 500):
+        """
+        Initialisiert das Register.
+
+        Args:
+            retries: Erneute Sendeversuche, wenn die Order sicher nicht angekommen ist
+            resolve_attempts: Statusabfragen je unklarer Antwort
+            resolve_delay: Wartezeit vor der ersten Statusabfrage in Sekunden (steigt linear)
+            sleep: Wartefunktion (z.B. Clock.sleep des Bots)
+            prefix: Präfix der orderLinkIds
+            max_entries: Abgeschlossene Orders, die für Metriken behalten werden
+        """
+        self.retries = retries
+        self.resolve_attempts = resolve_attempts
+        self.resolve_delay = resolve_delay
+        self.sleep = sleep
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'submitted': 0, 'acked': 0, 'rejected': 0, 'unknown': 0,
+            'resolved': 0, 'resent': 0, 'duplicates': 0
+        }
+
+    def new_link_id(self) -> str:
+        """Neue orderLinkId mit dem Präfix des Registers"""
+        return new_order_link_id(self.prefix)
+
+    def submit(self, params: Dict, send: Callable[[Dict], Dict],
+               lookup: Callable[[str], Optional[Dict]], intent: str = None) -> Dict:
+        """
+        Sendet eine Order idempotent.
+
+        Args:
+            params: Order-Parameter (eine vorhandene orderLinkId wird übernommen)
+            send: Funktion(params) -> V5-Antwort; Exceptions gelten als unklarer Zustand
+                  (außer CircuitOpenError und HTTP 4xx)
+            lookup: Funktion(order_link_id) -> Order-Dictionary oder None, wenn die
+                    Order nicht existiert; Exceptions, wenn die Abfrage scheitert
+            intent: Zweck der Order (z.B. "OPEN_LONG", "CLOSE_LONG"), damit eine später
+                    aufgelöste Order der Position zugeordnet werden kann
+
+        Returns:
+            Dictionary mit success, order_id, order_link_id und ggf. error, resolved
+        """
+        link_id = params.get('orderLinkId') or self.new_link_id()
+        params = dict(params, orderLinkId=link_id)
+        entry = self._register(link_id, params, intent)
+        error = None
+
+        for attempt in range(self.retries + 1):
+            entry['attempts'] += 1
+            try:
+                response = send(params)
+            except CircuitOpenError as e:
+                # Nicht gesendet
+                return self._finish(entry, REJECTED, error=str(e))
+            except Exception as e:
+                if _is_client_error(e):
+                    return self._finish(entry, REJECTED, error=str(e))
+                response = {'error': str(e)}
+
+            ret_code = response.get('retCode')
+            if ret_code == 0:
+                order_id = response.get('result', {}).get('orderId')
+                return self._finish(entry, ACKED, order_id=order_id)
+            if ret_code in DUPLICATE_LINK_ID_CODES:
+                # Ein früherer Versuch ist doch angekommen
+                self.stats['duplicates'] += 1
+            elif ret_code is not None:
+                return self._finish(entry, REJECTED, error=response.get('retMsg', 'API Error'))
+
+            error = response.get('error') or response.get('retMsg')
+            logger.warning("Order %s ohne Bestätigung (%s) - Status wird abgefragt", link_id, error)
+            found, order = self._resolve(link_id, lookup)
+            if order:
+                return self._resolved(entry, order)
+            if not found:
+                # Zustand unklar: nicht erneut senden, sonst droht eine doppelte Position
+                return self._finish(entry, UNKNOWN, error=f"Orderstatus unbekannt: {error}")
+            if attempt < self.retries:
+                self.stats['resent'] += 1
+                logger.info("Order %s nicht angekommen - erneuter Versuch %d/%d",
+                            link_id, attempt + 1, self.retries)
+
+        return self._finish(entry, REJECTED, error=error)
+
+    def reconcile(self, lookup: Callable[[str], Optional[Dict]]) -> List[Dict]:
+        """
+        Fragt den Zustand aller UNKNOWN-Orders erneut ab.
+
+        Returns:
+            Liste der Einträge, die dabei als angenommen aufgelöst wurden
+            (mit filled_qty und avg_price aus der Orderabfrage)
+        """
+        recovered = []
+        for entry in self.unresolved():
+            try:
+                order = lookup(entry['order_link_id'])
+            except Exception as e:
+                logger.debug("Statusabfrage für %s fehlgeschlagen: %s", entry['order_link_id'], e)
+                continue
+            if order:
+                self._resolved(entry, order)
+                if entry['state'] == ACKED:
+                    recovered.append(entry)
+            else:
+                self._finish(entry, REJECTED, error="Order an der Börse nicht vorhanden")
+        return recovered
+
+    def restore(self, entries: List[Dict]):
+        """
+        Übernimmt ungeklärte Orders aus einem State-Snapshot (Warm-Restart).
+        
+        Args:
+            entries: Einträge aus unresolved() des vorherigen Prozesses
+        """
+        with self._lock:
+            for entry in entries:
+                self._orders[entry['order_link_id']] = dict(entry, state=UNKNOWN)
+        if entries:
+            logger.warning("%d Order(s) mit ungeklärtem Status übernommen", len(entries))
+    
+    def unresolved(self) -> List[Dict]:
+        """Orders mit unbekanntem Zustand"""
+        with self._lock:
+            return [entry for entry in self._orders.values() if entry['state'] == UNKNOWN]
+
+    def get(self, order_link_id: str) -> Optional[Dict]:
+        """Eintrag einer Order"""
+        with self._lock:
+            return self._orders.get(order_link_id)
+
+    def get_metrics(self) -> Dict:
+        """Zähler und offene Orders für die Status-Datei"""
+        with self._lock:
+            in_flight = [link_id for link_id, entry in self._orders.items()
+                         if entry['state'] in (SENDING, UNKNOWN)]
+            return dict(self.stats, in_flight=in_flight)
+
+    def _register(self, link_id: str, params: Dict, intent: str = None) -> Dict:
+        entry = {
+            'order_link_id': link_id,
+            'order_id': None,
+            'intent': intent,
+            'side': params.get('side'),
+            'qty': params.get('qty'),
+            'filled_qty': None,
+            'avg_price': None,
+            'state': SENDING,
+            'attempts': 0,
+            'created': time.time(),
+            'error': None
+        }
+        with self._lock:
+            self._orders[link_id] = entry
+            self.stats['submitted'] += 1
+            # Abgeschlossene Orders begrenzen, offene nie verdrängen
+            while len(self._orders) > self.max_entries:
+                oldest = next((key for key, value in self._orders.items()
+                               if value['state'] in (ACKED, REJECTED)), None)
+                if oldest is None:
+                    break
+                del self._orders[oldest]
+        return entry
+
+    def _resolve(self, link_id: str, lookup: Callable[[str], Optional[Dict]]):
+        # Returns (Abfrage erfolgreich, Order oder None)
+        found = False
+        for attempt in range(self.resolve_attempts):
+            # Die Börse braucht einen Moment, bis die Order abfragbar ist
+            self.sleep(self.resolve_delay * (attempt + 1))
+            try:
+                order = lookup(link_id)
+            except Exception as e:
+                logger.debug("Statusabfrage für %s fehlgeschlagen: %s", link_id, e)
+                continue
+            found = True
+            if order:
+                return True, order
+        return found, None
+
+    def _resolved(self, entry: Dict, order: Dict) -> Dict:
+        self.stats['resolved'] += 1
+        status = order.get('orderStatus')
+        entry['filled_qty'] = float(order.get('cumExecQty') or 0)
+        entry['avg_price'] = float(order.get('avgPrice') or 0) or None
+        if status in DEAD_ORDER_STATUS:
+            return self._finish(entry, REJECTED, order_id=order.get('orderId'),
+                                error=order.get('rejectReason') or status)
+        logger.info("Order %s an der Börse gefunden (%s)", entry['order_link_id'], status)
+        result = self._finish(entry, ACKED, order_id=order.get('orderId'))
+        result['resolved'] = True
+        return result
+
+    def _finish(self, entry: Dict, state: str, order_id: str = None, error: str = None) -> Dict:
+        with self._lock:
+            entry['state'] = state
+            entry['order_id'] = order_id or entry['order_id']
+            entry['error'] = error
+            self.stats[state.lower()] += 1
+        if state == UNKNOWN:
+            logger.error("Order %s: %s", entry['order_link_id'], error)
+        result = {'success': state == ACKED, 'order_id': entry['order_id'],
+                  'order_link_id': entry['order_link_id']}
+        if error:
+            result['error'] = error
+        return result
@@ -0,0 +1,202 @@
+"""
+Tail-Latency-Kontrollen für REST-Requests an Bybit.
+
+- LatencyTracker: gleitendes Fenster der Antwortzeiten pro Endpoint (p50/p95/p99)
+- CircuitBreaker: pro Endpoint CLOSED -> OPEN nach wiederholten Fehlern,
+  nach der Wartezeit HALF_OPEN mit einzelnen Probe-Requests
+- hedged_call: sendet bei idempotenten Reads nach der adaptiven p95-Verzögerung
+  einen zweiten Request und nimmt die erste erfolgreiche Antwort
+
+Ein hängender Request blockiert damit nicht mehr die ganze Schleife: Reads
+werden durch den Hedge abgekürzt, dauerhaft gestörte Endpoints schlagen
+sofort fehl, statt bis zum Timeout zu warten.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+CLOSED = 'CLOSED'
+OPEN = 'OPEN'
+HALF_OPEN = 'HALF_OPEN'
+
+
+class CircuitOpenError(Exception):
+    """Request wurde nicht gesendet, weil der Circuit Breaker offen ist"""
+
+
+class LatencyTracker:
+    """
+    Antwortzeiten eines Endpoints in einem gleitenden Fenster.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialisiert den Tracker.
+
+        Args:
+            window: Anzahl der berücksichtigten Messungen
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float):
+        """Nimmt eine Antwortzeit in Sekunden auf"""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Gibt ein Perzentil der Antwortzeit in Sekunden zurück.
+
+        Args:
+            q: Perzentil zwischen 0 und 100
+
+        Returns:
+            Antwortzeit oder None ohne Messungen
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(q / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def get_metrics(self) -> Dict:
+        """Gibt p50/p95/p99 in Millisekunden zurück"""
+        metrics = {'count': self.count}
+        for q in (50, 95, 99):
+            value = self.percentile(q)
+            metrics[f'p{q}_ms'] = round(value * 1000, 1) if value is not None else None
+        return metrics
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker mit Half-Open-Probing für einen Endpoint.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_probes: int = 1):
+        """
+        Initialisiert den Breaker.
+
+        Args:
+            name: Bezeichnung (Endpoint) für Logs und Metriken
+            failure_threshold: Aufeinanderfolgende Fehler bis zum Öffnen
+            reset_timeout: Sekunden im Zustand OPEN bis zum ersten Probe-Request
+            half_open_probes: Gleichzeitig erlaubte Probe-Requests im Zustand HALF_OPEN
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.stats = {'rejected': 0, 'opened': 0}
+
+    def allow(self) -> bool:
+        """
+        Prüft, ob ein Request gesendet werden darf.
+
+        Returns:
+            False, solange der Breaker offen ist (Request sofort abweisen)
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self.reset_timeout:
+                    self.stats['rejected'] += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+                logger.info(f"Circuit {self.name}: HALF_OPEN - sende Probe-Request")
+
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.stats['rejected'] += 1
+                    return False
+                self._probes += 1
+            return True
+
+    @property
+    def closed(self) -> bool:
+        """True im Normalbetrieb; in OPEN/HALF_OPEN darf nur der Probe-Request raus (kein Hedge)"""
+        with self._lock:
+            return self.state == CLOSED
+    
+    def record_success(self):
+        """Meldet eine erfolgreiche Antwort"""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.name}: wieder CLOSED")
+            self.state = CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        """Meldet einen Fehler (Timeout, Verbindungsfehler, HTTP 5xx/429)"""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats['opened'] += 1
+                    logger.warning(f"Circuit {self.name}: OPEN nach {self.failures} Fehlern "
+                                   f"(Pause {self.reset_timeout:.0f}s)")
+                self.state = OPEN
+                self.opened_at = time.time()
+                self._probes = 0
+
+    def get_metrics(self) -> Dict:
+        """Gibt Zustand und Zähler zurück"""
+        with self._lock:
+            return {'state': self.state, 'failures': self.failures, **self.stats}
+
+
+def hedged_call(func: Callable, delay: float, executor, stats: Optional[Dict] = None):
+    """
+    Führt einen idempotenten Request mit Hedge aus.
+
+    Ist der erste Request nach delay Sekunden nicht fertig, wird ein zweiter
+    gesendet. Die erste erfolgreiche Antwort gewinnt; scheitern beide, wird
+    der Fehler des ersten Requests geworfen.
+
+    Args:
+        func: Request-Funktion ohne Argumente
+        delay: Wartezeit bis zum Hedge in Sekunden
+        executor: ThreadPoolExecutor für die Requests
+        stats: Optionales Dictionary für die Zähler 'hedges' und 'hedge_wins'
+    """
+    primary = executor.submit(func)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    hedge = executor.submit(func)
+    if stats is not None:
+        stats['hedges'] = stats.get('hedges', 0) + 1
+
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is not None:
+                continue
+            if future is hedge and stats is not None:
+                stats['hedge_wins'] = stats.get('hedge_wins', 0) + 1
+            return future.result()
+    # Beide gescheitert - maßgeblich ist der Fehler des ursprünglichen Requests
+    raise primary.exception()
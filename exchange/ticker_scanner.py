@@ -0,0 +1,274 @@
+"""
+Marktweiter Ticker-Scanner für Bybit Spot.
+
+/v5/market/tickers ohne Symbol liefert alle Spot-Paare in einer Antwort.
+Der Scanner lädt diesen Snapshot in kurzen Abständen und legt ihn spaltenweise
+ab (NumPy-Arrays je Feld, Zeilenindex je Symbol). Filter und Ranglisten
+(Top-Mover, höchstes Volumen, engster Spread) laufen damit vektorisiert über
+den ganzen Markt - ein Request pro Zyklus statt einem pro Symbol.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Konfiguriere Logging
+logger = logging.getLogger(__name__)
+
+# Spalte -> Feld der V5-Antwort
+COLUMNS = {
+    'last_price': 'lastPrice',
+    'prev_price_24h': 'prevPrice24h',
+    'high_24h': 'highPrice24h',
+    'low_24h': 'lowPrice24h',
+    'volume_24h': 'volume24h',
+    'turnover_24h': 'turnover24h',
+    'bid': 'bid1Price',
+    'bid_size': 'bid1Size',
+    'ask': 'ask1Price',
+    'ask_size': 'ask1Size',
+}
+
+
+class TickerSnapshot:
+    """
+    Ticker aller Symbole eines Zeitpunkts in Spaltenform.
+    """
+
+    def __init__(self, symbols: np.ndarray, columns: Dict[str, np.ndarray], ts: float = None):
+        """
+        Erstellt den Snapshot.
+
+        Args:
+            symbols: Symbolnamen (str-Array der Länge N)
+            columns: Spaltenname -> float64-Array der Länge N (fehlende Werte NaN)
+            ts: Zeitpunkt des Abrufs in Sekunden
+        """
+        self.symbols = symbols
+        self.columns = columns
+        self.ts = ts if ts is not None else time.time()
+        self.index = {symbol: row for row, symbol in enumerate(symbols.tolist())}
+
+        last = columns['last_price']
+        prev = columns['prev_price_24h']
+        bid = columns['bid']
+        ask = columns['ask']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Aus den Preisen berechnet - price24hPcnt ist auf 4 Stellen gerundet
+            columns['change_pct'] = np.where(prev > 0, (last / prev - 1) * 100, np.nan)
+            mid = (bid + ask) / 2
+            columns['spread_bps'] = np.where((bid > 0) & (ask >= bid), (ask - bid) / mid * 10000, np.nan)
+            columns['range_pct'] = np.where(columns['low_24h'] > 0,
+                                            (columns['high_24h'] / columns['low_24h'] - 1) * 100, np.nan)
+
+    @classmethod
+    def from_bybit(cls, rows: List[Dict], ts: float = None) -> 'TickerSnapshot':
+        """
+        Erstellt einen Snapshot aus result.list von /v5/market/tickers.
+
+        Args:
+            rows: Ticker-Einträge der V5-Antwort
+            ts: Zeitpunkt des Abrufs in Sekunden
+        """
+        rows = [row for row in rows if row.get('symbol')]
+        symbols = np.array([row['symbol'] for row in rows], dtype=str)
+        columns = {}
+        for column, key in COLUMNS.items():
+            # Leere Strings (z.B. ohne Gebot) werden zu NaN
+            columns[column] = np.array([row.get(key) or 'nan' for row in rows], dtype=np.float64)
+        return cls(symbols, columns, ts)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    @property
+    def age(self) -> float:
+        """Alter des Snapshots in Sekunden"""
+        return time.time() - self.ts
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Alle Spalten eines Symbols oder None, wenn unbekannt"""
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        return self._row(row)
+
+    def mask(self, quote: str = None, min_turnover: float = None, min_volume: float = None,
+             min_price: float = None, max_spread_bps: float = None,
+             min_change_pct: float = None, max_change_pct: float = None) -> np.ndarray:
+        """
+        Boolesche Auswahl über alle Symbole (nicht gesetzte Filter greifen nicht).
+
+        Args:
+            quote: Quote-Währung, z.B. "USDT" (Symbol endet darauf)
+            min_turnover: Mindestumsatz 24h in Quote-Währung
+            min_volume: Mindestvolumen 24h in Basis-Währung
+            min_price: Mindestpreis
+            max_spread_bps: Maximaler Bid/Ask-Spread in Basispunkten
+            min_change_pct: Mindeständerung 24h in Prozent
+            max_change_pct: Maximaländerung 24h in Prozent
+
+        Returns:
+            bool-Array der Länge N
+        """
+        columns = self.columns
+        selected = np.isfinite(columns['last_price'])
+        if quote:
+            selected &= np.char.endswith(self.symbols, quote)
+        # Vergleiche mit NaN sind False - Symbole ohne Wert fallen heraus
+        if min_turnover is not None:
+            selected &= columns['turnover_24h'] >= min_turnover
+        if min_volume is not None:
+            selected &= columns['volume_24h'] >= min_volume
+        if min_price is not None:
+            selected &= columns['last_price'] >= min_price
+        if max_spread_bps is not None:
+            selected &= columns['spread_bps'] <= max_spread_bps
+        if min_change_pct is not None:
+            selected &= columns['change_pct'] >= min_change_pct
+        if max_change_pct is not None:
+            selected &= columns['change_pct'] <= max_change_pct
+        return selected
+
+    def top(self, column: str, n: int = 10, ascending: bool = False,
+            mask: np.ndarray = None) -> List[Dict]:
+        """
+        Rangliste nach einer Spalte.
+
+        Args:
+            column: Spaltenname (z.B. 'change_pct', 'turnover_24h', 'spread_bps')
+            n: Anzahl Einträge
+            ascending: Kleinste Werte zuerst
+            mask: Optionale Auswahl aus mask()
+
+        Returns:
+            Liste von Zeilen-Dictionaries, sortiert
+        """
+        values = self.columns[column]
+        candidates = np.flatnonzero(np.isfinite(values) if mask is None else mask & np.isfinite(values))
+        if n <= 0 or not len(candidates):
+            return []
+        keys = values[candidates] if ascending else -values[candidates]
+        if len(candidates) > n:
+            # Teilsortierung: O(N) statt O(N log N) über den ganzen Markt
+            part = np.argpartition(keys, n - 1)[:n]
+            candidates, keys = candidates[part], keys[part]
+        order = candidates[np.argsort(keys, kind='stable')]
+        return [self._row(row) for row in order]
+
+    def movers(self, n: int = 10, mask: np.ndarray = None) -> Dict[str, List[Dict]]:
+        """Größte Gewinner und Verlierer der letzten 24h"""
+        return {
+            'gainers': self.top('change_pct', n, mask=mask),
+            'losers': self.top('change_pct', n, ascending=True, mask=mask)
+        }
+
+    def _row(self, row: int) -> Dict:
+        entry = {'symbol': str(self.symbols[row])}
+        for column, values in self.columns.items():
+            value = float(values[row])
+            entry[column] = value if value == value else None
+        return entry
+
+
+class TickerScanner:
+    """
+    Lädt den Ticker-Snapshot aller Symbole zyklisch im Hintergrund.
+    """
+
+    def __init__(self, api, category: str = 'spot', interval: float = 5.0):
+        """
+        Initialisiert den Scanner.
+
+        Args:
+            api: BybitAPI-Instanz (benötigt get_tickers())
+            category: Produktkategorie
+            interval: Abstand der Hintergrund-Aktualisierung in Sekunden
+        """
+        self.api = api
+        self.category = category
+        self.interval = interval
+        self._snapshot: Optional[TickerSnapshot] = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {'refreshes': 0, 'errors': 0, 'last_ms': None}
+
+    @property
+    def snapshot(self) -> Optional[TickerSnapshot]:
+        """Letzter Snapshot (lädt beim ersten Zugriff)"""
+        if self._snapshot is None:
+            self.refresh()
+        return self._snapshot
+
+    @property
+    def latest(self) -> Optional[TickerSnapshot]:
+        """Letzter Snapshot ohne Nachladen (None, solange noch keiner vorliegt)"""
+        return self._snapshot
+    
+    def refresh(self) -> Optional[TickerSnapshot]:
+        """
+        Lädt den Snapshot aller Symbole mit einem Request.
+
+        Returns:
+            Neuer Snapshot oder None, wenn keine Daten kamen (alter Snapshot bleibt)
+        """
+        started = time.perf_counter()
+        rows = self.api.get_tickers(category=self.category)
+        if not rows:
+            self.stats['errors'] += 1
+            logger.warning("Keine Ticker-Daten erhalten - behalte bisherigen Snapshot")
+            return None
+        snapshot = TickerSnapshot.from_bybit(rows)
+        # Referenz atomar austauschen, Leser sehen nie einen halben Snapshot
+        self._snapshot = snapshot
+        self.stats['refreshes'] += 1
+        self.stats['last_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return snapshot
+
+    def start(self):
+        """Lädt den Snapshot und aktualisiert ihn danach im Hintergrund"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="TickerScanner", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Beendet die Hintergrund-Aktualisierung"""
+        self._stop.set()
+
+    def top_movers(self, n: int = 10, quote: str = 'USDT', min_turnover: float = None) -> Dict[str, List[Dict]]:
+        """Gewinner und Verlierer der letzten 24h (optional nur liquide Paare)"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {'gainers': [], 'losers': []}
+        return snapshot.movers(n, mask=snapshot.mask(quote=quote, min_turnover=min_turnover))
+
+    def top_volume(self, n: int = 10, quote: str = 'USDT') -> List[Dict]:
+        """Paare mit dem höchsten Umsatz der letzten 24h"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return []
+        return snapshot.top('turnover_24h', n, mask=snapshot.mask(quote=quote))
+
+    def get_metrics(self) -> Dict:
+        """Zähler, Symbolanzahl und Alter des Snapshots"""
+        snapshot = self.latest
+        return dict(self.stats, symbols=len(snapshot) if snapshot else 0,
+                    age=round(snapshot.age, 1) if snapshot else None)
+
+    def _refresh_loop(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error("Fehler beim Aktualisieren der Ticker: %s", e)
+            if self._stop.wait(self.interval):
+                break
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+MARKET DATA INGEST
+Einziger Prozess mit Bybit-Marktdatenverbindung - verteilt Ticks, Bars und
+Top-of-Book über einen Shared-Memory-Ringpuffer an alle Strategie-Prozesse
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from core.market_data_ring import MarketDataRing, RingWriter
+from core.market_recorder import MarketRecorder
+from exchange.bybit_api import BybitAPI
+
+# Windows Console Encoding Fix
+if sys.platform == "win32":
+    import codecs
+    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
+    sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
+
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def publish_tickers(api, writer, symbols, recorder=None):
+    """Holt Ticker und schreibt Tick- und Top-of-Book-Records (optional auch auf Platte)"""
+    for symbol in symbols:
+        ticker = api.get_ticker(symbol)
+        if not ticker:
+            continue
+        if recorder:
+            recorder.record(symbol, 'ticker', ticker)
+        ts_ns = time.time_ns()
+        bid = float(ticker.get('bid1Price') or 0)
+        ask = float(ticker.get('ask1Price') or 0)
+        writer.publish_tick(
+            symbol,
+            float(ticker['lastPrice']),
+            volume=float(ticker.get('volume24h') or 0),
+            change=float(ticker.get('price24hPcnt') or 0) * 100,
+            bid=bid,
+            ask=ask,
+            ts_ns=ts_ns
+        )
+        writer.publish_book(
+            symbol, bid, float(ticker.get('bid1Size') or 0),
+            ask, float(ticker.get('ask1Size') or 0), ts_ns=ts_ns
+        )
+
+
+def publish_closed_bars(api, writer, symbols, last_bar):
+    """Schreibt alle seit dem letzten Aufruf abgeschlossenen 1m-Bars (auch nach langsamen Zyklen)"""
+    now_ms = int(time.time() * 1000)
+    for symbol in symbols:
+        last = last_bar.get(symbol)
+        # Beim ersten Aufruf nur die letzte abgeschlossene Kerze, danach alle fehlenden (max. 1000)
+        limit = 2 if last is None else min(1000, (now_ms - last) // 60000 + 1)
+        bars = api.get_historical_data(symbol, '1m', limit=limit)
+        # Bybit liefert neueste Kerze zuerst; die laufende Kerze überspringen
+        closed = sorted((bar for bar in bars if bar['timestamp'] + 60000 <= now_ms),
+                        key=lambda b: b['timestamp'])
+        if last is None:
+            closed = closed[-1:]
+        for bar in closed:
+            if last is not None and bar['timestamp'] <= last:
+                continue
+            writer.publish_bar(
+                symbol, bar['open'], bar['high'], bar['low'], bar['close'],
+                bar['volume'], bar['timestamp'], 60
+            )
+            last_bar[symbol] = last = bar['timestamp']
+
+
+def main():
+    """Startet den Ingest-Prozess"""
+    parser = argparse.ArgumentParser(description="Bybit Market Data Ingest (Shared Memory)")
+    parser.add_argument('--symbols', default=os.getenv('INGEST_SYMBOLS', 'BTCUSDT'),
+                        help="Kommagetrennte Symbole")
+    parser.add_argument('--ring', default=os.getenv('MARKET_DATA_RING', 'bybit_market_data'),
+                        help="Name des Shared-Memory-Segments")
+    parser.add_argument('--capacity', type=int, default=65536, help="Anzahl Slots im Ringpuffer")
+    parser.add_argument('--interval', type=float, default=1.0, help="Polling-Intervall in Sekunden")
+    parser.add_argument('--record', default=os.getenv('MARKET_RECORDER_DIR') or None,
+                        help="Ticker zusätzlich komprimiert in dieses Verzeichnis aufzeichnen")
+    args = parser.parse_args()
+
+    symbols = [s.strip().upper() for s in args.symbols.split(',') if s.strip()]
+    testnet = os.getenv('TESTNET', 'false').lower() == 'true'
+    api = BybitAPI(testnet=testnet)
+
+    try:
+        ring = MarketDataRing.create(args.ring, args.capacity)
+    except RuntimeError as e:
+        logger.error(f"Ingest nicht gestartet: {e}")
+        sys.exit(1)
+    writer = RingWriter(ring)
+    recorder = MarketRecorder(args.record) if args.record else None
+    logger.info(f"Ingest gestartet: {', '.join(symbols)} -> Shared Memory '{args.ring}' ({args.capacity} Slots)")
+
+    last_bar = {}
+    last_bar_check = 0.0
+    try:
+        while True:
+            started = time.time()
+            ring.heartbeat()
+            try:
+                publish_tickers(api, writer, symbols, recorder)
+                if started - last_bar_check >= 60:
+                    publish_closed_bars(api, writer, symbols, last_bar)
+                    last_bar_check = started
+            except Exception as e:
+                logger.error(f"Fehler im Ingest-Zyklus: {e}")
+            time.sleep(max(0.0, args.interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        logger.info("Ingest gestoppt")
+    finally:
+        if recorder:
+            recorder.close()
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()